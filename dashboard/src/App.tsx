@@ -12,14 +12,15 @@ import CreativePage from "./components/creative/CreativePage";
 
 export default function App() {
   const { theme, toggle } = useTheme();
-  const { report, isCustom, loadFromFile, loadSample } = useReport();
+  const { report, isCustom, loadFromFiles, loadSample, loadChecks } =
+    useReport();
 
   return (
     <div className={theme === "dark" ? "dark" : ""}>
       <Layout
         theme={theme}
         onThemeToggle={toggle}
-        onFileLoad={loadFromFile}
+        onFileLoad={loadFromFiles}
         isCustomReport={isCustom}
         onLoadSample={loadSample}
       >
@@ -27,7 +28,7 @@ export default function App() {
           <Route path="/" element={<DashboardPage report={report} />} />
           <Route
             path="/platform/:id"
-            element={<PlatformPage report={report} />}
+            element={<PlatformPage report={report} loadChecks={loadChecks} />}
           />
           <Route
             path="/quick-wins"
@@ -35,7 +36,9 @@ export default function App() {
           />
           <Route
             path="/action-plan"
-            element={<ActionPlanPage report={report} />}
+            element={
+              <ActionPlanPage report={report} loadChecks={loadChecks} />
+            }
           />
           <Route path="/budget" element={<BudgetPage report={report} />} />
           <Route
@@ -1,4 +1,4 @@
-import { useState } from "react";
+import { useEffect, useState } from "react";
 import {
   AlertTriangle,
   AlertCircle,
@@ -19,6 +19,7 @@ import ProgressBar from "../shared/ProgressBar";
 
 interface ActionPlanPageProps {
   report: AuditReport;
+  loadChecks: (platform?: PlatformId) => Promise<void>;
 }
 
 interface SeveritySection {
@@ -69,7 +70,15 @@ function inferPlatform(checkId: string): PlatformId {
   return "google";
 }
 
-export default function ActionPlanPage({ report }: ActionPlanPageProps) {
+export default function ActionPlanPage({
+  report,
+  loadChecks,
+}: ActionPlanPageProps) {
+  // The plan spans every platform, so a report bundle loads all its shards
+  useEffect(() => {
+    loadChecks();
+  }, [loadChecks]);
+
   // Gather all checks across all platforms
   const allChecks: (CheckResult & { platform: PlatformId })[] =
     report.platforms.flatMap((p) =>
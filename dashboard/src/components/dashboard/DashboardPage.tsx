@@ -130,7 +130,9 @@ function getTopIssues(report: AuditReport): PlatformCheck[] {
   if (report.topIssues && report.topIssues.length > 0) {
     return report.topIssues.slice(0, 5).map((check) => {
       const plat = report.platforms.find((p) =>
-        p.checks.some((c) => c.id === check.id),
+        check.platform
+          ? p.platform === check.platform
+          : p.checks.some((c) => c.id === check.id),
       );
       return {
         platform: plat?.name ?? "",
@@ -166,7 +168,9 @@ function getQuickWins(report: AuditReport): PlatformCheck[] {
   if (report.quickWins && report.quickWins.length > 0) {
     return report.quickWins.slice(0, 5).map((check) => {
       const plat = report.platforms.find((p) =>
-        p.checks.some((c) => c.id === check.id),
+        check.platform
+          ? p.platform === check.platform
+          : p.checks.some((c) => c.id === check.id),
       );
       return {
         platform: plat?.name ?? "",
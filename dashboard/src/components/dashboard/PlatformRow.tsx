@@ -11,15 +11,16 @@ interface PlatformRowProps {
 export default function PlatformRow({ platform }: PlatformRowProps) {
   const gradeColor = getGradeColor(platform.grade);
 
-  const passCount = platform.checks.filter(
-    (c) => c.status === "PASS",
-  ).length;
-  const warnCount = platform.checks.filter(
-    (c) => c.status === "WARNING",
-  ).length;
-  const failCount = platform.checks.filter(
-    (c) => c.status === "FAIL",
-  ).length;
+  // Report bundles carry precomputed counts; their checks load lazily
+  const passCount =
+    platform.counts?.passed ??
+    platform.checks.filter((c) => c.status === "PASS").length;
+  const warnCount =
+    platform.counts?.warnings ??
+    platform.checks.filter((c) => c.status === "WARNING").length;
+  const failCount =
+    platform.counts?.failed ??
+    platform.checks.filter((c) => c.status === "FAIL").length;
 
   return (
     <Link
@@ -5,7 +5,7 @@ import { Sun, Moon, Upload, Database } from "lucide-react";
 interface HeaderProps {
   theme: "dark" | "light";
   onThemeToggle: () => void;
-  onFileLoad: (file: File) => void;
+  onFileLoad: (files: File[]) => void;
   isCustomReport: boolean;
   onLoadSample: () => void;
 }
@@ -37,9 +37,10 @@ export default function Header({
   const pageTitle = routeTitles[location.pathname] ?? "Dashboard";
 
   function handleFileChange(e: React.ChangeEvent<HTMLInputElement>) {
-    const file = e.target.files?.[0];
-    if (file) {
-      onFileLoad(file);
+    const files = Array.from(e.target.files ?? []);
+    if (files.length > 0) {
+      // A report bundle is index.json plus its checks-* shards
+      onFileLoad(files);
       // Reset so the same file can be re-selected
       e.target.value = "";
     }
@@ -64,7 +65,8 @@ export default function Header({
         <input
           ref={fileInputRef}
           type="file"
-          accept=".json"
+          accept=".json,.gz"
+          multiple
           className="hidden"
           onChange={handleFileChange}
         />
@@ -5,7 +5,7 @@ import Header from "./Header";
 interface LayoutProps {
   theme: "dark" | "light";
   onThemeToggle: () => void;
-  onFileLoad: (file: File) => void;
+  onFileLoad: (files: File[]) => void;
   isCustomReport: boolean;
   onLoadSample: () => void;
   children: ReactNode;
@@ -1,3 +1,4 @@
+import { useEffect } from "react";
 import { useParams, Link } from "react-router-dom";
 import { ArrowLeft } from "lucide-react";
 import type { AuditReport, PlatformId } from "../../types/audit";
@@ -9,14 +10,20 @@ import CheckTable from "./CheckTable";
 
 interface PlatformPageProps {
   report: AuditReport;
+  loadChecks: (platform?: PlatformId) => Promise<void>;
 }
 
-export default function PlatformPage({ report }: PlatformPageProps) {
+export default function PlatformPage({ report, loadChecks }: PlatformPageProps) {
   const { id } = useParams<{ id: string }>();
   const platform = report.platforms.find(
     (p) => p.platform === (id as PlatformId),
   );
 
+  // Report bundles fetch a platform's checks on first visit
+  useEffect(() => {
+    if (id) loadChecks(id as PlatformId);
+  }, [id, loadChecks]);
+
   if (!platform) {
     return (
       <div className="flex flex-col items-center justify-center px-6 py-24 text-center">
@@ -70,7 +77,7 @@ export default function PlatformPage({ report }: PlatformPageProps) {
               {platform.name}
             </h1>
             <p className="mt-1 text-sm text-navy-500 dark:text-navy-400">
-              {platform.checks.length} checks &middot;{" "}
+              {platform.counts?.total ?? platform.checks.length} checks &middot;{" "}
               {platform.categories.length} categories &middot;{" "}
               {Math.round(platform.budgetShare * 100)}% of total budget
             </p>
@@ -114,7 +121,11 @@ export default function PlatformPage({ report }: PlatformPageProps) {
         <h2 className="mb-4 text-lg font-semibold text-navy-800 dark:text-navy-100">
           All Checks
         </h2>
-        <CheckTable checks={platform.checks} />
+        {platform.checksLoaded === false ? (
+          <p className="text-sm text-navy-400">Loading checks&hellip;</p>
+        ) : (
+          <CheckTable checks={platform.checks} />
+        )}
       </section>
     </div>
   );
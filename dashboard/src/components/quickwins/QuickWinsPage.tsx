@@ -84,7 +84,7 @@ export default function QuickWinsPage({ report }: QuickWinsPageProps) {
                   {/* Content */}
                   <div className="min-w-0 flex-1">
                     <div className="flex flex-wrap items-center gap-2">
-                      <PlatformIcon platform={win.id.startsWith("G") ? "google" : win.id.startsWith("M") ? "meta" : win.id.startsWith("L") ? "linkedin" : win.id.startsWith("T") ? "tiktok" : "microsoft"} size={24} />
+                      <PlatformIcon platform={win.platform ?? (win.id.startsWith("G") ? "google" : win.id.startsWith("M") ? "meta" : win.id.startsWith("L") ? "linkedin" : win.id.startsWith("T") ? "tiktok" : "microsoft")} size={24} />
                       <span className="font-mono text-xs font-semibold text-navy-500 dark:text-navy-400">
                         {win.id}
                       </span>
@@ -0,0 +1,90 @@
+import type {
+  AuditReport,
+  CheckResult,
+  ColumnarChecks,
+  ColumnarColumn,
+  ReportBundleIndex,
+} from "../types/audit";
+import { BUNDLE_FORMAT } from "../types/audit";
+
+/** Where a bundle's shards come from: next to a fetched index.json, or files picked with it. */
+export type ShardSource =
+  | { kind: "url"; base: string }
+  | { kind: "files"; files: Map<string, File> };
+
+export function isBundleIndex(data: unknown): data is ReportBundleIndex {
+  return (
+    typeof data === "object" &&
+    data !== null &&
+    (data as { format?: unknown }).format === BUNDLE_FORMAT
+  );
+}
+
+/** A report whose platforms have scores and counts but no checks until their shard loads. */
+export function reportFromIndex(index: ReportBundleIndex): AuditReport {
+  return {
+    ...index,
+    platforms: index.platforms.map((p) => ({
+      ...p,
+      checks: [],
+      checksLoaded: false,
+    })),
+  };
+}
+
+export function decodeChecks(shard: ColumnarChecks): CheckResult[] {
+  const columns = (Object.entries(shard.columns) as [string, ColumnarColumn][]).map(
+    ([field, column]): [string, unknown[]] => [
+      field,
+      Array.isArray(column)
+        ? column
+        : column.codes.map((code) => column.dict[code]),
+    ],
+  );
+
+  const checks: CheckResult[] = [];
+  for (let i = 0; i < shard.count; i++) {
+    const check: Record<string, unknown> = {};
+    for (const [field, values] of columns) {
+      if (values[i] !== null && values[i] !== undefined) check[field] = values[i];
+    }
+    checks.push(check as unknown as CheckResult);
+  }
+  return checks;
+}
+
+async function gunzip(data: ArrayBuffer): Promise<string> {
+  const stream = new Blob([data])
+    .stream()
+    .pipeThrough(new DecompressionStream("gzip"));
+  return new Response(stream).text();
+}
+
+export async function loadShard(
+  source: ShardSource,
+  name: string,
+): Promise<CheckResult[]> {
+  let data: ArrayBuffer;
+  if (source.kind === "url") {
+    const response = await fetch(new URL(name, source.base));
+    if (!response.ok) {
+      throw new Error(`Failed to load ${name}: HTTP ${response.status}`);
+    }
+    data = await response.arrayBuffer();
+  } else {
+    const file = source.files.get(name);
+    if (!file) {
+      throw new Error(`Missing ${name}: select it together with index.json`);
+    }
+    data = await file.arrayBuffer();
+  }
+
+  // A server may already have decoded a .gz shard (Content-Encoding: gzip),
+  // so check for the gzip magic bytes rather than trusting the file name.
+  const bytes = new Uint8Array(data);
+  const text =
+    bytes[0] === 0x1f && bytes[1] === 0x8b
+      ? await gunzip(data)
+      : new TextDecoder().decode(bytes);
+  return decodeChecks(JSON.parse(text) as ColumnarChecks);
+}
@@ -1,29 +1,122 @@
-import { useState, useCallback } from "react";
-import type { AuditReport } from "../types/audit";
+import { useState, useCallback, useEffect, useRef } from "react";
+import type { AuditReport, PlatformId } from "../types/audit";
+import type { ShardSource } from "../data/bundle";
+import { isBundleIndex, loadShard, reportFromIndex } from "../data/bundle";
 import sampleReport from "../data/sample-report.json";
 
+/**
+ * The current audit report: the bundled sample, a file picked by the user,
+ * or the report named by the `?report=` URL parameter.
+ *
+ * Report bundles (scripts/report_bundle.py) open from their index alone;
+ * a platform's checks are fetched by loadChecks() when a page needs them.
+ */
 export function useReport() {
   const [report, setReport] = useState<AuditReport>(sampleReport as AuditReport);
   const [isCustom, setIsCustom] = useState(false);
+  const shardSource = useRef<ShardSource | null>(null);
+  const pending = useRef(new Map<PlatformId, Promise<void>>());
+  const reportRef = useRef(report);
+  reportRef.current = report;
 
-  const loadFromFile = useCallback((file: File) => {
-    const reader = new FileReader();
-    reader.onload = (e) => {
-      try {
-        const data = JSON.parse(e.target?.result as string);
+  const applyReport = useCallback(
+    (data: unknown, source: ShardSource | null) => {
+      pending.current.clear();
+      if (isBundleIndex(data)) {
+        shardSource.current = source;
+        setReport(reportFromIndex(data));
+      } else {
+        shardSource.current = null;
         setReport(data as AuditReport);
-        setIsCustom(true);
-      } catch {
-        alert("Invalid JSON file. Please upload a valid audit report.");
       }
-    };
-    reader.readAsText(file);
-  }, []);
+      setIsCustom(true);
+    },
+    [],
+  );
+
+  const loadFromFiles = useCallback(
+    (files: File[]) => {
+      // A bundle is picked as index.json plus its checks-*.json(.gz) shards
+      const main =
+        files.find((f) => f.name === "index.json") ??
+        files.find((f) => f.name.endsWith(".json")) ??
+        files[0];
+      if (!main) return;
+      main
+        .text()
+        .then((text) =>
+          applyReport(JSON.parse(text), {
+            kind: "files",
+            files: new Map(files.map((f) => [f.name, f])),
+          }),
+        )
+        .catch(() => {
+          alert("Invalid JSON file. Please upload a valid audit report.");
+        });
+    },
+    [applyReport],
+  );
 
   const loadSample = useCallback(() => {
+    pending.current.clear();
+    shardSource.current = null;
     setReport(sampleReport as AuditReport);
     setIsCustom(false);
   }, []);
 
-  return { report, isCustom, loadFromFile, loadSample };
+  const loadChecks = useCallback((platform?: PlatformId) => {
+    const source = shardSource.current;
+    if (!source) return Promise.resolve();
+
+    const targets = reportRef.current.platforms.filter(
+      (p) =>
+        p.checksLoaded === false &&
+        p.shard &&
+        (platform === undefined || p.platform === platform),
+    );
+    return Promise.all(
+      targets.map((p) => {
+        let promise = pending.current.get(p.platform);
+        if (!promise) {
+          promise = loadShard(source, p.shard!).then(
+            (checks) => {
+              // Ignore shards that arrive after another report was opened
+              if (shardSource.current !== source) return;
+              setReport((prev) => ({
+                ...prev,
+                platforms: prev.platforms.map((q) =>
+                  q.platform === p.platform
+                    ? { ...q, checks, checksLoaded: true }
+                    : q,
+                ),
+              }));
+            },
+            (error) => {
+              pending.current.delete(p.platform);
+              console.error(error);
+            },
+          );
+          pending.current.set(p.platform, promise);
+        }
+        return promise;
+      }),
+    ).then(() => undefined);
+  }, []);
+
+  useEffect(() => {
+    const url = new URLSearchParams(window.location.search).get("report");
+    if (!url) return;
+    const absolute = new URL(url, window.location.href).toString();
+    fetch(absolute)
+      .then((response) => {
+        if (!response.ok) throw new Error(`HTTP ${response.status}`);
+        return response.json();
+      })
+      .then((data) => applyReport(data, { kind: "url", base: absolute }))
+      .catch(() => {
+        alert(`Could not load report from ${url}.`);
+      });
+  }, [applyReport]);
+
+  return { report, isCustom, loadFromFiles, loadSample, loadChecks };
 }
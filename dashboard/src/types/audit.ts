@@ -13,6 +13,8 @@ export interface CheckResult {
   recommendation: string;
   estimatedTime?: string;
   isQuickWin?: boolean;
+  /** Set on report-level lists (topIssues, quickWins) of a report bundle */
+  platform?: PlatformId;
 }
 
 export interface CategoryScore {
@@ -34,6 +36,20 @@ export interface PlatformReport {
   budgetShare: number;
   categories: CategoryScore[];
   checks: CheckResult[];
+  /** Precomputed check counts (report bundles); checks may not be loaded yet */
+  counts?: CheckCounts;
+  /** Shard file holding this platform's checks (report bundles) */
+  shard?: string;
+  /** False until a bundle platform's checks have been fetched */
+  checksLoaded?: boolean;
+}
+
+export interface CheckCounts {
+  total: number;
+  passed: number;
+  warnings: number;
+  failed: number;
+  na: number;
 }
 
 export interface BudgetAllocation {
@@ -78,6 +94,32 @@ export interface AuditReport {
   topIssues: CheckResult[];
 }
 
+// Report bundles (scripts/report_bundle.py): index.json plus per-platform
+// check shards that are fetched on drill-down.
+export const BUNDLE_FORMAT = "claude-ads-report-bundle";
+
+export interface ReportBundleIndex
+  extends Omit<AuditReport, "platforms"> {
+  format: typeof BUNDLE_FORMAT;
+  version: number;
+  platforms: (Omit<PlatformReport, "checks"> & {
+    counts: CheckCounts;
+    shard: string;
+  })[];
+  counts: CheckCounts;
+  grades: {
+    platforms: Partial<Record<Grade, number>>;
+    categories: Partial<Record<Grade, number>>;
+  };
+}
+
+export type ColumnarColumn = unknown[] | { dict: unknown[]; codes: number[] };
+
+export interface ColumnarChecks {
+  count: number;
+  columns: Partial<Record<keyof CheckResult, ColumnarColumn>>;
+}
+
 // Scoring constants
 export const SEVERITY_MULTIPLIER: Record<Severity, number> = {
   Critical: 5.0,
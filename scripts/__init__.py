@@ -0,0 +1,43 @@
+"""
+Claude Ads landing page scripts, installed as the `claude_ads` package.
+
+The modules are standalone scripts that import their siblings by bare name
+(`from url_list import read_urls`); run them directly or through the
+`claude-ads` command (cli.py). Once the package is imported, a bare sibling
+name that nothing else on sys.path provides resolves to the package's
+module, so `core` and `claude_ads.core` are one module, not two copies.
+"""
+
+import os
+import sys
+from importlib import import_module
+from importlib.machinery import ModuleSpec
+
+_HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+class _SiblingLoader:
+    """Loader that hands out the package's module instead of executing a second copy."""
+
+    def __init__(self, qualified_name: str):
+        self.qualified_name = qualified_name
+
+    def create_module(self, spec):
+        return import_module(self.qualified_name)
+
+    def exec_module(self, module):
+        pass  # Already executed under its package name
+
+
+class _SiblingFinder:
+    """Meta path finder, consulted last, for the scripts' bare sibling imports."""
+
+    def find_spec(self, name, path=None, target=None):
+        if path is not None or not os.path.isfile(os.path.join(_HERE, f"{name}.py")):
+            return None
+        return ModuleSpec(name, _SiblingLoader(f"{__name__}.{name}"))
+
+
+if not any(isinstance(finder, _SiblingFinder) for finder in sys.meta_path):
+    # Appended, so the scripts' names never shadow installed packages
+    sys.meta_path.append(_SiblingFinder())
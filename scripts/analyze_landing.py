@@ -8,20 +8,457 @@ and conversion-readiness signals aligned with ad audit checks G59-G61.
 Usage:
     python analyze_landing.py https://example.com/landing
     python analyze_landing.py https://example.com/landing --json
+    python analyze_landing.py https://example.com/landing --single-fetch
+    python analyze_landing.py https://example.com/landing --profile faithful
+    python analyze_landing.py https://example.com/landing --json --timings
+    python analyze_landing.py https://example.com/landing --lab-samples 5 --throttle mobile-4g
+    python analyze_landing.py --batch final_urls.txt --json
+    python analyze_landing.py --batch final_urls.txt --trace trace.json
+    python analyze_landing.py --batch final_urls.txt --jsonl results.jsonl --resume
+    python analyze_landing.py --batch final_urls.txt --dedupe --index visual-index.json
+    cat final_urls.txt | python analyze_landing.py --batch - --concurrency 16
 """
 
 import argparse
+import asyncio
+import copy
+import itertools
 import json
 import sys
+import time
 
 try:
-    from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
+    from playwright.async_api import async_playwright, TimeoutError as PlaywrightTimeout
 except ImportError:
     print("Error: playwright required. Install with: pip install -r requirements.txt && playwright install chromium")
     sys.exit(1)
 
+from browser_daemon import attach_async, release
+from core import CONTENT_TEXT_CHARS, DEFAULT_TIMEOUT_MS, DESKTOP, MOBILE, timeout_error
+from jsonl_output import JsonlWriter
+from lab_vitals import DEFAULT_THROTTLE, THROTTLE_PROFILES, format_lab, measure_vitals
+from page_ready import DEFAULT_DEADLINE_MS, WAIT_FOR_READY, ready_options, remaining_ms
+from request_policy import PROFILES, RequestLedger, async_route_handler, blocks_anything
+from screenshot_index import (
+    DEFAULT_THRESHOLD,
+    FINGERPRINT_ROUND_TRIPS,
+    ScreenshotIndex,
+    page_fingerprint,
+    print_report,
+)
+from static_landing import (
+    CHAT_SELECTORS,
+    CTA_BUTTON_TEXTS,
+    CTA_SELECTORS,
+    TESTIMONIAL_KEYWORDS,
+    TRUST_BADGE_KEYWORDS,
+    empty_result,
+    grade_landing,
+)
+from timing import (
+    TRACE_FORMATS,
+    Tracer,
+    print_phase_summary,
+    print_timings,
+    span,
+    summarize_phases,
+    write_trace,
+)
+from url_list import host_of, read_urls
+
+
+async def _goto_ready(page, url: str, needs, timeout: int, deadline: int, tracer=None, name: str = "page") -> dict:
+    """
+    Navigate to DOMContentLoaded, then wait until the signals in `needs` are final.
+
+    `timeout` bounds the navigation only; `deadline` bounds the readiness wait,
+    counted from the start of the navigation.
+    """
+    started = time.perf_counter()
+    with span(tracer, f"{name}.goto"):
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    with span(tracer, f"{name}.ready"):
+        return await page.evaluate(
+            WAIT_FOR_READY, ready_options(needs, deadline_ms=remaining_ms(started, deadline))
+        )
+
+
+class _ResponseReplay:
+    """
+    Record the responses of one context and replay them into another.
+
+    The recording context loads the page from the network as usual, observing
+    responses passively so its timings stay faithful. The replaying context
+    routes every request: GETs already seen are fulfilled from memory, anything
+    else (e.g. viewport-specific srcset images) falls through to the network.
+    """
+
+    # The recorded body is already decoded, so these no longer describe it
+    _DROP_HEADERS = {"content-encoding", "content-length", "transfer-encoding"}
+
+    def __init__(self):
+        self.responses = {}
+        self.pending = []
+        self.replayed = 0
+        self.network = 0
+        self.body_reads = 0
+
+    def record(self, response) -> None:
+        """page.on("response") handler for the recording context."""
+        if response.request.method == "GET":
+            self.pending.append(asyncio.ensure_future(self._store(response)))
+
+    async def _store(self, response) -> None:
+        try:
+            if 300 <= response.status < 400:
+                body = b""
+            else:
+                self.body_reads += 1
+                body = await response.body()
+        except Exception:
+            return  # Body no longer available; the replay falls back to the network
+        headers = {
+            k: v for k, v in response.headers.items() if k.lower() not in self._DROP_HEADERS
+        }
+        self.responses[response.url] = (response.status, headers, body)
+
+    async def settle(self) -> None:
+        """Wait for recorded bodies to be read before the recording context closes."""
+        if self.pending:
+            await asyncio.gather(*self.pending, return_exceptions=True)
+            self.pending = []
+
+    async def replay(self, route) -> None:
+        """context.route("**/*") handler for the replaying context."""
+        request = route.request
+        stored = self.responses.get(request.url) if request.method == "GET" else None
+        if stored is None:
+            self.network += 1
+            await route.continue_()
+            return
+        status, headers, body = stored
+        self.replayed += 1
+        await route.fulfill(status=status, headers=headers, body=body)
+
+    def stats(self) -> dict:
+        return {
+            "recorded": len(self.responses),
+            "replayed": self.replayed,
+            "network": self.network,
+        }
+
+
+# Everything the desktop and mobile checks read from the DOM, in one evaluate
+EXTRACT_PAGE = """
+(opts) => {
+    const first = selector => {
+        try { return document.querySelector(selector); } catch (e) { return null; }
+    };
+    const aboveFold = el => {
+        if (!el || el.getClientRects().length === 0) return false;
+        return el.getBoundingClientRect().top + window.scrollY < window.innerHeight;
+    };
+    const nav = performance.getEntriesByType('navigation')[0];
+    const body = document.body;
+    const text = body ? body.innerText : '';
+    const lower = text.toLowerCase();
+
+    const ctaCandidates = opts.ctaSelectors.map(first);
+    for (const label of opts.ctaButtonTexts) {
+        const needle = label.toLowerCase();
+        ctaCandidates.push(Array.from(document.querySelectorAll('button')).find(
+            b => b.textContent.replace(/\\s+/g, ' ').toLowerCase().includes(needle)
+        ));
+    }
+
+    const schemaTypes = [];
+    document.querySelectorAll('script[type="application/ld+json"]').forEach(s => {
+        try {
+            const data = JSON.parse(s.textContent);
+            if (data['@type']) schemaTypes.push(data['@type']);
+            if (Array.isArray(data['@graph'])) {
+                data['@graph'].forEach(item => { if (item['@type']) schemaTypes.push(item['@type']); });
+            }
+        } catch (e) {}
+    });
+
+    const h1 = document.querySelector('h1');
+    const metaDescription = document.querySelector('meta[name="description"]');
+    return {
+        ttfb: nav ? nav.responseStart : null,
+        domContentLoaded: nav ? nav.domContentLoadedEventEnd : null,
+        title: document.title,
+        h1: h1 ? h1.textContent.trim() : null,
+        metaDescription: metaDescription ? metaDescription.getAttribute('content') : null,
+        wordCount: text.split(/\\s+/).filter(w => w.length > 0).length,
+        text: text.replace(/\\s+/g, ' ').trim().slice(0, opts.textChars),
+        ctaAboveFold: ctaCandidates.some(aboveFold),
+        formPresent: document.querySelector('form') !== null,
+        formFields: document.querySelectorAll("form input:not([type='hidden']):not([type='submit'])").length,
+        phoneNumber: document.querySelector("a[href^='tel:']") !== null,
+        chatWidget: opts.chatSelectors.some(s => first(s) !== null),
+        testimonials: opts.testimonialKeywords.some(k => lower.includes(k)),
+        trustBadges: opts.trustBadgeKeywords.some(k => lower.includes(k)),
+        schemaTypes,
+        viewportMeta: document.querySelector('meta[name="viewport"]') !== null,
+        scrollWidth: document.documentElement.scrollWidth,
+        innerWidth: window.innerWidth,
+        baseFont: body ? parseFloat(window.getComputedStyle(body).fontSize) : null,
+    };
+}
+"""
+
+_EXTRACT_ARGS = {
+    "ctaSelectors": CTA_SELECTORS,
+    "ctaButtonTexts": CTA_BUTTON_TEXTS,
+    "chatSelectors": CHAT_SELECTORS,
+    "testimonialKeywords": TESTIMONIAL_KEYWORDS,
+    "trustBadgeKeywords": TRUST_BADGE_KEYWORDS,
+    "textChars": CONTENT_TEXT_CHARS,
+}
+
+
+class _RoundTrips:
+    """Count the driver round-trips made for one viewport."""
+
+    def __init__(self):
+        self.count = 0
+
+    async def __call__(self, awaitable):
+        self.count += 1
+        return await awaitable
+
+    def handler(self, handler):
+        """Wrap a route handler; each routed request costs one abort, continue or fulfill."""
+        async def counted(route):
+            self.count += 1
+            await handler(route)
+        return counted
+
+
+class _CountedPage:
+    """A page whose goto() and evaluate() calls are counted in a _RoundTrips."""
+
+    def __init__(self, page, trips: _RoundTrips):
+        self.page = page
+        self.trips = trips
+
+    async def goto(self, *args, **kwargs):
+        return await self.trips(self.page.goto(*args, **kwargs))
+
+    async def evaluate(self, *args, **kwargs):
+        return await self.trips(self.page.evaluate(*args, **kwargs))
+
+
+def _navigation_timing(data: dict, result: dict) -> None:
+    """Record TTFB and DOMContentLoaded from the pass that loaded over the network."""
+    if data.get("ttfb"):
+        result["performance"]["ttfb_ms"] = round(data["ttfb"])
+    if data.get("domContentLoaded"):
+        result["performance"]["dom_content_loaded_ms"] = round(data["domContentLoaded"])
+
+
+def _desktop_checks(data: dict, result: dict, ready: dict) -> None:
+    """Content, conversion, trust and schema checks on the 1920x1080 viewport."""
+    # CLS
+    cls = ready["cls"]
+    result["performance"]["cls"] = round(cls, 4) if cls is not None else None
+
+    # Content analysis
+    result["content"]["title"] = data["title"]
+    result["content"]["h1"] = data["h1"]
+    result["content"]["meta_description"] = data["metaDescription"]
+    result["content"]["word_count"] = data["wordCount"]
+    result["content"]["text"] = data["text"]
+
+    # Conversion elements
+    result["conversion"]["cta_above_fold"] = data["ctaAboveFold"]
+    result["conversion"]["form_present"] = data["formPresent"]
+    if data["formPresent"]:
+        result["conversion"]["form_fields"] = data["formFields"]
+    result["conversion"]["phone_number"] = data["phoneNumber"]
+    result["conversion"]["chat_widget"] = data["chatWidget"]
+
+    # Trust signals
+    result["trust"]["testimonials"] = data["testimonials"]
+    result["trust"]["trust_badges"] = data["trustBadges"]
+
+    # Schema markup
+    schemas = data["schemaTypes"]
+    result["schema"]["types_found"] = schemas
+    result["schema"]["product_schema"] = "Product" in schemas
+    result["schema"]["faq_schema"] = "FAQPage" in schemas
+    result["schema"]["service_schema"] = "Service" in schemas
+    result["trust"]["reviews_schema"] = "Review" in schemas or "AggregateRating" in schemas
+
+
+def _mobile_checks(data: dict, result: dict, ready: dict) -> None:
+    """LCP and responsiveness checks on the 375x812 viewport."""
+    # LCP on mobile viewport (G59 = mobile speed)
+    lcp = ready["lcp_ms"]
+    if lcp:
+        result["performance"]["lcp_ms"] = round(lcp)
+
+    result["mobile"]["viewport_meta"] = data["viewportMeta"]
+    result["mobile"]["horizontal_scroll"] = data["scrollWidth"] > data["innerWidth"]
+    result["mobile"]["font_readable"] = data["baseFont"] is not None and data["baseFont"] >= 16
+
+
+# Desktop checks need the DOM and settled layout shifts (CLS); mobile checks
+# need the DOM and a stable LCP candidate.
+_PASSES = {
+    "desktop": (DESKTOP.size(), ("dom", "cls"), _desktop_checks),
+    "mobile": (MOBILE.size(), ("dom", "lcp"), _mobile_checks),
+}
+
+
+async def _analyze_with_browser(
+    browser,
+    url: str,
+    timeout: int = DEFAULT_TIMEOUT_MS,
+    deadline: int = DEFAULT_DEADLINE_MS,
+    single_fetch: bool = False,
+    profile: str = None,
+    tracer: Tracer = None,
+    lab_samples: int = 0,
+    throttle: str = DEFAULT_THROTTLE,
+    visual_index: ScreenshotIndex = None,
+) -> dict:
+    """
+    Analyze one landing page in fresh contexts of an already running browser.
+
+    Contexts are created and closed per URL so cookies, storage and HTTP cache
+    never leak between pages, while the (expensive) browser is reused.
+    Each page waits only until the signals its checks need are final, up to
+    `deadline` ms; result["readiness"] records which condition ended the wait.
+    All DOM fields are read by one EXTRACT_PAGE evaluate per viewport, and
+    result["round_trips"] counts the driver calls each viewport took, from
+    creating its context to closing it: setup, routes, CDP commands,
+    navigation, evaluates, routed requests, recorded response bodies and
+    fingerprinting.
+
+    With single_fetch, the mobile pass loads the page from the network (so LCP
+    and TTFB stay real) and the desktop pass replays its recorded responses,
+    fetching only what the mobile load never requested.
+
+    With a request profile (see request_policy.PROFILES), every request of
+    each viewport is accounted under result["requests"] and the profile's
+    resource types and hosts are blocked.
+
+    With lab_samples, that many throttled mobile loads (see lab_vitals.py)
+    run after the two passes, so they do not compete with them for the CPU,
+    and their median/p75 go under result["lab"]; grade_landing() then grades
+    G59 from the p75 LCP.
+
+    With a visual_index (see screenshot_index.py), the page is fingerprinted
+    after the first pass. If it joins an existing cluster, the second pass is
+    skipped and a copy of the representative's result is returned, with
+    duplicate_of and visual_distance set.
+
+    With a tracer, each viewport's context setup, navigation, readiness wait,
+    extraction and teardown are timed under result["timings"].
+    """
+    result = empty_result(url)
+    result["tier"] = "rendered"
+    if profile:
+        result["requests"] = {"profile": profile, "desktop": None, "mobile": None}
+    contexts = []
+    replay = _ResponseReplay() if single_fetch else None
+    order = ("mobile", "desktop") if single_fetch else ("desktop", "mobile")
+    cluster = distance = None
+
+    try:
+        with span(tracer, "page", url=url):
+            for index, name in enumerate(order):
+                viewport, needs, checks = _PASSES[name]
+                trips = _RoundTrips()
+                blocking = bool(profile) and blocks_anything(profile)
+                with span(tracer, f"{name}.context"):
+                    context = await trips(browser.new_context(viewport=viewport))
+                    contexts.append(context)
+                    page = _CountedPage(await trips(context.new_page()), trips)
+                    if replay and index == 0:
+                        page.page.on("response", replay.record)
+                    elif replay:
+                        # A routed request is counted by the handler consulted first
+                        handler = replay.replay if blocking else trips.handler(replay.replay)
+                        await trips(context.route("**/*", handler))
+
+                    ledger = None
+                    if profile:
+                        ledger = RequestLedger(url)
+                        ledger.attach(context)
+                        if blocking:
+                            # Registered last so it is consulted before the replay route
+                            await trips(context.route("**/*", trips.handler(async_route_handler(profile))))
+
+                ready = await _goto_ready(page, url, needs, timeout, deadline, tracer=tracer, name=name)
+                result["readiness"][name] = {k: ready[k] for k in ("reason", "pending", "waited_ms")}
+                with span(tracer, f"{name}.extract"):
+                    data = await page.evaluate(EXTRACT_PAGE, _EXTRACT_ARGS)
+                if index == 0:
+                    _navigation_timing(data, result)
+                checks(data, result, ready)
+                if ledger:
+                    trips.count += await ledger.settle()
+                    result["requests"][name] = ledger.summary()
+
+                if visual_index is not None and index == 0:
+                    with span(tracer, "dedupe"):
+                        fingerprint = await page_fingerprint(context, page.page)
+                        trips.count += FINGERPRINT_ROUND_TRIPS
+                        cluster, distance = visual_index.claim(url, fingerprint)
+                        result["visual_cluster"] = cluster["id"]
+                        reused = await visual_index.reuse(cluster) if distance is not None else None
+                    if reused:
+                        duplicate = copy.deepcopy(reused)
+                        duplicate.update(url=url, duplicate_of=reused["url"],
+                                         visual_cluster=cluster["id"], visual_distance=distance)
+                        duplicate.pop("timings", None)
+                        return duplicate
+
+                with span(tracer, f"{name}.close"):
+                    if replay and index == 0:
+                        await replay.settle()
+                        trips.count += replay.body_reads
+                    await trips(context.close())
+                contexts.remove(context)
+                result["round_trips"][name] = trips.count
+
+            if replay:
+                result["replay"] = replay.stats()
+            if lab_samples:
+                result["lab"] = await measure_vitals(
+                    browser, url, samples=lab_samples, throttle=throttle,
+                    timeout=timeout, deadline=deadline, tracer=tracer,
+                )
+
+    except PlaywrightTimeout:
+        result["error"] = timeout_error(timeout)
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        if cluster is not None and distance is None:
+            visual_index.resolve(cluster, result)
+        for context in contexts:
+            try:
+                await context.close()
+            except Exception:
+                pass
 
-def analyze_landing(url: str, timeout: int = 30000) -> dict:
+    return result
+
+
+def analyze_landing(
+    url: str,
+    timeout: int = DEFAULT_TIMEOUT_MS,
+    deadline: int = DEFAULT_DEADLINE_MS,
+    single_fetch: bool = False,
+    profile: str = None,
+    tracer: Tracer = None,
+    lab_samples: int = 0,
+    throttle: str = DEFAULT_THROTTLE,
+) -> dict:
     """
     Analyze landing page quality for ad campaign relevance.
 
@@ -33,270 +470,368 @@ def analyze_landing(url: str, timeout: int = 30000) -> dict:
         - CTA visibility above fold
         - Form presence and field count
         - Trust signals (testimonials, badges, reviews)
+
+    Attaches to the warm browser daemon when it is running (see
+    browser_daemon.py), otherwise launches a dedicated browser for this one
+    URL. Use analyze_batch() to analyze many URLs on a shared browser pool.
+    With single_fetch, the page and its subresources are fetched once and
+    replayed into the second viewport. `profile` selects request
+    blocking/accounting (faithful or content-only). lab_samples adds
+    repeated throttled LCP/CLS measurement (see lab_vitals.py). With a tracer (see
+    timing.py), driver startup, browser attach and every per-viewport phase
+    are timed under result["timings"].
     """
-    result = {
-        "url": url,
-        "performance": {
-            "lcp_ms": None,
-            "cls": None,
-            "ttfb_ms": None,
-            "dom_content_loaded_ms": None,
-        },
-        "content": {
-            "title": None,
-            "h1": None,
-            "meta_description": None,
-            "word_count": 0,
-        },
-        "conversion": {
-            "cta_above_fold": False,
-            "form_present": False,
-            "form_fields": 0,
-            "phone_number": False,
-            "chat_widget": False,
-        },
-        "trust": {
-            "testimonials": False,
-            "trust_badges": False,
-            "reviews_schema": False,
-        },
-        "mobile": {
-            "viewport_meta": False,
-            "horizontal_scroll": False,
-            "font_readable": True,
-        },
-        "schema": {
-            "types_found": [],
-            "product_schema": False,
-            "faq_schema": False,
-            "service_schema": False,
-        },
-        "error": None,
-    }
+    async def run() -> dict:
+        with span(tracer, "driver.start"):
+            p = await async_playwright().start()
+        try:
+            with span(tracer, "browser.attach"):
+                browser, lease_id = await attach_async(p)
+            try:
+                return await _analyze_with_browser(
+                    browser, url, timeout=timeout, deadline=deadline,
+                    single_fetch=single_fetch, profile=profile, tracer=tracer,
+                    lab_samples=lab_samples, throttle=throttle,
+                )
+            finally:
+                with span(tracer, "browser.close"):
+                    await browser.close()
+                    if lease_id is not None:
+                        release(lease_id)
+        finally:
+            await p.stop()
 
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-
-            # Desktop analysis
-            desktop = browser.new_context(viewport={"width": 1920, "height": 1080})
-            page = desktop.new_page()
-
-            page.goto(url, wait_until="networkidle", timeout=timeout)
-
-            # Performance metrics
-            perf = page.evaluate("""
-                () => {
-                    const nav = performance.getEntriesByType('navigation')[0];
-                    return {
-                        ttfb: nav ? nav.responseStart : null,
-                        domContentLoaded: nav ? nav.domContentLoadedEventEnd : null,
-                    };
-                }
-            """)
-            if perf.get("ttfb"):
-                result["performance"]["ttfb_ms"] = round(perf["ttfb"])
-            if perf.get("domContentLoaded"):
-                result["performance"]["dom_content_loaded_ms"] = round(perf["domContentLoaded"])
-
-            # CLS
-            cls = page.evaluate("""
-                () => new Promise(resolve => {
-                    let clsValue = 0;
-                    new PerformanceObserver(list => {
-                        for (const entry of list.getEntries()) {
-                            if (!entry.hadRecentInput) clsValue += entry.value;
-                        }
-                        resolve(clsValue);
-                    }).observe({type: 'layout-shift', buffered: true});
-                    setTimeout(() => resolve(clsValue), 3000);
-                })
-            """)
-            result["performance"]["cls"] = round(cls, 4) if cls is not None else None
-
-            # Content analysis
-            result["content"]["title"] = page.title()
-
-            h1 = page.query_selector("h1")
-            if h1:
-                result["content"]["h1"] = h1.text_content().strip()
-
-            meta_desc = page.query_selector('meta[name="description"]')
-            if meta_desc:
-                result["content"]["meta_description"] = meta_desc.get_attribute("content")
-
-            result["content"]["word_count"] = page.evaluate(
-                "() => document.body.innerText.split(/\\s+/).filter(w => w.length > 0).length"
-            )
+        result = asyncio.run(run())
+    except Exception as e:
+        result = empty_result(url)
+        result["tier"] = "rendered"
+        result["error"] = str(e)
+    if tracer:
+        result["timings"] = tracer.to_dict()
+    return result
 
-            # CTA above fold
-            cta_selectors = [
-                "a[href*='signup']", "a[href*='register']", "a[href*='contact']",
-                "a[href*='demo']", "a[href*='trial']", "a[href*='buy']",
-                "button:has-text('Get Started')", "button:has-text('Sign Up')",
-                "button:has-text('Buy Now')", "button:has-text('Contact')",
-                "button:has-text('Free Trial')", "button:has-text('Book')",
-                ".cta", "[class*='cta']",
-            ]
-            for selector in cta_selectors:
-                try:
-                    cta = page.query_selector(selector)
-                    if cta:
-                        box = cta.bounding_box()
-                        if box and box["y"] < 1080:
-                            result["conversion"]["cta_above_fold"] = True
-                            break
-                except Exception:
-                    pass
 
-            # Form analysis
-            forms = page.query_selector_all("form")
-            if forms:
-                result["conversion"]["form_present"] = True
-                inputs = page.query_selector_all("form input:not([type='hidden']):not([type='submit'])")
-                result["conversion"]["form_fields"] = len(inputs)
-
-            # Phone number
-            result["conversion"]["phone_number"] = page.query_selector("a[href^='tel:']") is not None
-
-            # Chat widget
-            chat_selectors = [
-                "[class*='chat']", "[id*='chat']", "[class*='intercom']",
-                "[class*='drift']", "[class*='hubspot']", "[class*='zendesk']",
-            ]
-            for sel in chat_selectors:
+async def iter_batch(
+    urls: list,
+    browsers: int = 2,
+    concurrency: int = 8,
+    per_host: int = 2,
+    timeout: int = DEFAULT_TIMEOUT_MS,
+    deadline: int = DEFAULT_DEADLINE_MS,
+    single_fetch: bool = False,
+    profile: str = None,
+    timings: bool = False,
+    lab_samples: int = 0,
+    throttle: str = DEFAULT_THROTTLE,
+    visual_index: ScreenshotIndex = None,
+):
+    """
+    Analyze many URLs on a fixed pool of browsers, yielding results as they complete.
+
+    Args:
+        urls: Landing page URLs to analyze
+        browsers: Number of Chromium instances shared by all pages
+        concurrency: Maximum pages in flight across all hosts
+        per_host: Maximum pages in flight against a single host
+        timeout: Per-navigation timeout in ms
+        deadline: Hard per-page readiness deadline in ms
+        single_fetch: Fetch each page once and replay it into the second viewport
+        profile: Request blocking/accounting profile (faithful or content-only)
+        timings: Time each page's phases (including the wait for a slot) under
+            result["timings"]
+        lab_samples: Throttled mobile loads per page for result["lab"]
+            (see lab_vitals.py); they run inside the page's slot
+        throttle: Throttling profile for the lab samples
+        visual_index: Cluster near-duplicate pages and reuse the analysis
+            of each cluster's representative (see screenshot_index.py)
+
+    Yields:
+        analyze_landing()-shaped result dicts, in completion order
+    """
+    global_slots = asyncio.Semaphore(max(1, concurrency))
+    host_slots = {}
+    counter = itertools.count()
+
+    async with async_playwright() as p:
+        pool = [await p.chromium.launch(headless=True) for _ in range(max(1, browsers))]
+
+        async def run_one(url: str) -> dict:
+            tracer = Tracer() if timings else None
+            host = host_of(url)
+            if host not in host_slots:
+                host_slots[host] = asyncio.Semaphore(max(1, per_host))
+            # Take the host slot first so pages queued behind a busy host
+            # never hold a global slot that another host could use.
+            with span(tracer, "queue.wait"):
+                await host_slots[host].acquire()
+                await global_slots.acquire()
+            try:
+                browser = pool[next(counter) % len(pool)]
+                result = await _analyze_with_browser(
+                    browser, url, timeout=timeout, deadline=deadline,
+                    single_fetch=single_fetch, profile=profile, tracer=tracer,
+                    lab_samples=lab_samples, throttle=throttle, visual_index=visual_index,
+                )
+            finally:
+                global_slots.release()
+                host_slots[host].release()
+            if tracer:
+                result["timings"] = tracer.to_dict()
+            return result
+
+        try:
+            for task in asyncio.as_completed([run_one(url) for url in urls]):
+                yield await task
+        finally:
+            for browser in pool:
                 try:
-                    if page.query_selector(sel):
-                        result["conversion"]["chat_widget"] = True
-                        break
+                    await browser.close()
                 except Exception:
                     pass
 
-            # Trust signals
-            page_text = page.evaluate("() => document.body.innerText.toLowerCase()")
-            result["trust"]["testimonials"] = any(k in page_text for k in ["testimonial", "customer said", "what our"])
-            result["trust"]["trust_badges"] = any(k in page_text for k in ["trusted by", "as seen", "certified", "award"])
-
-            # Schema markup
-            schemas = page.evaluate("""
-                () => {
-                    const scripts = document.querySelectorAll('script[type="application/ld+json"]');
-                    const types = [];
-                    scripts.forEach(s => {
-                        try {
-                            const data = JSON.parse(s.textContent);
-                            if (data['@type']) types.push(data['@type']);
-                            if (Array.isArray(data['@graph'])) {
-                                data['@graph'].forEach(item => { if (item['@type']) types.push(item['@type']); });
-                            }
-                        } catch(e) {}
-                    });
-                    return types;
-                }
-            """)
-            result["schema"]["types_found"] = schemas
-            result["schema"]["product_schema"] = "Product" in schemas
-            result["schema"]["faq_schema"] = "FAQPage" in schemas
-            result["schema"]["service_schema"] = "Service" in schemas
-            result["trust"]["reviews_schema"] = "Review" in schemas or "AggregateRating" in schemas
-
-            desktop.close()
-
-            # Mobile analysis
-            mobile = browser.new_context(viewport={"width": 375, "height": 812})
-            page = mobile.new_page()
-            page.goto(url, wait_until="networkidle", timeout=timeout)
-
-            # LCP on mobile viewport (G59 = mobile speed)
-            lcp = page.evaluate("""
-                () => new Promise(resolve => {
-                    new PerformanceObserver(list => {
-                        const entries = list.getEntries();
-                        resolve(entries.length > 0 ? entries[entries.length - 1].startTime : null);
-                    }).observe({type: 'largest-contentful-paint', buffered: true});
-                    setTimeout(() => resolve(null), 3000);
-                })
-            """)
-            if lcp:
-                result["performance"]["lcp_ms"] = round(lcp)
-
-            result["mobile"]["viewport_meta"] = page.query_selector('meta[name="viewport"]') is not None
-
-            scroll_width = page.evaluate("document.documentElement.scrollWidth")
-            viewport_width = page.evaluate("window.innerWidth")
-            result["mobile"]["horizontal_scroll"] = scroll_width > viewport_width
-
-            base_font = page.evaluate(
-                "() => parseFloat(window.getComputedStyle(document.body).fontSize)"
-            )
-            result["mobile"]["font_readable"] = base_font >= 16
-
-            mobile.close()
-            browser.close()
-
-    except PlaywrightTimeout:
-        result["error"] = f"Page load timed out after {timeout}ms"
-    except Exception as e:
-        result["error"] = str(e)
-
-    return result
-
 
-def grade_landing(result: dict) -> dict:
-    """Grade landing page quality based on ad audit criteria."""
-    grades = {}
+def analyze_batch(
+    urls: list,
+    browsers: int = 2,
+    concurrency: int = 8,
+    per_host: int = 2,
+    timeout: int = DEFAULT_TIMEOUT_MS,
+    deadline: int = DEFAULT_DEADLINE_MS,
+    single_fetch: bool = False,
+    profile: str = None,
+    timings: bool = False,
+    on_result=None,
+    keep_results: bool = True,
+    lab_samples: int = 0,
+    throttle: str = DEFAULT_THROTTLE,
+    visual_index: ScreenshotIndex = None,
+) -> dict:
+    """
+    Analyze many landing pages concurrently on a shared browser pool.
 
-    # G59: Mobile speed (LCP)
-    lcp = result["performance"].get("lcp_ms")
-    if lcp:
-        if lcp < 2500:
-            grades["G59_mobile_speed"] = "PASS"
-        elif lcp < 4000:
-            grades["G59_mobile_speed"] = "WARNING"
-        else:
-            grades["G59_mobile_speed"] = "FAIL"
+    Args:
+        on_result: Optional callback invoked with each result as it completes
+        keep_results: Collect results in the return value; pass False when
+            on_result streams them (see jsonl_output.py) to keep memory flat
 
-    # G60: Landing page relevance (H1 present)
-    grades["G60_relevance"] = "PASS" if result["content"]["h1"] else "FAIL"
+    Returns:
+        Dictionary with results (completion order, empty without
+        keep_results) and stats (pages, errors, elapsed_s, pages_per_sec,
+        duplicates with a visual_index, and slowest_phases when timings is set)
+    """
+    results = []
+    timed = []
+    counts = {"pages": 0, "errors": 0}
+    if visual_index is not None:
+        counts["duplicates"] = 0
+
+    async def run() -> None:
+        async for result in iter_batch(
+            urls,
+            browsers=browsers,
+            concurrency=concurrency,
+            per_host=per_host,
+            timeout=timeout,
+            deadline=deadline,
+            single_fetch=single_fetch,
+            profile=profile,
+            timings=timings,
+            lab_samples=lab_samples,
+            throttle=throttle,
+            visual_index=visual_index,
+        ):
+            counts["pages"] += 1
+            counts["errors"] += bool(result["error"])
+            if result.get("duplicate_of"):
+                counts["duplicates"] += 1
+            if keep_results:
+                results.append(result)
+            elif timings:
+                timed.append({"url": result["url"], "timings": result["timings"]})
+            if on_result:
+                on_result(result)
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    stats = {
+        **counts,
+        "elapsed_s": round(elapsed, 2),
+        "pages_per_sec": round(counts["pages"] / elapsed, 2) if elapsed > 0 else None,
+    }
+    if timings:
+        stats["slowest_phases"] = summarize_phases(results or timed)
+    return {"results": results, "stats": stats}
 
-    # G61: Schema markup (Product/FAQ/Service per google-audit.md)
-    has_relevant_schema = (
-        result["schema"]["product_schema"]
-        or result["schema"]["faq_schema"]
-        or result["schema"]["service_schema"]
-    )
-    grades["G61_schema"] = "PASS" if has_relevant_schema else "FAIL"
-
-    # CTA above fold
-    grades["cta_above_fold"] = "PASS" if result["conversion"]["cta_above_fold"] else "FAIL"
-
-    # Mobile responsive
-    has_viewport = result["mobile"]["viewport_meta"]
-    no_scroll = not result["mobile"]["horizontal_scroll"]
-    grades["mobile_responsive"] = "PASS" if has_viewport and no_scroll else "FAIL"
-
-    # Form friction (for lead gen)
-    if result["conversion"]["form_present"]:
-        fields = result["conversion"]["form_fields"]
-        if fields <= 5:
-            grades["form_friction"] = "PASS"
-        elif fields <= 8:
-            grades["form_friction"] = "WARNING"
-        else:
-            grades["form_friction"] = "FAIL"
 
-    return grades
+def print_batch_line(result: dict) -> None:
+    """Print a one-line summary of a batch result."""
+    if result["error"]:
+        print(f"[ERROR] {result['url']}: {result['error']}")
+        return
+    grades = grade_landing(result)
+    failed = [check for check, grade in grades.items() if grade == "FAIL"]
+    lcp = result["performance"]["lcp_ms"]
+    if result.get("lab") and result["lab"]["lcp_ms"]["p75"]:
+        lcp = f"{result['lab']['lcp_ms']['p75']}ms (p75, {result['lab']['throttle']})"
+    else:
+        lcp = f"{lcp}ms"
+    print(f"[{len(grades) - len(failed)}/{len(grades)}] {result['url']} LCP={lcp}"
+          + (f" FAIL: {', '.join(failed)}" if failed else ""))
 
 
 def main():
     parser = argparse.ArgumentParser(description="Analyze landing page quality for ad campaigns")
-    parser.add_argument("url", help="URL to analyze")
-    parser.add_argument("--timeout", "-t", type=int, default=30000, help="Timeout in ms")
+    parser.add_argument("url", nargs="?", help="URL to analyze")
+    parser.add_argument("--timeout", "-t", type=int, default=DEFAULT_TIMEOUT_MS, help="Timeout in ms")
+    parser.add_argument("--deadline", "-d", type=int, default=DEFAULT_DEADLINE_MS,
+                        help="Hard per-page readiness deadline in ms")
+    parser.add_argument("--single-fetch", action="store_true",
+                        help="Fetch the page once and replay it into the desktop viewport")
+    parser.add_argument("--profile", "-p", choices=PROFILES,
+                        help="Request profile: account for every request (faithful) or block "
+                             "media, fonts and ad/analytics hosts (content-only)")
+    parser.add_argument("--lab-samples", type=int, default=0, metavar="N",
+                        help="Also load the page N times with CPU/network throttling and grade G59 from the p75 LCP")
+    parser.add_argument("--throttle", choices=THROTTLE_PROFILES, default=DEFAULT_THROTTLE,
+                        help="Throttling profile for --lab-samples")
     parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    parser.add_argument("--timings", action="store_true",
+                        help="Time each phase (JSON output gets a timings key; batch mode prints the slowest phases)")
+    parser.add_argument("--trace", metavar="FILE", help="Write phase timings to a trace file (implies --timings)")
+    parser.add_argument("--trace-format", choices=TRACE_FORMATS, default="chrome",
+                        help="Trace file format: Chrome trace events or OpenTelemetry-style JSON")
+    parser.add_argument("--batch", "-b", metavar="FILE", help="File with one URL per line ('-' for stdin)")
+    parser.add_argument("--browsers", type=int, default=2, help="Browser pool size (batch mode)")
+    parser.add_argument("--concurrency", "-c", type=int, default=8, help="Max pages in flight (batch mode)")
+    parser.add_argument("--per-host", type=int, default=2, help="Max pages in flight per host (batch mode)")
+    parser.add_argument("--jsonl", metavar="FILE",
+                        help="Stream one JSON line per page as it completes ('-' for stdout; batch mode)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted --jsonl FILE run, skipping pages already written")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="Reuse the analysis of visually near-identical pages (batch mode)")
+    parser.add_argument("--dedupe-threshold", type=int, default=None,
+                        help=f"Max differing perceptual-hash bits for --dedupe (default {DEFAULT_THRESHOLD})")
+    parser.add_argument("--index", metavar="FILE",
+                        help="Load and save the --dedupe clusters with each representative's result "
+                             "(a few KB per cluster; implies --dedupe)")
 
     args = parser.parse_args()
-    result = analyze_landing(args.url, timeout=args.timeout)
+
+    if bool(args.url) == bool(args.batch):
+        parser.error("provide either a URL or --batch FILE")
+    if args.resume and (not args.jsonl or args.jsonl == "-"):
+        parser.error("--resume needs --jsonl FILE")
+    timings = args.timings or bool(args.trace)
+
+    visual_index = None
+    if args.batch and (args.dedupe or args.index):
+        # Pages are fingerprinted on the first pass: mobile with --single-fetch
+        viewport = "mobile" if args.single_fetch else "desktop"
+        try:
+            visual_index = (
+                ScreenshotIndex.load(args.index, args.dedupe_threshold, viewport) if args.index
+                else ScreenshotIndex(
+                    args.dedupe_threshold if args.dedupe_threshold is not None else DEFAULT_THRESHOLD, viewport
+                )
+            )
+        except ValueError as e:
+            parser.error(str(e))
+
+    def finish_index(file=None) -> None:
+        if visual_index is None:
+            return
+        if args.index:
+            visual_index.save(args.index)
+        print_report(visual_index, file=file)
+
+    if args.batch and args.jsonl:
+        timed = []
+
+        def emit(result: dict) -> None:
+            out.write({**result, "grades": grade_landing(result)}, key=result["url"])
+            if args.trace:
+                timed.append({"url": result["url"], "timings": result["timings"]})
+
+        with JsonlWriter(args.jsonl, resume=args.resume) as out:
+            batch = analyze_batch(
+                out.remaining(read_urls(args.batch)),
+                browsers=args.browsers,
+                concurrency=args.concurrency,
+                per_host=args.per_host,
+                timeout=args.timeout,
+                deadline=args.deadline,
+                single_fetch=args.single_fetch,
+                profile=args.profile,
+                timings=timings,
+                lab_samples=args.lab_samples,
+                throttle=args.throttle,
+                visual_index=visual_index,
+                on_result=emit,
+                keep_results=False,
+            )
+            resumed = out.stats()["resumed_past"]
+        stats = batch["stats"]
+        if args.trace:
+            write_trace(args.trace, timed, args.trace_format)
+        print(f"Analyzed {stats['pages']} pages ({stats['errors']} errors"
+              + (f", {resumed} done in an earlier run" if resumed else "")
+              + f") in {stats['elapsed_s']}s — {stats['pages_per_sec']} pages/sec", file=sys.stderr)
+        if timings:
+            print_phase_summary(stats["slowest_phases"], file=sys.stderr)
+        finish_index(file=sys.stderr)
+        return
+
+    if args.batch:
+        urls = read_urls(args.batch)
+        batch = analyze_batch(
+            urls,
+            browsers=args.browsers,
+            concurrency=args.concurrency,
+            per_host=args.per_host,
+            timeout=args.timeout,
+            deadline=args.deadline,
+            single_fetch=args.single_fetch,
+            profile=args.profile,
+            timings=timings,
+            lab_samples=args.lab_samples,
+            throttle=args.throttle,
+            visual_index=visual_index,
+            on_result=None if args.json else print_batch_line,
+        )
+        stats = batch["stats"]
+        if args.trace:
+            write_trace(args.trace, batch["results"], args.trace_format)
+        if args.json:
+            output = {
+                "results": [{**r, "grades": grade_landing(r)} for r in batch["results"]],
+                "stats": stats,
+            }
+            if visual_index is not None:
+                output["clusters"] = visual_index.report()
+            print(json.dumps(output, indent=2))
+            if args.index:
+                visual_index.save(args.index)
+        else:
+            print(f"\nAnalyzed {stats['pages']} pages ({stats['errors']} errors) "
+                  f"in {stats['elapsed_s']}s — {stats['pages_per_sec']} pages/sec")
+            if timings:
+                print_phase_summary(stats["slowest_phases"])
+            finish_index()
+        return
+
+    result = analyze_landing(
+        args.url, timeout=args.timeout, deadline=args.deadline,
+        single_fetch=args.single_fetch, profile=args.profile,
+        tracer=Tracer() if timings else None,
+        lab_samples=args.lab_samples, throttle=args.throttle,
+    )
     grades = grade_landing(result)
+    if args.trace:
+        write_trace(args.trace, [result], args.trace_format)
 
     if args.json:
         output = {**result, "grades": grades}
@@ -314,6 +849,21 @@ def main():
         cls_status = "GOOD" if cls is not None and cls < 0.1 else "POOR" if cls else "N/A"
         print(f"  CLS: {cls} ({cls_status})")
         print(f"  TTFB: {result['performance']['ttfb_ms']}ms")
+        if result.get("lab"):
+            print("  " + format_lab(result["lab"]).replace("\n", "\n  "))
+        for viewport, ready in result["readiness"].items():
+            if ready:
+                print(f"  Ready ({viewport}): {ready['reason']} after {ready['waited_ms']}ms")
+        if result["requests"]:
+            for viewport in ("desktop", "mobile"):
+                summary = result["requests"][viewport]
+                if summary:
+                    share = summary["third_party_share"]
+                    print(f"  Requests ({viewport}): {summary['count']} "
+                          f"({summary['transfer_bytes'] / 1024 / 1024:.2f}MB, "
+                          f"{'N/A' if share is None else f'{share:.0%}'} third-party, "
+                          f"{summary['third_party_scripts']} third-party scripts, "
+                          f"{summary['blocked']} blocked)")
 
         print(f"\nContent:")
         print(f"  Title: {result['content']['title']}")
@@ -332,6 +882,10 @@ def main():
         for check, grade in grades.items():
             print(f"  [{grade}] {check}")
 
+        if result.get("timings"):
+            print(f"\nTimings:")
+            print_timings(result["timings"])
+
         if result["error"]:
             print(f"\nError: {result['error']}")
 
@@ -0,0 +1,224 @@
+#!/usr/bin/env python3
+"""
+Synthetic landing pages served from a local HTTP server, for benchmark.py.
+
+Each scenario is a page recipe: HTML size, number of external scripts and
+how slowly they are served, server latency before the document, injected
+layout shifts, a never-idle polling loop and the size of the JSON-LD
+payload. Pages carry the same elements the analyzers look for (title, H1,
+meta description, viewport meta, CTA, form, testimonials, hero image) so
+every check has something to grade.
+
+Usage:
+    with FixtureServer() as server:
+        url = server.url("heavy", 3)   # ?i=3 keeps URLs distinct per iteration
+        ...
+
+    python bench_fixtures.py            # serve on a fixed port for manual runs
+    python bench_fixtures.py --port 8900
+"""
+
+import argparse
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs, urlparse
+
+SCENARIOS = {
+    "minimal": {"kb": 8, "scripts": 0, "script_delay_ms": 0, "latency_ms": 0,
+                "shifts": 0, "poll": False, "jsonld_kb": 0},
+    "typical": {"kb": 60, "scripts": 4, "script_delay_ms": 20, "latency_ms": 30,
+                "shifts": 0, "poll": False, "jsonld_kb": 2},
+    "heavy": {"kb": 600, "scripts": 25, "script_delay_ms": 40, "latency_ms": 50,
+              "shifts": 0, "poll": False, "jsonld_kb": 8},
+    "slow": {"kb": 60, "scripts": 4, "script_delay_ms": 300, "latency_ms": 400,
+             "shifts": 0, "poll": False, "jsonld_kb": 2},
+    "shifty": {"kb": 60, "scripts": 2, "script_delay_ms": 20, "latency_ms": 30,
+               "shifts": 8, "poll": False, "jsonld_kb": 2},
+    "polling": {"kb": 60, "scripts": 2, "script_delay_ms": 20, "latency_ms": 30,
+                "shifts": 0, "poll": True, "jsonld_kb": 2},
+    "schema-heavy": {"kb": 60, "scripts": 2, "script_delay_ms": 20, "latency_ms": 30,
+                     "shifts": 0, "poll": False, "jsonld_kb": 250},
+}
+
+_FILLER = (
+    "<p>Our team helps growing businesses plan, launch and measure campaigns "
+    "across search, social and video. Every plan starts with an audit of what "
+    "is already working and ends with a clear budget recommendation.</p>\n"
+)
+
+_HERO_SVG = (
+    '<svg xmlns="http://www.w3.org/2000/svg" width="1200" height="500">'
+    '<rect width="1200" height="500" fill="#2d6cdf"/></svg>'
+)
+
+_SHIFT_SCRIPT = """
+<script>
+(() => {
+    let left = %d;
+    const shift = () => {
+        const bar = document.createElement('div');
+        bar.style.height = '120px';
+        bar.textContent = 'Limited offer';
+        document.body.insertBefore(bar, document.body.firstChild);
+        if (--left > 0) setTimeout(shift, 150);
+    };
+    window.addEventListener('load', () => setTimeout(shift, 100));
+})();
+</script>
+"""
+
+_POLL_SCRIPT = """
+<script>
+setInterval(() => fetch('/poll?t=' + Date.now()).catch(() => {}), 250);
+</script>
+"""
+
+
+def _json_ld(kb: int) -> str:
+    """Product and FAQPage JSON-LD padded with FAQ entries to about `kb` KB."""
+    blocks = [{
+        "@context": "https://schema.org",
+        "@type": "Product",
+        "name": "Campaign Audit",
+        "offers": {"@type": "Offer", "price": "499.00", "priceCurrency": "USD"},
+    }]
+    if kb:
+        questions = []
+        size = 0
+        while size < kb * 1024:
+            n = len(questions)
+            question = {
+                "@type": "Question",
+                "name": f"Question {n}: how long does the audit take?",
+                "acceptedAnswer": {"@type": "Answer", "text": "About a week. " * 8},
+            }
+            questions.append(question)
+            size += len(json.dumps(question))
+        blocks.append({"@context": "https://schema.org", "@type": "FAQPage", "mainEntity": questions})
+    return "".join(
+        f'<script type="application/ld+json">{json.dumps(block)}</script>\n' for block in blocks
+    )
+
+
+def render_page(name: str, kb: int, scripts: int, script_delay_ms: int, shifts: int,
+                poll: bool, jsonld_kb: int, **_) -> str:
+    """HTML for one scenario."""
+    head = [
+        "<!DOCTYPE html>\n<html lang=\"en\">\n<head>\n",
+        "<meta charset=\"utf-8\">\n",
+        "<meta name=\"viewport\" content=\"width=device-width, initial-scale=1\">\n",
+        f"<title>Campaign Audit — {name}</title>\n",
+        "<meta name=\"description\" content=\"Get a full paid advertising audit in a week.\">\n",
+        _json_ld(jsonld_kb),
+    ]
+    head += [
+        f'<script src="/asset/script.js?n={n}&delay={script_delay_ms}" defer></script>\n'
+        for n in range(scripts)
+    ]
+    head.append("</head>\n")
+
+    body = [
+        "<body>\n<h1>Paid Advertising Audit for Growing Brands</h1>\n",
+        '<img src="/asset/hero.svg" width="1200" height="500" alt="Hero">\n',
+        '<a class="btn btn-primary" href="#form">Get Started</a>\n',
+        '<section class="testimonials"><p>"Our cost per lead dropped 40%." — a happy customer. '
+        "Rated 4.9 stars in 300 reviews. SSL secured, money-back guarantee.</p></section>\n",
+        '<form id="form"><input name="name"><input name="email" type="email">'
+        '<input name="phone" type="tel"><button type="submit">Request Audit</button></form>\n',
+    ]
+    size = sum(len(part) for part in head + body)
+    while size < kb * 1024:
+        body.append(_FILLER)
+        size += len(_FILLER)
+    if shifts:
+        body.append(_SHIFT_SCRIPT % shifts)
+    if poll:
+        body.append(_POLL_SCRIPT)
+    body.append("</body>\n</html>\n")
+    return "".join(head + body)
+
+
+class _Handler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    pages = {}
+
+    def log_message(self, format, *args) -> None:
+        pass
+
+    def _send(self, status: int, content_type: str, body: bytes) -> None:
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        self.send_header("Content-Length", str(len(body)))
+        self.send_header("Cache-Control", "no-store")
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(body)
+
+    def do_GET(self) -> None:
+        parsed = urlparse(self.path)
+        query = parse_qs(parsed.query)
+        if parsed.path.startswith("/p/"):
+            name = parsed.path[3:]
+            if name not in SCENARIOS:
+                self._send(404, "text/plain", b"unknown scenario")
+                return
+            time.sleep(SCENARIOS[name]["latency_ms"] / 1000)
+            self._send(200, "text/html; charset=utf-8", self.pages[name])
+        elif parsed.path == "/asset/script.js":
+            time.sleep(int(query.get("delay", ["0"])[0]) / 1000)
+            n = query.get("n", ["0"])[0]
+            self._send(200, "application/javascript", f"window.__bench{n} = {n};".encode())
+        elif parsed.path == "/asset/hero.svg":
+            self._send(200, "image/svg+xml", _HERO_SVG.encode())
+        elif parsed.path == "/poll":
+            self._send(204, "text/plain", b"")
+        else:
+            self._send(404, "text/plain", b"not found")
+
+    do_HEAD = do_GET
+
+
+class FixtureServer:
+    """Serve SCENARIOS on 127.0.0.1 from a background thread."""
+
+    def __init__(self, port: int = 0):
+        _Handler.pages = {
+            name: render_page(name, **params).encode("utf-8") for name, params in SCENARIOS.items()
+        }
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), _Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def url(self, scenario: str, iteration: int = 0) -> str:
+        return f"http://127.0.0.1:{self.port}/p/{scenario}?i={iteration}"
+
+    def __enter__(self) -> "FixtureServer":
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve synthetic landing pages for benchmarking")
+    parser.add_argument("--port", type=int, default=8900, help="Port to listen on")
+
+    args = parser.parse_args()
+
+    with FixtureServer(args.port) as server:
+        for name in SCENARIOS:
+            print(f"{name:14s} {server.url(name)}")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
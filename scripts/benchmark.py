@@ -0,0 +1,430 @@
+#!/usr/bin/env python3
+"""
+Offline benchmark suite for the landing page scripts.
+
+Runs fetch_page(), the static analyzer, analyze_landing() and
+capture_screenshot() (single-page and batch entry points) against the
+synthetic pages of bench_fixtures.py on a local server, and reports for each
+entry point:
+
+    - latency percentiles per phase (e.g. ttfb_ms, parse_ms, ready_mobile_ms)
+    - pages/sec over the whole run
+    - peak RSS of this process plus its children (Playwright driver, Chromium)
+    - peak number of Chromium processes
+
+Results go to a JSON file that --compare checks against a baseline from an
+earlier commit; the exit status is 1 when a phase p50 or pages/sec regressed
+by more than --threshold percent.
+
+Usage:
+    python benchmark.py --output bench.json
+    python benchmark.py --entries fetch static --iterations 20
+    python benchmark.py --scenarios slow polling --entries analyze --single-fetch
+    python benchmark.py --output new.json --compare bench.json --threshold 15
+"""
+
+import argparse
+import datetime
+import importlib.util
+import json
+import os
+import platform
+import subprocess
+import sys
+import tempfile
+import threading
+import time
+
+from bench_fixtures import SCENARIOS, FixtureServer
+from timing import percentiles
+
+BROWSER_ENTRIES = ("analyze", "analyze-batch", "screenshot", "screenshot-batch")
+ENTRY_POINTS = ("fetch", "fetch-bulk", "static") + BROWSER_ENTRIES
+
+DEFAULT_THRESHOLD = 10.0
+
+
+def _proc_status(pid: str) -> dict:
+    fields = {}
+    with open(f"/proc/{pid}/status") as f:
+        for line in f:
+            key, _, value = line.partition(":")
+            fields[key] = value.strip()
+    return fields
+
+
+class ProcessSampler:
+    """
+    Sample the RSS of this process tree and its Chromium process count.
+
+    Reads /proc on Linux; elsewhere only this process's peak RSS (from
+    getrusage) is reported and the Chromium count is None.
+    """
+
+    def __init__(self, interval: float = 0.1):
+        self.interval = interval
+        self.peak_rss = 0
+        self.peak_chromium = 0
+        self.available = os.path.isdir("/proc/self")
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._run, daemon=True)
+
+    def sample(self) -> None:
+        statuses = {}
+        for pid in os.listdir("/proc"):
+            if pid.isdigit():
+                try:
+                    statuses[pid] = _proc_status(pid)
+                except OSError:
+                    pass
+        tree = {str(os.getpid())}
+        grew = True
+        while grew:
+            children = {
+                pid for pid, status in statuses.items()
+                if status.get("PPid") in tree and pid not in tree
+            }
+            tree |= children
+            grew = bool(children)
+        rss_kb = sum(int(statuses[pid].get("VmRSS", "0 kB").split()[0]) for pid in tree if pid in statuses)
+        chromium = sum(
+            1 for pid in tree
+            if pid in statuses and any(n in statuses[pid].get("Name", "") for n in ("chrom", "headless_shell"))
+        )
+        self.peak_rss = max(self.peak_rss, rss_kb * 1024)
+        self.peak_chromium = max(self.peak_chromium, chromium)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self.sample()
+            self._stop.wait(self.interval)
+
+    def __enter__(self) -> "ProcessSampler":
+        if self.available:
+            self._thread.start()
+        return self
+
+    def __exit__(self, *exc) -> None:
+        if self.available:
+            self._stop.set()
+            self._thread.join()
+            self.sample()
+
+    def summary(self) -> dict:
+        if not self.available:
+            try:
+                import resource
+            except ImportError:  # Windows
+                return {"peak_rss_mb": None, "peak_chromium_processes": None}
+            # ru_maxrss is KB on Linux and bytes on macOS
+            scale = 1 if sys.platform == "darwin" else 1024
+            peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss * scale
+            return {"peak_rss_mb": round(peak / 1024 / 1024, 1), "peak_chromium_processes": None}
+        return {
+            "peak_rss_mb": round(self.peak_rss / 1024 / 1024, 1),
+            "peak_chromium_processes": self.peak_chromium,
+        }
+
+
+def _ms(started: float) -> float:
+    return (time.perf_counter() - started) * 1000
+
+
+def _fetch_phases(result: dict) -> dict:
+    transfer = result.get("transfer") or {}
+    return {"ttfb_ms": transfer.get("ttfb_ms"), "total_ms": transfer.get("total_ms")}
+
+
+def _ready_phases(result: dict) -> dict:
+    return {
+        f"ready_{viewport}_ms": ready["waited_ms"]
+        for viewport, ready in (result.get("readiness") or {}).items()
+        if ready
+    }
+
+
+def _run_fetch(urls: list, options: dict):
+    from fetch_page import fetch_page
+
+    for url in urls:
+        started = time.perf_counter()
+        result = fetch_page(url)
+        yield result["error"], {**_fetch_phases(result), "wall_ms": _ms(started)}
+
+
+def _run_fetch_bulk(urls: list, options: dict):
+    from fetch_page import iter_fetch
+
+    for result in iter_fetch(urls, workers=options["concurrency"], per_host=options["concurrency"]):
+        yield result["error"], _fetch_phases(result)
+
+
+def _run_static(urls: list, options: dict):
+    from fetch_page import fetch_page
+    from static_landing import analyze_static
+
+    for url in urls:
+        started = time.perf_counter()
+        fetched = fetch_page(url)
+        fetch_ms = _ms(started)
+        parsed = time.perf_counter()
+        result = analyze_static(fetched)
+        yield result["error"], {"fetch_ms": fetch_ms, "parse_ms": _ms(parsed), "wall_ms": _ms(started)}
+
+
+def _run_analyze(urls: list, options: dict):
+    from analyze_landing import analyze_landing
+
+    for url in urls:
+        started = time.perf_counter()
+        result = analyze_landing(url, single_fetch=options["single_fetch"], profile=options["profile"])
+        yield result["error"], {**_ready_phases(result), "wall_ms": _ms(started)}
+
+
+def _run_analyze_batch(urls: list, options: dict):
+    from analyze_landing import analyze_batch
+
+    batch = analyze_batch(
+        urls, concurrency=options["concurrency"], per_host=options["concurrency"],
+        single_fetch=options["single_fetch"], profile=options["profile"],
+    )
+    for result in batch["results"]:
+        yield result["error"], _ready_phases(result)
+
+
+def _run_screenshot(urls: list, options: dict):
+    from capture_screenshot import capture_screenshot
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        for n, url in enumerate(urls):
+            started = time.perf_counter()
+            result = capture_screenshot(url, os.path.join(output_dir, f"{n}.png"), profile=options["profile"])
+            phases = {"wall_ms": _ms(started)}
+            if result["readiness"]:
+                phases["ready_ms"] = result["readiness"]["waited_ms"]
+            yield result["error"], phases
+
+
+def _run_screenshot_batch(urls: list, options: dict):
+    from capture_screenshot import capture_batch
+
+    with tempfile.TemporaryDirectory() as output_dir:
+        batch = capture_batch(
+            urls, output_dir, concurrency=options["concurrency"], per_host=options["concurrency"],
+            profile=options["profile"],
+        )
+    for result in batch["results"]:
+        for shot in result["shots"]:
+            phases = {f"ready_{shot['viewport']}_ms": shot["readiness"]["waited_ms"]} if shot["readiness"] else {}
+            yield shot["error"], phases
+
+
+RUNNERS = {
+    "fetch": _run_fetch,
+    "fetch-bulk": _run_fetch_bulk,
+    "static": _run_static,
+    "analyze": _run_analyze,
+    "analyze-batch": _run_analyze_batch,
+    "screenshot": _run_screenshot,
+    "screenshot-batch": _run_screenshot_batch,
+}
+
+
+def run_entry(entry: str, server: FixtureServer, scenarios: list, iterations: int, options: dict) -> dict:
+    """
+    Benchmark one entry point over every scenario.
+
+    Returns:
+        Dictionary with pages, errors, elapsed_s, pages_per_sec, phases
+        (percentiles over all pages), scenarios (p50 per phase), peak_rss_mb,
+        peak_chromium_processes and the first error message, if any
+    """
+    urls = [server.url(scenario, i) for i in range(iterations) for scenario in scenarios]
+    runner = RUNNERS[entry]
+
+    # One warm-up page so imports and first-launch costs are not measured
+    for _ in runner([server.url("minimal", -1)], options):
+        pass
+
+    phases = {}
+    by_scenario = {}
+    errors = []
+    pages = 0
+    with ProcessSampler() as sampler:
+        started = time.perf_counter()
+        for n, (error, measured) in enumerate(runner(urls, options)):
+            pages += 1
+            if error:
+                errors.append(error)
+                continue
+            # Batch runners yield in completion order; attribute by position only when ordered
+            scenario = scenarios[n % len(scenarios)] if entry in ("fetch", "static", "analyze", "screenshot") else None
+            for phase, value in measured.items():
+                if value is None:
+                    continue
+                phases.setdefault(phase, []).append(value)
+                if scenario:
+                    by_scenario.setdefault(scenario, {}).setdefault(phase, []).append(value)
+        elapsed = time.perf_counter() - started
+
+    return {
+        "pages": pages,
+        "errors": len(errors),
+        "first_error": errors[0] if errors else None,
+        "elapsed_s": round(elapsed, 3),
+        "pages_per_sec": round(pages / elapsed, 2) if elapsed > 0 else None,
+        "phases": {phase: percentiles(values) for phase, values in phases.items()},
+        "scenarios": {
+            scenario: {phase: percentiles(values)["p50"] for phase, values in measured.items()}
+            for scenario, measured in by_scenario.items()
+        },
+        **sampler.summary(),
+    }
+
+
+def _git_commit() -> str:
+    try:
+        return subprocess.run(
+            ["git", "rev-parse", "--short", "HEAD"],
+            cwd=os.path.dirname(os.path.abspath(__file__)),
+            capture_output=True, text=True, check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def run_benchmark(entries, scenarios, iterations: int = 5, concurrency: int = 4,
+                  single_fetch: bool = False, profile: str = None, on_entry=None) -> dict:
+    """Run the suite and return the machine-readable results document."""
+    options = {"concurrency": concurrency, "single_fetch": single_fetch, "profile": profile}
+    results = {
+        "meta": {
+            "commit": _git_commit(),
+            "timestamp": datetime.datetime.now(datetime.timezone.utc).isoformat(timespec="seconds"),
+            "python": platform.python_version(),
+            "platform": platform.platform(),
+            "cpus": os.cpu_count(),
+            "iterations": iterations,
+            "options": options,
+            "scenarios": {name: SCENARIOS[name] for name in scenarios},
+        },
+        "entries": {},
+    }
+    with FixtureServer() as server:
+        for entry in entries:
+            if entry in BROWSER_ENTRIES and importlib.util.find_spec("playwright") is None:
+                results["entries"][entry] = {"skipped": "playwright not installed"}
+            else:
+                try:
+                    results["entries"][entry] = run_entry(entry, server, scenarios, iterations, options)
+                except Exception as e:
+                    results["entries"][entry] = {"skipped": f"failed: {str(e).splitlines()[0]}"}
+            if on_entry:
+                on_entry(entry, results["entries"][entry])
+    return results
+
+
+def compare(current: dict, baseline: dict, threshold: float = DEFAULT_THRESHOLD) -> list:
+    """
+    Compare phase p50s and pages/sec against a baseline results document.
+
+    Returns:
+        List of (entry, metric, baseline, current, change_pct, regressed) tuples
+    """
+    rows = []
+    for entry, result in current["entries"].items():
+        base = baseline.get("entries", {}).get(entry)
+        if not base or "skipped" in base or "skipped" in result:
+            continue
+        metrics = [("pages_per_sec", base.get("pages_per_sec"), result.get("pages_per_sec"), True)]
+        for phase, stats in result["phases"].items():
+            base_stats = base.get("phases", {}).get(phase, {})
+            metrics.append((f"{phase}.p50", base_stats.get("p50"), stats.get("p50"), False))
+        for metric, old, new, higher_is_better in metrics:
+            if not old or new is None:
+                continue
+            change = (new - old) / old * 100
+            regressed = (-change if higher_is_better else change) > threshold
+            rows.append((entry, metric, old, new, round(change, 1), regressed))
+    return rows
+
+
+def print_entry(entry: str, result: dict) -> None:
+    """Print one entry point's results."""
+    if "skipped" in result:
+        print(f"{entry}: skipped ({result['skipped']})")
+        return
+    chromium = result["peak_chromium_processes"]
+    print(f"{entry}: {result['pages']} pages ({result['errors']} errors) in {result['elapsed_s']}s "
+          f"— {result['pages_per_sec']} pages/sec, peak RSS {result['peak_rss_mb']}MB"
+          + (f", {chromium} Chromium processes" if chromium is not None else ""))
+    for phase, stats in result["phases"].items():
+        print(f"  {phase:18s} p50={stats['p50']:>9} p90={stats['p90']:>9} "
+              f"p99={stats['p99']:>9} max={stats['max']:>9}")
+    if result["first_error"]:
+        print(f"  first error: {result['first_error'].splitlines()[0]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the landing page scripts against local fixtures")
+    parser.add_argument("--entries", "-e", nargs="+", choices=ENTRY_POINTS, default=list(ENTRY_POINTS),
+                        help="Entry points to benchmark")
+    parser.add_argument("--scenarios", "-s", nargs="+", choices=SCENARIOS.keys(), default=list(SCENARIOS),
+                        help="Fixture pages to use")
+    parser.add_argument("--iterations", "-n", type=int, default=5, help="Pages per scenario")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="Concurrency of batch entry points")
+    parser.add_argument("--single-fetch", action="store_true", help="Pass --single-fetch to analyze_landing")
+    parser.add_argument("--profile", "-p", choices=("faithful", "content-only"),
+                        help="Request profile for the browser entry points")
+    parser.add_argument("--output", "-o", help="Write results JSON to this file")
+    parser.add_argument("--compare", metavar="BASELINE", help="Results JSON to compare against")
+    parser.add_argument("--threshold", type=float, default=DEFAULT_THRESHOLD,
+                        help="Regression threshold in percent (with --compare)")
+    parser.add_argument("--json", "-j", action="store_true", help="Print results as JSON")
+
+    args = parser.parse_args()
+
+    results = run_benchmark(
+        args.entries,
+        args.scenarios,
+        iterations=max(1, args.iterations),
+        concurrency=args.concurrency,
+        single_fetch=args.single_fetch,
+        profile=args.profile,
+        on_entry=None if args.json else print_entry,
+    )
+
+    regressed = False
+    if args.compare:
+        with open(args.compare) as f:
+            baseline = json.load(f)
+        rows = compare(results, baseline, args.threshold)
+        results["comparison"] = {
+            "baseline_commit": baseline.get("meta", {}).get("commit"),
+            "threshold_pct": args.threshold,
+            "rows": [
+                {"entry": e, "metric": m, "baseline": b, "current": c, "change_pct": pct, "regressed": r}
+                for e, m, b, c, pct, r in rows
+            ],
+        }
+        regressed = any(row[-1] for row in rows)
+        if not args.json:
+            print(f"\nCompared with {args.compare} (commit {results['comparison']['baseline_commit']}):")
+            for entry, metric, old, new, change, is_regression in rows:
+                flag = "  REGRESSION" if is_regression else ""
+                print(f"  {entry:16s} {metric:24s} {old:>9} -> {new:>9} ({change:+.1f}%){flag}")
+
+    # Written after the comparison so the file records it too
+    if args.output:
+        with open(args.output, "w") as f:
+            json.dump(results, f, indent=2)
+
+    if args.json:
+        print(json.dumps(results, indent=2))
+
+    if regressed:
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
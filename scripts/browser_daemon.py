@@ -0,0 +1,362 @@
+#!/usr/bin/env python3
+"""
+Warm Chromium daemon for the landing page scripts.
+
+Keeps a headless Chromium running behind a local Unix socket so that
+analyze_landing.py and capture_screenshot.py attach to it instead of paying
+browser launch on every invocation. The scripts use it automatically when it
+is running (set CLAUDE_ADS_NO_DAEMON=1 to opt out) and launch their own
+browser otherwise.
+
+Chromium is not exposed on a remote debugging port: it runs under
+`playwright launch-server`, which drives it over --remote-debugging-pipe and
+accepts Playwright clients on a loopback websocket whose path is a random
+token. The token is only handed out over the Unix socket (mode 0600), so
+other local users cannot attach to the browser.
+
+The daemon hands out leases. Each lease is one attached client; it sees only
+the contexts it created, and they are closed when it disconnects. After
+--recycle-after leases the browser is replaced by a fresh one (the old one
+is closed once its last lease is released) to bound memory, and a crashed
+browser is relaunched on the next lease.
+
+Usage:
+    python browser_daemon.py start &
+    python browser_daemon.py start --recycle-after 200
+    python browser_daemon.py status
+    python browser_daemon.py stop
+"""
+
+import argparse
+import asyncio
+import itertools
+import json
+import os
+import secrets
+import signal
+import socket
+import stat
+import sys
+import tempfile
+
+DEFAULT_RECYCLE_AFTER = 100
+LAUNCH_TIMEOUT = 60.0
+
+
+def default_socket_path() -> str:
+    """Per-user socket path ($CLAUDE_ADS_BROWSER_SOCKET overrides)."""
+    if os.environ.get("CLAUDE_ADS_BROWSER_SOCKET"):
+        return os.environ["CLAUDE_ADS_BROWSER_SOCKET"]
+    base = os.environ.get("XDG_RUNTIME_DIR") or tempfile.gettempdir()
+    uid = os.getuid() if hasattr(os, "getuid") else "user"
+    return os.path.join(base, f"claude-ads-browser-{uid}.sock")
+
+
+def _request(message: dict, socket_path: str = None, timeout: float = 5.0) -> dict:
+    """Send one JSON request to the daemon and return its JSON reply."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(timeout)
+        sock.connect(socket_path or default_socket_path())
+        sock.sendall(json.dumps(message).encode() + b"\n")
+        reply = b""
+        while not reply.endswith(b"\n"):
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            reply += chunk
+    return json.loads(reply or b"{}")
+
+
+def lease(socket_path: str = None):
+    """
+    Lease the daemon's browser.
+
+    Returns:
+        (ws_endpoint, lease_id), or None when no daemon is reachable or the
+        caller opted out with CLAUDE_ADS_NO_DAEMON=1
+    """
+    if os.environ.get("CLAUDE_ADS_NO_DAEMON") or not hasattr(socket, "AF_UNIX"):
+        return None
+    try:
+        reply = _request({"op": "lease"}, socket_path, timeout=30.0)
+    except (OSError, ValueError):
+        return None
+    if reply.get("error"):
+        return None
+    return reply["endpoint"], reply["lease"]
+
+
+def release(lease_id: int, socket_path: str = None) -> None:
+    """Return a lease; never raises, the daemon may already be gone."""
+    try:
+        _request({"op": "release", "lease": lease_id}, socket_path)
+    except (OSError, ValueError):
+        pass
+
+
+async def attach_async(playwright):
+    """
+    Connect to the daemon's browser, or launch a private one.
+
+    Returns:
+        (browser, lease_id); lease_id is None for a privately launched browser.
+        Close the browser, then release(lease_id) when it is not None.
+    """
+    leased = lease()
+    if leased:
+        endpoint, lease_id = leased
+        try:
+            return await playwright.chromium.connect(endpoint), lease_id
+        except Exception:
+            release(lease_id)
+    return await playwright.chromium.launch(headless=True), None
+
+
+def attach_sync(playwright):
+    """attach_async() for the sync Playwright API."""
+    leased = lease()
+    if leased:
+        endpoint, lease_id = leased
+        try:
+            return playwright.chromium.connect(endpoint), lease_id
+        except Exception:
+            release(lease_id)
+    return playwright.chromium.launch(headless=True), None
+
+
+def _socket_in_use(path: str) -> bool:
+    """Whether something is listening on the Unix socket at `path`."""
+    with socket.socket(socket.AF_UNIX, socket.SOCK_STREAM) as sock:
+        sock.settimeout(1.0)
+        try:
+            sock.connect(path)
+        except (ConnectionRefusedError, FileNotFoundError):
+            return False
+        except OSError:
+            return True
+    return True
+
+
+class _Generation:
+    """One launched browser server and the leases it has served."""
+
+    def __init__(self, process, endpoint: str):
+        self.process = process
+        self.endpoint = endpoint
+        self.served = 0
+        self.active = set()
+        self.retired = False
+        self.drains = []
+
+    def is_connected(self) -> bool:
+        return self.process.returncode is None
+
+
+class BrowserDaemon:
+    """Serve browser leases on a Unix socket, recycling and restarting Chromium."""
+
+    def __init__(self, socket_path: str = None, recycle_after: int = DEFAULT_RECYCLE_AFTER):
+        self.socket_path = socket_path or default_socket_path()
+        self.recycle_after = max(1, recycle_after)
+        self.current = None
+        self.generations = {}
+        self.lease_ids = itertools.count(1)
+        self.restarts = 0
+        self.recycles = 0
+        self.leases_served = 0
+        self._lock = asyncio.Lock()
+        self._stopped = asyncio.Event()
+
+    async def _launch(self) -> _Generation:
+        """
+        Start `playwright launch-server` for headless Chromium.
+
+        The server binds a free loopback port itself and only accepts
+        websocket connections on the secret path; the config file carrying
+        it is private to this user and removed once the server is up.
+        """
+        fd, config_path = tempfile.mkstemp(prefix="claude-ads-browser-", suffix=".json")
+        with os.fdopen(fd, "w") as config:
+            json.dump({
+                "headless": True,
+                "host": "127.0.0.1",
+                "port": 0,
+                "wsPath": secrets.token_urlsafe(32),
+            }, config)
+        try:
+            process = await asyncio.create_subprocess_exec(
+                sys.executable, "-m", "playwright", "launch-server",
+                "--browser", "chromium", "--config", config_path,
+                stdin=asyncio.subprocess.DEVNULL,
+                stdout=asyncio.subprocess.PIPE,
+                stderr=asyncio.subprocess.PIPE,
+                start_new_session=True,
+            )
+            try:
+                line = await asyncio.wait_for(process.stdout.readline(), LAUNCH_TIMEOUT)
+            except asyncio.TimeoutError:
+                line = b""
+        finally:
+            os.remove(config_path)
+        endpoint = line.decode(errors="replace").strip()
+        if not endpoint.startswith("ws://"):
+            await self._close_generation(_Generation(process, None))
+            detail = (await process.stderr.read()).decode(errors="replace").strip()
+            raise RuntimeError(f"Browser server failed to start: {detail or 'no endpoint'}")
+        generation = _Generation(process, endpoint)
+        # Keep draining the server's output so it never blocks on a full pipe
+        generation.drains = [asyncio.ensure_future(process.stdout.read()),
+                             asyncio.ensure_future(process.stderr.read())]
+        return generation
+
+    async def _close_generation(self, generation: _Generation) -> None:
+        """Stop a browser server with its Chromium (one process group)."""
+        process = generation.process
+        if process.returncode is not None:
+            return
+        for sig in (signal.SIGTERM, signal.SIGKILL):
+            try:
+                os.killpg(process.pid, sig)
+            except (ProcessLookupError, PermissionError):
+                return
+            try:
+                await asyncio.wait_for(process.wait(), 10.0)
+                return
+            except asyncio.TimeoutError:
+                pass
+
+    async def _lease(self) -> dict:
+        async with self._lock:
+            current = self.current
+            if current is not None and not current.is_connected():
+                self.restarts += 1
+                current.retired = True
+                current = None
+            elif current is not None and current.served >= self.recycle_after:
+                self.recycles += 1
+                current.retired = True
+                if not current.active:
+                    await self._close_generation(current)
+                current = None
+            if current is None:
+                current = self.current = await self._launch()
+
+            lease_id = next(self.lease_ids)
+            current.served += 1
+            current.active.add(lease_id)
+            self.generations[lease_id] = current
+            self.leases_served += 1
+            return {"endpoint": current.endpoint, "lease": lease_id}
+
+    async def _release(self, lease_id: int) -> dict:
+        async with self._lock:
+            generation = self.generations.pop(lease_id, None)
+            if generation is None:
+                return {"ok": False}
+            generation.active.discard(lease_id)
+            if generation.retired and not generation.active:
+                await self._close_generation(generation)
+            return {"ok": True}
+
+    def status(self) -> dict:
+        current = self.current
+        return {
+            "pid": os.getpid(),
+            "socket": self.socket_path,
+            "browser_pid": current.process.pid if current else None,
+            "connected": bool(current and current.is_connected()),
+            "current_served": current.served if current else 0,
+            "active_leases": len(self.generations),
+            "leases_served": self.leases_served,
+            "recycle_after": self.recycle_after,
+            "recycles": self.recycles,
+            "restarts": self.restarts,
+        }
+
+    async def _handle(self, reader, writer) -> None:
+        try:
+            message = json.loads(await reader.readline() or b"{}")
+            op = message.get("op")
+            if op == "lease":
+                reply = await self._lease()
+            elif op == "release":
+                reply = await self._release(message.get("lease"))
+            elif op == "status":
+                reply = self.status()
+            elif op == "stop":
+                reply = {"ok": True}
+                self._stopped.set()
+            else:
+                reply = {"error": f"Unknown op: {op}"}
+        except Exception as e:
+            reply = {"error": str(e)}
+        writer.write(json.dumps(reply).encode() + b"\n")
+        try:
+            await writer.drain()
+        finally:
+            writer.close()
+
+    async def serve(self) -> None:
+        if os.path.lexists(self.socket_path):
+            if not stat.S_ISSOCK(os.lstat(self.socket_path).st_mode):
+                raise RuntimeError(f"{self.socket_path} exists and is not a socket")
+            if _socket_in_use(self.socket_path):
+                raise RuntimeError(f"A browser daemon is already listening on {self.socket_path}")
+            os.remove(self.socket_path)  # stale, left by a daemon that died
+        self.current = await self._launch()
+        try:
+            # Created with mode 0600 from the start, not chmod-ed after listening
+            umask = os.umask(0o177)
+            try:
+                server = await asyncio.start_unix_server(self._handle, path=self.socket_path)
+            finally:
+                os.umask(umask)
+            print(f"Browser daemon listening on {self.socket_path}", flush=True)
+            async with server:
+                await self._stopped.wait()
+        finally:
+            for generation in {id(g): g for g in [self.current, *self.generations.values()] if g}.values():
+                await self._close_generation(generation)
+            if os.path.exists(self.socket_path):
+                os.remove(self.socket_path)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Warm Chromium daemon for the landing page scripts")
+    parser.add_argument("command", choices=["start", "status", "stop"])
+    parser.add_argument("--socket", default=None, help=f"Unix socket path (default: {default_socket_path()})")
+    parser.add_argument("--recycle-after", type=int, default=DEFAULT_RECYCLE_AFTER,
+                        help="Replace the browser after this many leases")
+
+    args = parser.parse_args()
+
+    if not hasattr(socket, "AF_UNIX"):
+        print("Error: the browser daemon needs Unix domain sockets (not available on this platform)")
+        sys.exit(1)
+
+    if args.command == "start":
+        try:
+            import playwright  # noqa: F401
+        except ImportError:
+            print("Error: playwright required. Install with: pip install -r requirements.txt && playwright install chromium")
+            sys.exit(1)
+        daemon = BrowserDaemon(args.socket, recycle_after=args.recycle_after)
+        try:
+            asyncio.run(daemon.serve())
+        except KeyboardInterrupt:
+            pass
+        except RuntimeError as e:
+            print(f"Error: {e}")
+            sys.exit(1)
+        return
+
+    try:
+        reply = _request({"op": args.command}, args.socket)
+    except OSError:
+        print("Browser daemon is not running")
+        sys.exit(1)
+    print(json.dumps(reply, indent=2))
+
+
+if __name__ == "__main__":
+    main()
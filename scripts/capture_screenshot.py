@@ -6,25 +6,133 @@ Usage:
     python capture_screenshot.py https://example.com/landing
     python capture_screenshot.py https://example.com/landing --mobile
     python capture_screenshot.py https://example.com/landing --all
+    python capture_screenshot.py https://example.com/landing --profile content-only
+    python capture_screenshot.py https://example.com/landing --all --full --format webp --max-height 6000
+    python capture_screenshot.py --batch urls.txt --all --format jpeg --quality 70 -c 4
+    python capture_screenshot.py --batch urls.txt --all --timings --trace shots-trace.json
+    python capture_screenshot.py --batch urls.txt --all --jsonl shots.jsonl --resume
+    python capture_screenshot.py --batch urls.txt --all --dedupe --index shots-index.json
+
+Attaches to the warm browser of browser_daemon.py when it is running. With
+--all or --batch, each URL is captured in every viewport at once from parallel
+contexts of one browser. With --dedupe, pages that look like a page already
+captured (see screenshot_index.py) reuse its screenshots.
 """
 
 import argparse
+import asyncio
+import base64
+import hashlib
+import json
 import os
+import re
 import sys
+import time
 from urllib.parse import urlparse
 
 try:
+    from playwright.async_api import async_playwright
     from playwright.sync_api import sync_playwright, TimeoutError as PlaywrightTimeout
 except ImportError:
     print("Error: playwright required. Install with: pip install -r requirements.txt && playwright install chromium")
     sys.exit(1)
 
+from browser_daemon import attach_async, attach_sync, release
+from core import DEFAULT_TIMEOUT_MS, VIEWPORTS, ShotResult, timeout_error
+from jsonl_output import JsonlWriter
+from page_ready import DEFAULT_DEADLINE_MS, WAIT_FOR_READY, ready_options, remaining_ms
+from screenshot_index import DEFAULT_THRESHOLD, ScreenshotIndex, page_fingerprint, print_report
+from request_policy import (
+    PROFILES,
+    RequestLedger,
+    async_route_handler,
+    blocks_anything,
+    sync_route_handler,
+)
+from timing import (
+    TRACE_FORMATS,
+    Tracer,
+    print_phase_summary,
+    print_timings,
+    span,
+    summarize_phases,
+    write_trace,
+)
+from url_list import host_of, read_urls
+
+
+FORMATS = ("png", "jpeg", "webp")
+EXTENSIONS = {"png": "png", "jpeg": "jpg", "webp": "webp"}
+DEFAULT_QUALITY = 80
+
+PAGE_SIZE = "() => [document.documentElement.scrollWidth, document.documentElement.scrollHeight]"
+
+
+def output_name(url: str, viewport: str, image_format: str = "png", with_path: bool = False) -> str:
+    """
+    Screenshot file name for a URL and viewport.
+
+    with_path adds the URL path and a short hash so that many pages of the
+    same host (batch mode) get distinct names.
+    """
+    parsed = urlparse(url)
+    stem = parsed.netloc.replace(".", "_")
+    if with_path:
+        slug = re.sub(r"[^A-Za-z0-9]+", "_", parsed.path).strip("_")[:60]
+        digest = hashlib.sha1(url.encode("utf-8")).hexdigest()[:8]
+        stem = "_".join(part for part in (stem, slug, digest) if part)
+    return f"{stem}_{viewport}.{EXTENSIONS[image_format]}"
+
+
+def _context_options(viewport: str) -> dict:
+    return VIEWPORTS[viewport].context_options()
 
-VIEWPORTS = {
-    "desktop": {"width": 1920, "height": 1080},
-    "tablet": {"width": 768, "height": 1024},
-    "mobile": {"width": 375, "height": 812},
-}
+
+def _clip(viewport: str, page_size, full_page: bool, max_height: int):
+    """Clip rectangle for max-height clipping, or None to shoot the page or viewport as is."""
+    width, height = VIEWPORTS[viewport].width, VIEWPORTS[viewport].height
+    if full_page:
+        width, height = max(width, page_size[0]), max(height, page_size[1])
+    if not max_height or max_height >= height:
+        return None
+    return {"x": 0, "y": 0, "width": width, "height": max_height}
+
+
+def _shot_options(image_format: str, quality: int, full_page: bool, clip) -> dict:
+    """page.screenshot() keyword arguments for a PNG or JPEG shot."""
+    options = {"type": image_format, "full_page": full_page}
+    if image_format == "jpeg":
+        options["quality"] = quality
+    if clip:
+        options["clip"] = clip
+    return options
+
+
+def _webp_params(viewport: str, page_size, quality: int, full_page: bool, clip) -> dict:
+    """
+    Page.captureScreenshot parameters for a WebP shot.
+
+    Playwright only encodes PNG and JPEG; Chromium encodes WebP itself over CDP.
+    """
+    if clip is None:
+        width, height = VIEWPORTS[viewport].width, VIEWPORTS[viewport].height
+        if full_page:
+            width, height = max(width, page_size[0]), max(height, page_size[1])
+        clip = {"x": 0, "y": 0, "width": width, "height": height}
+    return {
+        "format": "webp",
+        "quality": quality,
+        "captureBeyondViewport": full_page,
+        "clip": {**clip, "scale": 1},
+    }
+
+
+def _validate(viewport: str, image_format: str):
+    if viewport not in VIEWPORTS:
+        return f"Invalid viewport: {viewport}. Choose from: {list(VIEWPORTS.keys())}"
+    if image_format not in FORMATS:
+        return f"Invalid format: {image_format}. Choose from: {list(FORMATS)}"
+    return None
 
 
 def capture_screenshot(
@@ -32,85 +140,544 @@ def capture_screenshot(
     output_path: str,
     viewport: str = "desktop",
     full_page: bool = False,
-    timeout: int = 30000,
+    timeout: int = DEFAULT_TIMEOUT_MS,
+    deadline: int = DEFAULT_DEADLINE_MS,
+    profile: str = None,
+    image_format: str = "png",
+    quality: int = DEFAULT_QUALITY,
+    max_height: int = None,
+    tracer: Tracer = None,
 ) -> dict:
     """
     Capture a screenshot of an ad landing page.
 
+    The shot is taken once the largest paint and layout shifts have settled,
+    or when `deadline` ms have passed, whichever comes first. A request
+    profile (faithful or content-only) accounts for every request under
+    `requests` and blocks what the profile excludes.
+
+    `image_format` is png, jpeg or webp; `quality` (0-100) applies to jpeg
+    and webp. `max_height` clips the shot to that many CSS pixels from the top.
+    With a tracer (see timing.py), browser attach, navigation, readiness wait
+    and the shot itself are timed under result["timings"].
+
     Returns:
-        Dictionary with url, output, viewport, success, error
+        Dictionary with url, output, viewport, success, readiness, requests,
+        bytes, error
     """
-    result = {
-        "url": url,
-        "output": output_path,
-        "viewport": viewport,
-        "success": False,
-        "error": None,
-    }
+    result = ShotResult(url, output_path, viewport).to_dict()
 
-    if viewport not in VIEWPORTS:
-        result["error"] = f"Invalid viewport: {viewport}. Choose from: {list(VIEWPORTS.keys())}"
+    result["error"] = _validate(viewport, image_format)
+    if result["error"]:
         return result
 
-    vp = VIEWPORTS[viewport]
-
     try:
-        with sync_playwright() as p:
-            browser = p.chromium.launch(headless=True)
-            context = browser.new_context(
-                viewport={"width": vp["width"], "height": vp["height"]},
-                device_scale_factor=2 if viewport == "mobile" else 1,
-            )
-            page = context.new_page()
-            page.goto(url, wait_until="networkidle", timeout=timeout)
-            page.wait_for_timeout(1000)
-            page.screenshot(path=output_path, full_page=full_page)
-            result["success"] = True
-            browser.close()
+        with span(tracer, "driver.start"):
+            p = sync_playwright().start()
+        try:
+            with span(tracer, "browser.attach"):
+                browser, lease_id = attach_sync(p)
+            try:
+                with span(tracer, "context"):
+                    context = browser.new_context(**_context_options(viewport))
+                    page = context.new_page()
+                    ledger = None
+                    cdp = None
+                    if image_format == "webp":
+                        cdp = context.new_cdp_session(page)
+                    if profile:
+                        ledger = RequestLedger(url)
+                        ledger.attach(context)
+                        if blocks_anything(profile):
+                            context.route("**/*", sync_route_handler(profile))
+                started = time.perf_counter()
+                with span(tracer, "goto"):
+                    page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+                with span(tracer, "ready"):
+                    ready = page.evaluate(
+                        WAIT_FOR_READY,
+                        ready_options(("lcp", "cls"), deadline_ms=remaining_ms(started, deadline)),
+                    )
+                result["readiness"] = {k: ready[k] for k in ("reason", "pending", "waited_ms")}
+                with span(tracer, "screenshot", format=image_format):
+                    page_size = page.evaluate(PAGE_SIZE) if full_page or image_format == "webp" else (0, 0)
+                    clip = _clip(viewport, page_size, full_page, max_height)
+                    if image_format == "webp":
+                        shot = cdp.send(
+                            "Page.captureScreenshot",
+                            _webp_params(viewport, page_size, quality, full_page, clip),
+                        )
+                        with open(output_path, "wb") as f:
+                            f.write(base64.b64decode(shot["data"]))
+                    else:
+                        page.screenshot(path=output_path, **_shot_options(image_format, quality, full_page, clip))
+                if ledger:
+                    ledger.settle_sync()
+                    result["requests"] = {"profile": profile, **ledger.summary()}
+                result["bytes"] = os.path.getsize(output_path)
+                result["success"] = True
+            finally:
+                with span(tracer, "browser.close"):
+                    browser.close()
+                    if lease_id is not None:
+                        release(lease_id)
+        finally:
+            p.stop()
 
     except PlaywrightTimeout:
-        result["error"] = f"Page load timed out after {timeout}ms"
+        result["error"] = timeout_error(timeout)
     except Exception as e:
         result["error"] = str(e)
 
+    if tracer:
+        result["timings"] = tracer.to_dict()
+    return result
+
+
+async def _capture_in_context(
+    browser,
+    url: str,
+    output_path: str,
+    viewport: str,
+    full_page: bool,
+    timeout: int,
+    deadline: int,
+    profile: str,
+    image_format: str,
+    quality: int,
+    max_height: int,
+    tracer: Tracer = None,
+    duplicate=None,
+) -> dict:
+    """
+    capture_screenshot() for one viewport in its own context of a shared async browser.
+
+    duplicate(context, page), when given, is awaited once the page is ready;
+    if it returns True the screenshot is skipped and result["duplicate"] set.
+    """
+    result = ShotResult(url, output_path, viewport).to_dict()
+    context = None
+    try:
+        with span(tracer, f"{viewport}.context"):
+            context = await browser.new_context(**_context_options(viewport))
+            page = await context.new_page()
+            ledger = None
+            cdp = None
+            if image_format == "webp":
+                cdp = await context.new_cdp_session(page)
+            if profile:
+                ledger = RequestLedger(url)
+                ledger.attach(context)
+                if blocks_anything(profile):
+                    await context.route("**/*", async_route_handler(profile))
+        started = time.perf_counter()
+        with span(tracer, f"{viewport}.goto"):
+            await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        with span(tracer, f"{viewport}.ready"):
+            ready = await page.evaluate(
+                WAIT_FOR_READY,
+                ready_options(("lcp", "cls"), deadline_ms=remaining_ms(started, deadline)),
+            )
+        result["readiness"] = {k: ready[k] for k in ("reason", "pending", "waited_ms")}
+        if duplicate is not None:
+            with span(tracer, f"{viewport}.dedupe"):
+                if await duplicate(context, page):
+                    result["duplicate"] = True
+                    return result
+        with span(tracer, f"{viewport}.screenshot", format=image_format):
+            page_size = await page.evaluate(PAGE_SIZE) if full_page or image_format == "webp" else (0, 0)
+            clip = _clip(viewport, page_size, full_page, max_height)
+            if image_format == "webp":
+                shot = await cdp.send(
+                    "Page.captureScreenshot",
+                    _webp_params(viewport, page_size, quality, full_page, clip),
+                )
+                with open(output_path, "wb") as f:
+                    f.write(base64.b64decode(shot["data"]))
+            else:
+                await page.screenshot(path=output_path, **_shot_options(image_format, quality, full_page, clip))
+        if ledger:
+            await ledger.settle()
+            result["requests"] = {"profile": profile, **ledger.summary()}
+        result["bytes"] = os.path.getsize(output_path)
+        result["success"] = True
+    except PlaywrightTimeout:
+        result["error"] = timeout_error(timeout)
+    except Exception as e:
+        result["error"] = str(e)
+    finally:
+        if context is not None:
+            with span(tracer, f"{viewport}.close"):
+                try:
+                    await context.close()
+                except Exception:
+                    pass
     return result
 
 
+async def iter_capture(
+    urls: list,
+    output_dir: str,
+    viewports=tuple(VIEWPORTS),
+    full_page: bool = False,
+    timeout: int = DEFAULT_TIMEOUT_MS,
+    deadline: int = DEFAULT_DEADLINE_MS,
+    profile: str = None,
+    image_format: str = "png",
+    quality: int = DEFAULT_QUALITY,
+    max_height: int = None,
+    concurrency: int = 4,
+    per_host: int = 2,
+    timings: bool = False,
+    visual_index: ScreenshotIndex = None,
+    with_path: bool = None,
+):
+    """
+    Capture every viewport of many URLs from one browser, yielding per-URL results as they complete.
+
+    Each URL's viewports are opened as parallel contexts, so a page is
+    captured in all of them in the time of its slowest viewport.
+
+    With a visual_index, the first viewport is loaded alone and fingerprinted
+    when it is ready. A page that joins an existing cluster reuses the
+    representative's shots (result["duplicate_of"]) without opening its
+    other viewports; otherwise the remaining viewports are captured as usual.
+
+    Args:
+        urls: Landing page URLs to capture
+        output_dir: Directory for the image files (created if missing)
+        viewports: Viewport names to capture for each URL
+        concurrency: Maximum URLs in flight across all hosts
+        per_host: Maximum URLs in flight against a single host
+        timings: Time each URL's phases (including the wait for a slot)
+            under result["timings"]
+        visual_index: Cluster near-duplicate pages and reuse their shots
+        with_path: Put the URL path in file names (see output_name()); by
+            default when there is more than one URL. Pass it when urls is
+            part of a larger list, e.g. what is left of a resumed batch
+
+    Yields:
+        Dictionaries with url and shots (one capture_screenshot()-shaped
+        result per viewport), plus visual_cluster/duplicate_of with a
+        visual_index and timings when requested, in completion order
+    """
+    for viewport in viewports:
+        error = _validate(viewport, image_format)
+        if error:
+            raise ValueError(error)
+    os.makedirs(output_dir, exist_ok=True)
+    global_slots = asyncio.Semaphore(max(1, concurrency))
+    host_slots = {}
+    if with_path is None:
+        with_path = len(urls) > 1
+    if visual_index is not None:
+        visual_index.viewport = visual_index.viewport or viewports[0]
+        if visual_index.viewport != viewports[0]:
+            raise ValueError(f"The visual index holds {visual_index.viewport} fingerprints; "
+                             f"capture {visual_index.viewport} first")
+
+    async with async_playwright() as p:
+        browser, lease_id = await attach_async(p)
+
+        def capture(url: str, viewport: str, tracer: Tracer, duplicate=None):
+            return _capture_in_context(
+                browser, url,
+                os.path.join(output_dir, output_name(url, viewport, image_format, with_path)),
+                viewport, full_page, timeout, deadline, profile,
+                image_format, quality, max_height, tracer, duplicate,
+            )
+
+        async def capture_deduped(url: str, tracer: Tracer) -> dict:
+            """Fingerprint the first viewport, then reuse a representative's shots or capture the rest."""
+            claimed = {}
+
+            async def duplicate(context, page) -> bool:
+                cluster, distance = visual_index.claim(url, await page_fingerprint(context, page))
+                claimed.update(cluster=cluster, distance=distance)
+                if distance is None:
+                    return False
+                claimed["reused"] = await visual_index.reuse(cluster)
+                return claimed["reused"] is not None
+
+            result = {"url": url}
+            try:
+                first = await capture(url, viewports[0], tracer, duplicate)
+                reused = claimed.get("reused")
+                if reused:
+                    result["shots"] = [{**shot, "url": url} for shot in reused["shots"]]
+                    result["duplicate_of"] = reused["url"]
+                else:
+                    rest = await asyncio.gather(*(capture(url, viewport, tracer) for viewport in viewports[1:]))
+                    result["shots"] = [first, *rest]
+                if "cluster" in claimed:
+                    result["visual_cluster"] = claimed["cluster"]["id"]
+                    if claimed["distance"] is not None:
+                        result["visual_distance"] = claimed["distance"]
+                return result
+            finally:
+                if "cluster" in claimed and claimed["distance"] is None:
+                    failed = "shots" not in result or any(shot["error"] for shot in result["shots"])
+                    visual_index.resolve(claimed["cluster"], {**result, "error": "capture failed" if failed else None})
+
+        async def run_one(url: str) -> dict:
+            tracer = Tracer() if timings else None
+            host = host_of(url)
+            if host not in host_slots:
+                host_slots[host] = asyncio.Semaphore(max(1, per_host))
+            with span(tracer, "queue.wait"):
+                await host_slots[host].acquire()
+                await global_slots.acquire()
+            try:
+                with span(tracer, "page", url=url):
+                    if visual_index is not None:
+                        result = await capture_deduped(url, tracer)
+                    else:
+                        shots = await asyncio.gather(*(capture(url, viewport, tracer) for viewport in viewports))
+                        result = {"url": url, "shots": list(shots)}
+            finally:
+                global_slots.release()
+                host_slots[host].release()
+            if tracer:
+                result["timings"] = tracer.to_dict()
+            return result
+
+        try:
+            for task in asyncio.as_completed([run_one(url) for url in urls]):
+                yield await task
+        finally:
+            try:
+                await browser.close()
+            except Exception:
+                pass
+            if lease_id is not None:
+                release(lease_id)
+
+
+def capture_batch(
+    urls: list, output_dir: str, on_result=None, keep_results: bool = True, **options
+) -> dict:
+    """
+    Capture many URLs in every requested viewport (see iter_capture() for options).
+
+    Args:
+        on_result: Optional callback invoked with each per-URL result as it completes
+        keep_results: Collect results in the return value; pass False when
+            on_result streams them (see jsonl_output.py) to keep memory flat
+
+    Returns:
+        Dictionary with results (completion order, empty without
+        keep_results) and stats (pages, screenshots, errors, bytes,
+        elapsed_s, pages_per_sec, duplicates with a visual_index, and
+        slowest_phases when timings is set); reused shots are not counted
+        as screenshots or bytes
+    """
+    results = []
+    timed = []
+    stats = {"pages": 0, "screenshots": 0, "errors": 0, "bytes": 0}
+    if options.get("visual_index") is not None:
+        stats["duplicates"] = 0
+
+    async def run() -> None:
+        async for result in iter_capture(urls, output_dir, **options):
+            stats["pages"] += 1
+            if result.get("duplicate_of"):
+                stats["duplicates"] += 1
+                stats["errors"] += sum(bool(shot["error"]) for shot in result["shots"])
+            for shot in [] if result.get("duplicate_of") else result["shots"]:
+                stats["screenshots"] += bool(shot["success"])
+                stats["errors"] += bool(shot["error"])
+                stats["bytes"] += shot["bytes"] or 0
+            if keep_results:
+                results.append(result)
+            elif result.get("timings"):
+                timed.append({"url": result["url"], "timings": result["timings"]})
+            if on_result:
+                on_result(result)
+
+    started = time.perf_counter()
+    asyncio.run(run())
+    elapsed = time.perf_counter() - started
+
+    stats["elapsed_s"] = round(elapsed, 2)
+    stats["pages_per_sec"] = round(stats["pages"] / elapsed, 2) if elapsed > 0 else None
+    if options.get("timings"):
+        stats["slowest_phases"] = summarize_phases(results or timed)
+    return {"results": results, "stats": stats}
+
+
+def print_shot(shot: dict) -> None:
+    """Print the outcome of one screenshot."""
+    if shot["success"]:
+        ready = shot["readiness"]
+        print(f"  Saved to {shot['output']} ({shot['bytes'] // 1024}KB, "
+              f"{ready['reason']} after {ready['waited_ms']}ms)")
+    else:
+        print(f"  Failed: {shot['error']}")
+
+
 def main():
     parser = argparse.ArgumentParser(description="Capture ad landing page screenshots")
-    parser.add_argument("url", help="URL to capture")
+    parser.add_argument("url", nargs="?", help="URL to capture")
     parser.add_argument("--output", "-o", default="screenshots", help="Output directory")
     parser.add_argument("--viewport", "-v", default="desktop", choices=VIEWPORTS.keys())
     parser.add_argument("--all", "-a", action="store_true", help="Capture all viewports")
     parser.add_argument("--full", "-f", action="store_true", help="Capture full page")
-    parser.add_argument("--timeout", "-t", type=int, default=30000, help="Timeout in ms")
+    parser.add_argument("--format", default="png", choices=FORMATS, help="Image format")
+    parser.add_argument("--quality", "-q", type=int, default=DEFAULT_QUALITY,
+                        help="JPEG/WebP quality, 0-100")
+    parser.add_argument("--max-height", type=int, default=None,
+                        help="Clip screenshots to this many CSS pixels from the top")
+    parser.add_argument("--timeout", "-t", type=int, default=DEFAULT_TIMEOUT_MS, help="Timeout in ms")
+    parser.add_argument("--deadline", "-d", type=int, default=DEFAULT_DEADLINE_MS,
+                        help="Hard per-page readiness deadline in ms")
+    parser.add_argument("--profile", "-p", choices=PROFILES,
+                        help="Request profile: account for every request (faithful) or block "
+                             "media, fonts and ad/analytics hosts (content-only)")
+    parser.add_argument("--batch", "-b", metavar="FILE", help="File with one URL per line ('-' for stdin)")
+    parser.add_argument("--concurrency", "-c", type=int, default=4, help="Max URLs in flight (batch mode)")
+    parser.add_argument("--per-host", type=int, default=2, help="Max URLs in flight per host (batch mode)")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON (batch mode)")
+    parser.add_argument("--timings", action="store_true",
+                        help="Time each phase (JSON output gets a timings key; batch mode prints the slowest phases)")
+    parser.add_argument("--trace", metavar="FILE", help="Write phase timings to a trace file (implies --timings)")
+    parser.add_argument("--trace-format", choices=TRACE_FORMATS, default="chrome",
+                        help="Trace file format: Chrome trace events or OpenTelemetry-style JSON")
+    parser.add_argument("--jsonl", metavar="FILE",
+                        help="Stream one JSON line per URL as it completes ('-' for stdout; batch mode)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted --jsonl FILE run, skipping URLs already written")
+    parser.add_argument("--dedupe", action="store_true",
+                        help="Reuse the screenshots of visually near-identical pages (batch mode)")
+    parser.add_argument("--dedupe-threshold", type=int, default=None,
+                        help=f"Max differing perceptual-hash bits for --dedupe (default {DEFAULT_THRESHOLD})")
+    parser.add_argument("--index", metavar="FILE",
+                        help="Load and save the --dedupe clusters with each representative's result "
+                             "(a few KB per cluster; implies --dedupe)")
 
     args = parser.parse_args()
 
-    os.makedirs(args.output, exist_ok=True)
-
-    parsed = urlparse(args.url)
-    base_name = parsed.netloc.replace(".", "_")
+    if bool(args.url) == bool(args.batch):
+        parser.error("provide either a URL or --batch FILE")
+    if args.resume and (not args.jsonl or args.jsonl == "-"):
+        parser.error("--resume needs --jsonl FILE")
+    if not 0 <= args.quality <= 100:
+        parser.error("--quality must be between 0 and 100")
+    timings = args.timings or bool(args.trace)
 
-    viewports = VIEWPORTS.keys() if args.all else [args.viewport]
+    os.makedirs(args.output, exist_ok=True)
 
-    for viewport in viewports:
-        filename = f"{base_name}_{viewport}.png"
-        output_path = os.path.join(args.output, filename)
+    viewports = list(VIEWPORTS) if args.all else [args.viewport]
 
-        print(f"Capturing {viewport} screenshot...")
+    if not args.batch and len(viewports) == 1:
+        output_path = os.path.join(args.output, output_name(args.url, args.viewport, args.format))
+        print(f"Capturing {args.viewport} screenshot...")
         result = capture_screenshot(
             args.url,
             output_path,
-            viewport=viewport,
+            viewport=args.viewport,
             full_page=args.full,
             timeout=args.timeout,
+            deadline=args.deadline,
+            profile=args.profile,
+            image_format=args.format,
+            quality=args.quality,
+            max_height=args.max_height,
+            tracer=Tracer() if timings else None,
         )
+        print_shot(result)
+        if args.trace:
+            write_trace(args.trace, [result], args.trace_format)
+        if result.get("timings"):
+            print_timings(result["timings"])
+        return
+
+    def print_result(result: dict) -> None:
+        print(f"{result['url']}" + (f" (same as {result['duplicate_of']})" if result.get("duplicate_of") else ""))
+        for shot in result["shots"]:
+            print(f"  [{shot['viewport']}]", end="")
+            print_shot(shot)
+
+    urls = read_urls(args.batch) if args.batch else [args.url]
+    options = dict(
+        viewports=viewports,
+        full_page=args.full,
+        timeout=args.timeout,
+        deadline=args.deadline,
+        profile=args.profile,
+        image_format=args.format,
+        quality=args.quality,
+        max_height=args.max_height,
+        concurrency=args.concurrency,
+        per_host=args.per_host,
+        timings=timings,
+        # Decided from the whole list, so a resumed run names files like the first
+        with_path=len(urls) > 1,
+    )
+    visual_index = None
+    if args.dedupe or args.index:
+        try:
+            visual_index = (
+                ScreenshotIndex.load(args.index, args.dedupe_threshold, viewports[0]) if args.index
+                else ScreenshotIndex(args.dedupe_threshold if args.dedupe_threshold is not None else DEFAULT_THRESHOLD)
+            )
+        except ValueError as e:
+            parser.error(str(e))
+        options["visual_index"] = visual_index
+
+    def finish_index(file=None) -> None:
+        if visual_index is None:
+            return
+        if args.index:
+            visual_index.save(args.index)
+        print_report(visual_index, file=file)
+
+    if args.jsonl:
+        timed = []
+
+        def emit(result: dict) -> None:
+            out.write(result, key=result["url"])
+            if args.trace:
+                timed.append({"url": result["url"], "timings": result["timings"]})
+
+        with JsonlWriter(args.jsonl, resume=args.resume) as out:
+            batch = capture_batch(
+                out.remaining(urls), args.output, on_result=emit, keep_results=False, **options
+            )
+            resumed = out.stats()["resumed_past"]
+        stats = batch["stats"]
+        if args.trace:
+            write_trace(args.trace, timed, args.trace_format)
+        print(f"Captured {stats['screenshots']} screenshots of {stats['pages']} pages "
+              f"({stats['errors']} errors, {stats['bytes'] // 1024}KB"
+              + (f", {resumed} URLs done in an earlier run" if resumed else "")
+              + f") in {stats['elapsed_s']}s — {stats['pages_per_sec']} pages/sec", file=sys.stderr)
+        if timings:
+            print_phase_summary(stats["slowest_phases"], file=sys.stderr)
+        finish_index(file=sys.stderr)
+        return
 
-        if result["success"]:
-            print(f"  Saved to {output_path}")
-        else:
-            print(f"  Failed: {result['error']}")
+    batch = capture_batch(
+        urls,
+        args.output,
+        on_result=None if args.json else print_result,
+        **options,
+    )
+    stats = batch["stats"]
+    if args.trace:
+        write_trace(args.trace, batch["results"], args.trace_format)
+    if args.json:
+        if visual_index is not None:
+            batch["clusters"] = visual_index.report()
+        print(json.dumps(batch, indent=2))
+        if args.index:
+            visual_index.save(args.index)
+    else:
+        print(f"\nCaptured {stats['screenshots']} screenshots of {stats['pages']} pages "
+              f"({stats['errors']} errors, {stats['bytes'] // 1024}KB) in {stats['elapsed_s']}s "
+              f"— {stats['pages_per_sec']} pages/sec")
+        if timings:
+            print_phase_summary(stats["slowest_phases"])
+        finish_index()
 
 
 if __name__ == "__main__":
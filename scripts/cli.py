@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+claude-ads: one command for all landing page scripts.
+
+Each subcommand runs the main() of one script in this directory, imported
+only when that subcommand is invoked, so `claude-ads fetch` never imports
+Playwright and `claude-ads score` never imports requests. The scripts
+themselves defer numpy and requests to first use (core.lazy_import), which
+keeps the cold start of the non-browser subcommands under 100ms
+(STARTUP_BUDGET_MS).
+
+`claude-ads startup` runs commands under `python -X importtime` and reports
+wall time, import time and the most expensive imports.
+
+Usage:
+    claude-ads fetch https://example.com/landing
+    claude-ads analyze https://example.com/landing --json
+    claude-ads capture --batch final_urls.txt --all --jsonl shots.jsonl
+    claude-ads startup                      # every subcommand's --help
+    claude-ads startup --runs 10 --top 15 fetch --help
+    python cli.py score checks.json         # without installing
+"""
+
+import importlib
+import os
+import sys
+
+# name: (module, summary, needs a browser)
+COMMANDS = {
+    "fetch": ("fetch_page", "Fetch landing pages over HTTP (single, bulk, cached)", False),
+    "static": ("static_landing", "Browserless landing page analysis with Playwright escalation", False),
+    "analyze": ("analyze_landing", "Rendered landing page analysis (Playwright)", True),
+    "capture": ("capture_screenshot", "Landing page screenshots (Playwright)", True),
+    "vitals": ("lab_vitals", "Repeated throttled LCP/CLS/TTFB/INP lab samples (Playwright)", True),
+    "redirects": ("redirect_chain", "Resolve final URL redirect chains with per-hop timing", False),
+    "match": ("message_match", "Ad group vs landing page message match (G60)", False),
+    "score": ("scoring", "Weighted audit health scores", False),
+    "bundle": ("report_bundle", "Write an audit report as a lazily loaded dashboard bundle", False),
+    "reaudit": ("result_store", "Re-audit landing pages, reusing results for unchanged pages", False),
+    "shard": ("sharded_runner", "Analysis or screenshots on a process pool (Playwright)", True),
+    "visual": ("screenshot_index", "Cluster near-duplicate landing page screenshots", False),
+    "daemon": ("browser_daemon", "Warm Chromium daemon shared by the browser scripts", True),
+    "bench": ("benchmark", "Benchmark the scripts against local fixtures (Playwright)", True),
+}
+
+STARTUP_BUDGET_MS = 100
+HEAVY_MODULES = ("playwright", "numpy", "requests", "PIL")
+
+HERE = os.path.dirname(os.path.abspath(__file__))
+
+
+def usage() -> str:
+    lines = [
+        "usage: claude-ads <command> [options]",
+        "",
+        "commands:",
+    ]
+    for name, (_, summary, _) in COMMANDS.items():
+        lines.append(f"  {name:10s} {summary}")
+    lines.append(f"  {'startup':10s} Startup time of commands, -X importtime style")
+    lines.append("")
+    lines.append("Run `claude-ads <command> --help` for the options of a command.")
+    return "\n".join(lines)
+
+
+def import_script(module_name: str):
+    """Import a sibling script: as claude_ads.<name> when installed, else by its bare name."""
+    if __package__:
+        # The package resolves the scripts' own bare sibling imports to itself
+        return importlib.import_module(f"{__package__}.{module_name}")
+    # Appended, so the scripts' names never shadow installed packages
+    if HERE not in sys.path:
+        sys.path.append(HERE)
+    return importlib.import_module(module_name)
+
+
+def run(name: str, argv: list) -> None:
+    """Import the module behind `name` and run its main() with `argv`."""
+    module = import_script(COMMANDS[name][0])
+    sys.argv = [f"claude-ads {name}", *argv]
+    module.main()
+
+
+def parse_importtime(stderr: str) -> list:
+    """
+    Import records of `-X importtime` stderr, in import order.
+
+    Returns:
+        List of (self_us, cumulative_us, depth, module); depth 0 is a
+        top-level import
+    """
+    records = []
+    for line in stderr.splitlines():
+        if not line.startswith("import time:"):
+            continue
+        fields = line[len("import time:"):].split("|")
+        if len(fields) != 3 or not fields[0].strip().isdigit():
+            continue  # the header line
+        name = fields[2].rstrip()
+        stripped = name.lstrip()
+        depth = (len(name) - len(stripped) - 1) // 2
+        records.append((int(fields[0]), int(fields[1]), depth, stripped))
+    return records
+
+
+def _best_wall_ms(command: list, runs: int) -> float:
+    """Fastest wall time of `command` over `runs` runs, output discarded."""
+    import subprocess
+    import time
+
+    best = None
+    for _ in range(max(1, runs)):
+        started = time.perf_counter()
+        subprocess.run(command, stdin=subprocess.DEVNULL, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wall = time.perf_counter() - started
+        best = wall if best is None else min(best, wall)
+    return round(best * 1000, 1)
+
+
+def measure_startup(argv: list, runs: int = 5, interpreter_ms: float = 0.0) -> dict:
+    """
+    Cold start of `claude-ads <argv>` in fresh interpreters.
+
+    Wall time is the fastest of `runs` plain runs; the import breakdown comes
+    from one more run under `-X importtime` (which inflates wall time itself).
+
+    Returns:
+        Dictionary with command, wall_ms, own_ms (wall_ms minus
+        `interpreter_ms`, the bare interpreter's startup), import_ms (top-level
+        cumulative import time), modules, heavy (HEAVY_MODULES that were
+        imported), imports (top-level records), exit_code
+    """
+    import subprocess
+
+    command = [sys.executable, os.path.join(HERE, "cli.py"), *argv]
+    wall_ms = _best_wall_ms(command, runs)
+    proc = subprocess.run(
+        [command[0], "-X", "importtime", *command[1:]],
+        stdin=subprocess.DEVNULL,
+        stdout=subprocess.DEVNULL,
+        stderr=subprocess.PIPE,
+        text=True,
+    )
+    records = parse_importtime(proc.stderr)
+    top_level = [r for r in records if r[2] == 0]
+    imported = {r[3].split(".")[0] for r in records}
+    return {
+        "command": " ".join(argv),
+        "wall_ms": wall_ms,
+        "own_ms": round(max(0.0, wall_ms - interpreter_ms), 1),
+        "import_ms": round(sum(r[1] for r in top_level) / 1000, 1),
+        "modules": len(records),
+        "heavy": [name for name in HEAVY_MODULES if name in imported],
+        "imports": top_level,
+        "exit_code": proc.returncode,
+    }
+
+
+def format_imports(report: dict, top: int) -> str:
+    """The `top` most expensive top-level imports, in -X importtime's format."""
+    lines = ["import time: self [us] | cumulative | imported package"]
+    for self_us, cumulative_us, _, name in sorted(report["imports"], key=lambda r: -r[1])[:top]:
+        lines.append(f"import time: {self_us:>9} | {cumulative_us:>10} | {name}")
+    return "\n".join(lines)
+
+
+def startup(argv: list) -> None:
+    import argparse
+    import json
+
+    parser = argparse.ArgumentParser(
+        prog="claude-ads startup",
+        description="Measure cold start of claude-ads commands with -X importtime",
+    )
+    parser.add_argument("command", nargs=argparse.REMAINDER,
+                        help="Command line to measure (default: --help of every command)")
+    parser.add_argument("--runs", "-n", type=int, default=5, help="Runs per command; the fastest is reported")
+    parser.add_argument("--top", type=int, default=10, help="Most expensive imports to list for one command")
+    parser.add_argument("--budget-ms", type=float, default=STARTUP_BUDGET_MS,
+                        help="Wall-time budget of the non-browser commands")
+    parser.add_argument("--check", action="store_true",
+                        help="Exit 1 if a non-browser command is over budget")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    # Options go before the measured command line
+    args = parser.parse_args(argv)
+
+    commands = [args.command] if args.command else [[name, "--help"] for name in COMMANDS]
+    for command in commands:
+        if command[0] not in COMMANDS:
+            parser.error(f"unknown command: {command[0]}")
+    baseline = _best_wall_ms([sys.executable, "-c", "pass"], args.runs)
+    reports = []
+    for command in commands:
+        report = measure_startup(command, runs=args.runs, interpreter_ms=baseline)
+        report["browser"] = COMMANDS[command[0]][2]
+        report["over_budget"] = not report["browser"] and report["wall_ms"] > args.budget_ms
+        reports.append(report)
+    over = [r["command"] for r in reports if r["over_budget"]]
+
+    if args.json:
+        for report in reports:
+            report["imports"] = [
+                {"self_us": r[0], "cumulative_us": r[1], "module": r[3]} for r in report["imports"]
+            ]
+        print(json.dumps({
+            "python": sys.version.split()[0],
+            "interpreter_ms": baseline,
+            "budget_ms": args.budget_ms,
+            "commands": reports,
+            "over_budget": over,
+        }, indent=2))
+    else:
+        print(f"Startup, best of {args.runs} (bare interpreter: {baseline}ms, budget {args.budget_ms:g}ms):")
+        print(f"  {'command':22s} {'wall_ms':>8s} {'own_ms':>7s} {'import_ms':>9s} {'modules':>7s}  heavy")
+        for report in reports:
+            flags = ", ".join(report["heavy"]) or "-"
+            if report["browser"]:
+                flags += "  (browser)"
+            if report["over_budget"]:
+                flags += "  OVER BUDGET"
+            if report["exit_code"]:
+                flags += f"  exit {report['exit_code']}"
+            print(f"  {report['command'][:22]:22s} {report['wall_ms']:8.1f} {report['own_ms']:7.1f} "
+                  f"{report['import_ms']:9.1f} {report['modules']:7d}  {flags}")
+        if len(reports) == 1:
+            print()
+            print(format_imports(reports[0], args.top))
+    if args.check and over:
+        sys.exit(1)
+
+
+def main():
+    argv = sys.argv[1:]
+    if not argv or argv[0] in ("-h", "--help"):
+        print(usage())
+        return
+    if argv[0] == "--version":
+        print(f"claude-ads {import_script('core').__version__}")
+        return
+    name, rest = argv[0], argv[1:]
+    if name == "startup":
+        startup(rest)
+    elif name in COMMANDS:
+        run(name, rest)
+    else:
+        print(f"claude-ads: unknown command '{name}'\n\n{usage()}", file=sys.stderr)
+        sys.exit(2)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,252 @@
+"""
+Shared constants and result types of the claude-ads scripts.
+
+The fetch, analyze, capture and lab scripts used to carry their own copies of
+the viewport sizes, the navigation timeout and the result dict skeletons.
+They live here once. This module imports nothing beyond the standard
+library's importlib so that every script, and the claude-ads CLI
+(cli.py), can use it without adding to startup time.
+
+Result types are plain __slots__ classes (dataclasses would pull in
+`inspect`, ~10ms of import time). to_dict() returns exactly the JSON shape
+the scripts have always emitted, so JSONL output, result_store and
+grade_landing() are unchanged.
+
+Heavy optional dependencies are bound with lazy_import(): the module is
+found at import time (a missing package still fails fast with an install
+hint) but only executed on first attribute access.
+"""
+
+import importlib.util
+import sys
+
+__version__ = "1.1.1"
+
+DEFAULT_TIMEOUT_MS = 30000
+DEFAULT_FETCH_TIMEOUT_S = 30
+# Body text kept in results (content.text) for message matching
+CONTENT_TEXT_CHARS = 5000
+INSTALL_HINT = "pip install -r requirements.txt"
+
+
+def lazy_import(name: str, hint: str = INSTALL_HINT):
+    """
+    Bind module `name` without executing it until an attribute is used.
+
+    Exits with an install hint if the package is not installed, like the
+    scripts' eager try/except ImportError blocks did.
+    """
+    if name in sys.modules:
+        return sys.modules[name]
+    spec = importlib.util.find_spec(name)
+    if spec is None:
+        print(f"Error: {name} required. Install with: {hint}")
+        sys.exit(1)
+    loader = importlib.util.LazyLoader(spec.loader)
+    spec.loader = loader
+    module = importlib.util.module_from_spec(spec)
+    sys.modules[name] = module
+    loader.exec_module(module)
+    return module
+
+
+def timeout_error(timeout_ms: int) -> str:
+    """Error message of a browser navigation that exceeded `timeout_ms`."""
+    return f"Page load timed out after {timeout_ms}ms"
+
+
+class Viewport:
+    """A named browser viewport."""
+
+    __slots__ = ("name", "width", "height", "scale")
+
+    def __init__(self, name: str, width: int, height: int, scale: int = 1):
+        self.name = name
+        self.width = width
+        self.height = height
+        self.scale = scale
+
+    def size(self) -> dict:
+        """Playwright's viewport argument."""
+        return {"width": self.width, "height": self.height}
+
+    def context_options(self) -> dict:
+        """Keyword arguments of browser.new_context() for this viewport."""
+        return {"viewport": self.size(), "device_scale_factor": self.scale}
+
+    def __repr__(self) -> str:
+        return f"Viewport({self.name!r}, {self.width}, {self.height}, scale={self.scale})"
+
+
+VIEWPORTS = {
+    "desktop": Viewport("desktop", 1920, 1080),
+    "tablet": Viewport("tablet", 768, 1024),
+    "mobile": Viewport("mobile", 375, 812, scale=2),
+}
+DESKTOP = VIEWPORTS["desktop"]
+MOBILE = VIEWPORTS["mobile"]
+
+
+class Record:
+    """Base of the result types: slotted fields serialized by to_dict()."""
+
+    __slots__ = ()
+
+    def to_dict(self) -> dict:
+        return {
+            name: value.to_dict() if isinstance(value, Record) else value
+            for name in self.__slots__
+            for value in (getattr(self, name),)
+        }
+
+    def __repr__(self) -> str:
+        fields = ", ".join(f"{name}={getattr(self, name)!r}" for name in self.__slots__)
+        return f"{type(self).__name__}({fields})"
+
+
+class Transfer(Record):
+    """Wire-level size and timing of one fetch."""
+
+    __slots__ = ("transfer_bytes", "content_bytes", "ttfb_ms", "total_ms", "truncated")
+
+    def __init__(self):
+        self.transfer_bytes = None
+        self.content_bytes = None
+        self.ttfb_ms = None
+        self.total_ms = None
+        self.truncated = None
+
+
+class FetchResult(Record):
+    """fetch_page() result."""
+
+    __slots__ = (
+        "url", "requested_url", "status_code", "content", "headers",
+        "redirect_chain", "transfer", "cache", "error",
+    )
+
+    def __init__(self, url: str):
+        self.url = url
+        self.requested_url = url
+        self.status_code = None
+        self.content = None
+        self.headers = {}
+        self.redirect_chain = []
+        self.transfer = Transfer()
+        self.cache = None
+        self.error = None
+
+
+class ShotResult(Record):
+    """capture_screenshot() result for one viewport."""
+
+    __slots__ = ("url", "output", "viewport", "success", "readiness", "requests", "bytes", "error")
+
+    def __init__(self, url: str, output: str, viewport: str):
+        self.url = url
+        self.output = output
+        self.viewport = viewport
+        self.success = False
+        self.readiness = None
+        self.requests = None
+        self.bytes = None
+        self.error = None
+
+
+class Performance(Record):
+    __slots__ = ("lcp_ms", "cls", "ttfb_ms", "dom_content_loaded_ms")
+
+    def __init__(self):
+        self.lcp_ms = None
+        self.cls = None
+        self.ttfb_ms = None
+        self.dom_content_loaded_ms = None
+
+
+class Content(Record):
+    __slots__ = ("title", "h1", "meta_description", "word_count", "text")
+
+    def __init__(self):
+        self.title = None
+        self.h1 = None
+        self.meta_description = None
+        self.word_count = 0
+        self.text = None
+
+
+class Conversion(Record):
+    __slots__ = ("cta_above_fold", "form_present", "form_fields", "phone_number", "chat_widget")
+
+    def __init__(self):
+        self.cta_above_fold = False
+        self.form_present = False
+        self.form_fields = 0
+        self.phone_number = False
+        self.chat_widget = False
+
+
+class Trust(Record):
+    __slots__ = ("testimonials", "trust_badges", "reviews_schema")
+
+    def __init__(self):
+        self.testimonials = False
+        self.trust_badges = False
+        self.reviews_schema = False
+
+
+class Mobile(Record):
+    __slots__ = ("viewport_meta", "horizontal_scroll", "font_readable")
+
+    def __init__(self):
+        self.viewport_meta = False
+        self.horizontal_scroll = False
+        self.font_readable = True
+
+
+class Schema(Record):
+    __slots__ = ("types_found", "product_schema", "faq_schema", "service_schema")
+
+    def __init__(self):
+        self.types_found = []
+        self.product_schema = False
+        self.faq_schema = False
+        self.service_schema = False
+
+
+class PerViewport(Record):
+    """A value per analyzed viewport (readiness, round trips)."""
+
+    __slots__ = ("desktop", "mobile")
+
+    def __init__(self, initial=None):
+        self.desktop = initial
+        self.mobile = initial
+
+
+class LandingResult(Record):
+    """
+    Landing page analysis result, filled in by the static and rendered tiers.
+
+    Fields a tier cannot determine stay None (e.g. cta_above_fold in a
+    static-only result) and grade_landing() skips the checks that need them.
+    """
+
+    __slots__ = (
+        "url", "performance", "content", "conversion", "trust", "mobile", "schema",
+        "readiness", "replay", "requests", "round_trips", "tier", "error",
+    )
+
+    def __init__(self, url: str):
+        self.url = url
+        self.performance = Performance()
+        self.content = Content()
+        self.conversion = Conversion()
+        self.trust = Trust()
+        self.mobile = Mobile()
+        self.schema = Schema()
+        self.readiness = PerViewport()
+        self.replay = None
+        self.requests = None
+        self.round_trips = PerViewport(0)
+        self.tier = None
+        self.error = None
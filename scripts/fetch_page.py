@@ -5,17 +5,39 @@ Fetch a landing page for ad campaign quality analysis.
 Usage:
     python fetch_page.py https://example.com/landing
     python fetch_page.py https://example.com/landing --output page.html
+    python fetch_page.py https://example.com/landing --cache-dir ~/.cache/claude-ads/http
+    python fetch_page.py --bulk final_urls.txt --workers 64 --per-host 6 > results.jsonl
+    python fetch_page.py https://example.com/landing --head-only --max-bytes 5000000
+    python fetch_page.py --bulk final_urls.txt --timings --trace fetch-trace.json > results.jsonl
+    python fetch_page.py --bulk final_urls.txt --jsonl results.jsonl --spill-dir bodies --resume
 """
 
 import argparse
 import sys
+import time
+import zlib
+from collections import Counter, deque
 from urllib.parse import urlparse
 
-try:
-    import requests
-except ImportError:
-    print("Error: requests library required. Install with: pip install -r requirements.txt")
-    sys.exit(1)
+from core import DEFAULT_FETCH_TIMEOUT_S, FetchResult, lazy_import
+from http_cache import DEFAULT_CACHE_DIR, DEFAULT_MAX_BYTES, HttpCache
+from jsonl_output import DEFAULT_SPILL_BYTES, JsonlWriter
+from timing import (
+    TRACE_FORMATS,
+    Tracer,
+    print_phase_summary,
+    print_timings,
+    span,
+    summarize_phases,
+    write_trace,
+)
+from url_list import host_of, read_urls
+
+# Executed on first use, so --help and argument errors never load requests
+requests = lazy_import("requests")
+urllib3 = lazy_import("urllib3")
+
+CHUNK_SIZE = 64 * 1024
 
 
 DEFAULT_HEADERS = {
@@ -29,24 +51,43 @@ DEFAULT_HEADERS = {
 
 def fetch_page(
     url: str,
-    timeout: int = 30,
+    timeout: int = DEFAULT_FETCH_TIMEOUT_S,
     follow_redirects: bool = True,
     max_redirects: int = 5,
+    cache: HttpCache = None,
+    session: "requests.Session" = None,
+    max_bytes: int = None,
+    head_only: bool = False,
+    byte_budget: int = None,
+    tracer: Tracer = None,
+    headers: dict = None,
 ) -> dict:
     """
     Fetch a landing page and return response details relevant to ad quality checks.
 
+    The body is streamed and decompressed incrementally. A decoded body larger
+    than `max_bytes` aborts the download with an error. When only head-level
+    signals are needed (title, meta, JSON-LD), `head_only` stops reading after
+    `</head>` and `byte_budget` stops after that many decoded bytes; the result
+    is then marked truncated and never cached. result["transfer"] reports the
+    bytes on the wire, the decoded size, TTFB and total fetch time.
+
+    With a cache, fresh entries (see http_cache.freshness_lifetime()) whose
+    Vary'd request headers match are served without a request, stale ones are revalidated with If-None-Match /
+    If-Modified-Since, and a 304 serves the stored body. Pass a shared
+    session (see new_session()) to reuse keep-alive connections across calls.
+    Extra request `headers` (e.g. the caller's own If-None-Match) are sent
+    as given; a 304 they produce is returned with an empty body.
+
+    With a tracer (see timing.py), the cache lookup, request (up to response
+    headers), body read, decode and cache store are timed under
+    result["timings"].
+
     Returns:
-        Dictionary with url, status_code, content, headers, redirect_chain, error
+        Dictionary with url (final), requested_url, status_code, content,
+        headers, redirect_chain, transfer, cache, error
     """
-    result = {
-        "url": url,
-        "status_code": None,
-        "content": None,
-        "headers": {},
-        "redirect_chain": [],
-        "error": None,
-    }
+    result = FetchResult(url).to_dict()
 
     parsed = urlparse(url)
     if not parsed.scheme:
@@ -57,24 +98,67 @@ def fetch_page(
         result["error"] = f"Invalid URL scheme: {parsed.scheme}"
         return result
 
+    request_headers = {**DEFAULT_HEADERS, **(headers or {})}
+    entry = None
+    if cache:
+        with span(tracer, "cache.lookup"):
+            entry = cache.lookup(url, follow_redirects=follow_redirects, request_headers=request_headers)
+    if entry and entry["fresh"]:
+        cache.record_hit(entry)
+        if tracer:
+            result["timings"] = tracer.to_dict()
+        return _from_cache(result, entry, "hit")
+
     try:
-        session = requests.Session()
-        session.max_redirects = max_redirects
-
-        response = session.get(
-            url,
-            headers=DEFAULT_HEADERS,
-            timeout=timeout,
-            allow_redirects=follow_redirects,
-        )
+        if session is None:
+            session = new_session(max_redirects=max_redirects)
+
+        started = time.perf_counter()
+        with span(tracer, "request"):
+            response = session.get(
+                url,
+                headers={
+                    **request_headers,
+                    **(cache.conditional_headers(entry) if cache else {}),
+                },
+                timeout=timeout,
+                allow_redirects=follow_redirects,
+                stream=True,
+            )
 
-        result["url"] = response.url
-        result["status_code"] = response.status_code
-        result["content"] = response.text
-        result["headers"] = dict(response.headers)
+        with response:
+            if entry and response.status_code == 304:
+                cache.record_hit(entry, revalidated_headers=dict(response.headers))
+                return _from_cache(result, entry, "revalidated")
 
-        if response.history:
-            result["redirect_chain"] = [r.url for r in response.history]
+            result["url"] = response.url
+            result["status_code"] = response.status_code
+            result["headers"] = dict(response.headers)
+
+            if response.history:
+                result["redirect_chain"] = [r.url for r in response.history]
+
+            transfer = result["transfer"]
+            transfer["ttfb_ms"] = round(
+                sum(r.elapsed.total_seconds() for r in [*response.history, response]) * 1000
+            )
+            with span(tracer, "body.read"):
+                body, transfer["transfer_bytes"], transfer["truncated"] = _read_body(
+                    response, max_bytes=max_bytes, head_only=head_only, byte_budget=byte_budget
+                )
+            transfer["total_ms"] = round((time.perf_counter() - started) * 1000)
+            if body is None:
+                result["error"] = f"Response body exceeded max_bytes ({max_bytes})"
+                return result
+
+            transfer["content_bytes"] = len(body)
+            with span(tracer, "decode"):
+                result["content"] = _decode(response, body)
+
+        if cache and not transfer["truncated"]:
+            result["cache"] = "miss"
+            with span(tracer, "cache.store"):
+                cache.store(url, result, follow_redirects=follow_redirects, request_headers=request_headers)
 
     except requests.exceptions.Timeout:
         result["error"] = f"Request timed out after {timeout} seconds"
@@ -86,24 +170,304 @@ def fetch_page(
         result["error"] = f"Connection error: {e}"
     except requests.exceptions.RequestException as e:
         result["error"] = f"Request failed: {e}"
+    # The body is streamed from response.raw, so read errors arrive as
+    # urllib3 and zlib exceptions rather than requests' wrappers
+    except urllib3.exceptions.ReadTimeoutError:
+        result["error"] = f"Request timed out after {timeout} seconds"
+    except urllib3.exceptions.ProtocolError as e:
+        result["error"] = f"Connection error: {e}"
+    except urllib3.exceptions.HTTPError as e:
+        result["error"] = f"Request failed: {e}"
+    except zlib.error as e:
+        result["error"] = f"Request failed: content decoding error: {e}"
+    finally:
+        if tracer:
+            result["timings"] = tracer.to_dict()
 
     return result
 
 
+def _read_body(response, max_bytes: int = None, head_only: bool = False, byte_budget: int = None):
+    """
+    Stream and incrementally decompress a response body.
+
+    Returns:
+        (body bytes or None if max_bytes was exceeded, bytes on the wire,
+        truncation reason: None, "head" or "budget")
+    """
+    encoding = response.headers.get("Content-Encoding", "").strip().lower()
+    if encoding == "gzip":
+        inflater = zlib.decompressobj(16 + zlib.MAX_WBITS)
+    elif encoding == "deflate":
+        inflater = zlib.decompressobj(zlib.MAX_WBITS)
+    else:
+        inflater = None
+
+    limit = min(x for x in (max_bytes, byte_budget, float("inf")) if x is not None)
+    body = bytearray()
+    wire_bytes = 0
+    scanned = 0
+
+    for chunk in response.raw.stream(CHUNK_SIZE, decode_content=False):
+        wire_bytes += len(chunk)
+        if inflater is not None:
+            # Bound the output so a compression bomb cannot outgrow the cap
+            room = 0 if limit == float("inf") else int(limit - len(body)) + 1
+            try:
+                chunk = inflater.decompress(chunk, room)
+            except zlib.error:
+                if encoding != "deflate" or body:
+                    raise
+                # Some servers send raw deflate without the zlib wrapper
+                inflater = zlib.decompressobj(-zlib.MAX_WBITS)
+                chunk = inflater.decompress(chunk, room)
+        body += chunk
+
+        if head_only:
+            end = body.lower().find(b"</head>", max(0, scanned - len(b"</head>")))
+            if end != -1:
+                return bytes(body[: end + len(b"</head>")]), wire_bytes, "head"
+            scanned = len(body)
+        if byte_budget is not None and len(body) >= byte_budget:
+            return bytes(body[:byte_budget]), wire_bytes, "budget"
+        if max_bytes is not None and len(body) > max_bytes:
+            return None, wire_bytes, None
+
+    if inflater is not None:
+        body += inflater.flush()
+        if max_bytes is not None and len(body) > max_bytes:
+            return None, wire_bytes, None
+    return bytes(body), wire_bytes, None
+
+
+def _decode(response, body: bytes) -> str:
+    """Decode a body the way Response.text would (header charset, else detection)."""
+    encoding = response.encoding
+    if encoding is None:
+        encoding = requests.compat.chardet.detect(body)["encoding"] or "utf-8"
+    try:
+        return body.decode(encoding, errors="replace")
+    except LookupError:
+        return body.decode("utf-8", errors="replace")
+
+
+def new_session(max_redirects: int = 5, pool_hosts: int = 10, per_host: int = 10) -> "requests.Session":
+    """
+    Build a Session whose connection pool keeps `per_host` keep-alive
+    connections open for each of up to `pool_hosts` hosts.
+    """
+    session = requests.Session()
+    session.max_redirects = max_redirects
+    adapter = requests.adapters.HTTPAdapter(pool_connections=pool_hosts, pool_maxsize=per_host)
+    session.mount("http://", adapter)
+    session.mount("https://", adapter)
+    return session
+
+
+def iter_fetch(
+    urls: list,
+    workers: int = 32,
+    per_host: int = 4,
+    timeout: int = DEFAULT_FETCH_TIMEOUT_S,
+    follow_redirects: bool = True,
+    max_redirects: int = 5,
+    cache: HttpCache = None,
+    timings: bool = False,
+    headers_for=None,
+    **fetch_options,
+):
+    """
+    Fetch many URLs on pooled keep-alive connections, yielding results as they complete.
+
+    URLs are queued per host; at most `per_host` requests run against one host
+    and at most `workers` overall, so a slow domain never holds threads that
+    other hosts could use. All workers share one Session, so each host's TLS
+    connections are reused for every URL pointing at it. Extra keyword
+    arguments (max_bytes, head_only, byte_budget) are passed to fetch_page().
+    With timings, each result carries its own result["timings"].
+    headers_for(url) may return extra request headers per URL.
+
+    Yields:
+        fetch_page() result dicts, in completion order
+    """
+    from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+
+    # At least one request in flight, or no URL would ever be fetched
+    workers = max(1, workers)
+    per_host = max(1, per_host)
+    queues = {}
+    for url in urls:
+        queues.setdefault(host_of(url), deque()).append(url)
+
+    session = new_session(
+        max_redirects=max_redirects,
+        pool_hosts=max(10, len(queues)),
+        per_host=per_host,
+    )
+    active = Counter()
+    in_flight = {}
+    # Hosts with queued URLs and a free slot, each at most once; fill() takes
+    # them round-robin instead of walking every host's queue
+    ready = deque(queues)
+
+    with ThreadPoolExecutor(max_workers=workers) as pool:
+        def fill() -> None:
+            while ready and len(in_flight) < workers:
+                host = ready.popleft()
+                queue = queues[host]
+                url = queue.popleft()
+                future = pool.submit(
+                    fetch_page,
+                    url,
+                    timeout=timeout,
+                    follow_redirects=follow_redirects,
+                    max_redirects=max_redirects,
+                    cache=cache,
+                    session=session,
+                    tracer=Tracer() if timings else None,
+                    headers=headers_for(url) if headers_for else None,
+                    **fetch_options,
+                )
+                in_flight[future] = host
+                active[host] += 1
+                if queue and active[host] < per_host:
+                    ready.append(host)
+
+        fill()
+        while in_flight:
+            done, _ = wait(in_flight, return_when=FIRST_COMPLETED)
+            for future in done:
+                host = in_flight.pop(future)
+                active[host] -= 1
+                # A host at its limit is not in `ready`; this completion frees it
+                if queues[host] and active[host] == per_host - 1:
+                    ready.append(host)
+                yield future.result()
+            fill()
+
+    session.close()
+
+
+def _from_cache(result: dict, entry: dict, status: str) -> dict:
+    """Fill a fetch_page() result from a cache entry."""
+    result["url"] = entry["final_url"]
+    result["status_code"] = entry["status_code"]
+    result["content"] = entry["content"]
+    result["headers"] = entry["headers"]
+    result["redirect_chain"] = entry["redirect_chain"]
+    result["cache"] = status
+    return result
+
+
+def summarize(result: dict) -> dict:
+    """A fetch_page() result without the page body, for bulk JSONL output."""
+    summary = {k: v for k, v in result.items() if k not in ("content", "headers")}
+    summary["content_length"] = len(result["content"]) if result["content"] is not None else None
+    summary["content_type"] = requests.structures.CaseInsensitiveDict(result["headers"]).get("Content-Type")
+    return summary
+
+
 def main():
     parser = argparse.ArgumentParser(description="Fetch a landing page for ad quality analysis")
-    parser.add_argument("url", help="URL to fetch")
+    parser.add_argument("url", nargs="?", help="URL to fetch")
     parser.add_argument("--output", "-o", help="Output file path")
-    parser.add_argument("--timeout", "-t", type=int, default=30, help="Timeout in seconds")
+    parser.add_argument("--timeout", "-t", type=int, default=DEFAULT_FETCH_TIMEOUT_S, help="Timeout in seconds")
     parser.add_argument("--no-redirects", action="store_true", help="Don't follow redirects")
+    parser.add_argument("--cache-dir", nargs="?", const=DEFAULT_CACHE_DIR,
+                        help=f"Use an on-disk response cache (default dir: {DEFAULT_CACHE_DIR})")
+    parser.add_argument("--cache-max-mb", type=int, default=DEFAULT_MAX_BYTES // (1024 * 1024),
+                        help="Cache size limit in MB (LRU eviction)")
+
+    parser.add_argument("--max-bytes", type=int, help="Abort if the decoded body exceeds this size")
+    parser.add_argument("--head-only", action="store_true", help="Stop reading after </head>")
+    parser.add_argument("--byte-budget", type=int, help="Stop reading after this many decoded bytes")
+    parser.add_argument("--bulk", "-b", metavar="FILE",
+                        help="File with one URL per line ('-' for stdin); prints one JSON line per URL")
+    parser.add_argument("--workers", "-w", type=int, default=32, help="Max requests in flight (bulk mode)")
+    parser.add_argument("--per-host", type=int, default=4, help="Max requests in flight per host (bulk mode)")
+    parser.add_argument("--timings", action="store_true",
+                        help="Time each phase (printed to stderr; bulk JSON lines get a timings key)")
+    parser.add_argument("--trace", metavar="FILE", help="Write phase timings to a trace file (implies --timings)")
+    parser.add_argument("--trace-format", choices=TRACE_FORMATS, default="chrome",
+                        help="Trace file format: Chrome trace events or OpenTelemetry-style JSON")
+    parser.add_argument("--jsonl", metavar="FILE", default="-",
+                        help="Write the bulk JSON lines to FILE instead of stdout")
+    parser.add_argument("--spill-dir", metavar="DIR",
+                        help="Keep page bodies in bulk output, written to files under DIR (content_path)")
+    parser.add_argument("--spill-kb", type=int, default=DEFAULT_SPILL_BYTES // 1024,
+                        help="Spill bodies larger than this many KB; smaller ones stay inline")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted --jsonl FILE run, skipping URLs already written")
 
     args = parser.parse_args()
 
+    if bool(args.url) == bool(args.bulk):
+        parser.error("provide either a URL or --bulk FILE")
+    if args.resume and args.jsonl == "-":
+        parser.error("--resume needs --jsonl FILE")
+
+    timings = args.timings or bool(args.trace)
+    cache = HttpCache(args.cache_dir, max_bytes=args.cache_max_mb * 1024 * 1024) if args.cache_dir else None
+
+    if args.bulk:
+        out = JsonlWriter(
+            args.jsonl, spill_dir=args.spill_dir, spill_bytes=args.spill_kb * 1024, resume=args.resume
+        )
+        urls = out.remaining(read_urls(args.bulk))
+        started = time.perf_counter()
+        errors = 0
+        summaries = []
+        for result in iter_fetch(
+            urls,
+            workers=args.workers,
+            per_host=args.per_host,
+            timeout=args.timeout,
+            follow_redirects=not args.no_redirects,
+            cache=cache,
+            max_bytes=args.max_bytes,
+            head_only=args.head_only,
+            byte_budget=args.byte_budget,
+            timings=timings,
+        ):
+            errors += bool(result["error"])
+            summary = summarize(result)
+            if timings:
+                summaries.append({"url": summary["url"], "timings": summary["timings"]})
+            if args.spill_dir:
+                summary["content"] = result["content"]
+            out.write(summary, key=result["requested_url"])
+        out.close()
+        elapsed = time.perf_counter() - started
+        resumed = out.stats()["resumed_past"]
+        print(f"Fetched {len(urls)} URLs ({errors} errors"
+              + (f", {resumed} done in an earlier run" if resumed else "")
+              + f") in {elapsed:.2f}s — {len(urls) / elapsed if elapsed > 0 else 0:.1f} URLs/sec",
+              file=sys.stderr)
+        if args.spill_dir:
+            stats = out.stats()
+            print(f"Spilled {stats['spilled']} bodies ({stats['spilled_bytes']} new bytes) to {args.spill_dir}",
+                  file=sys.stderr)
+        if timings:
+            print_phase_summary(summarize_phases(summaries), file=sys.stderr)
+        if args.trace:
+            write_trace(args.trace, summaries, args.trace_format)
+        if cache:
+            print(f"Cache: {cache.stats()}", file=sys.stderr)
+            cache.close()
+        return
+
     result = fetch_page(
         args.url,
         timeout=args.timeout,
         follow_redirects=not args.no_redirects,
+        cache=cache,
+        max_bytes=args.max_bytes,
+        head_only=args.head_only,
+        byte_budget=args.byte_budget,
+        tracer=Tracer() if timings else None,
     )
+    if args.trace:
+        write_trace(args.trace, [result], args.trace_format)
 
     if result["error"]:
         print(f"Error: {result['error']}", file=sys.stderr)
@@ -118,8 +482,21 @@ def main():
 
     print(f"\nURL: {result['url']}", file=sys.stderr)
     print(f"Status: {result['status_code']}", file=sys.stderr)
+    transfer = result["transfer"]
+    if transfer["transfer_bytes"] is not None:
+        print(f"Transfer: {transfer['transfer_bytes']} bytes on the wire, {transfer['content_bytes']} decoded, "
+              f"TTFB {transfer['ttfb_ms']}ms, total {transfer['total_ms']}ms"
+              + (f" (truncated at {transfer['truncated']})" if transfer["truncated"] else ""), file=sys.stderr)
     if result["redirect_chain"]:
         print(f"Redirects: {' -> '.join(result['redirect_chain'])}", file=sys.stderr)
+    if result.get("timings"):
+        print("Timings:", file=sys.stderr)
+        print_timings(result["timings"], file=sys.stderr)
+    if cache:
+        stats = cache.stats()
+        print(f"Cache: {result['cache']} (hits={stats['hits']} revalidated={stats['revalidated']} "
+              f"misses={stats['misses']} bytes_saved={stats['bytes_saved']})", file=sys.stderr)
+        cache.close()
 
 
 if __name__ == "__main__":
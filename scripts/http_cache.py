@@ -0,0 +1,393 @@
+#!/usr/bin/env python3
+"""
+Persistent on-disk HTTP response cache for fetch_page.
+
+Bodies are stored content-addressed (sha256 of the body) under `bodies/`, and
+a SQLite index maps each normalized URL (and redirect mode) to its status,
+headers, redirect chain, validators (ETag / Last-Modified), the request
+header values its Vary header names, and when it stops being fresh:
+Cache-Control max-age, else Expires relative to Date, minus the response's
+age on receipt. The total body size is capped; least recently used entries
+are evicted first (down to EVICT_TO of the cap) and a body is deleted when
+its last entry goes.
+
+Usage:
+    from http_cache import HttpCache
+    cache = HttpCache("~/.cache/claude-ads/http", max_bytes=500 * 1024 * 1024)
+    result = fetch_page(url, cache=cache)
+    result["cache"]   # "hit", "revalidated", "miss" or None
+    cache.stats()     # hits, revalidated, misses, bytes_saved
+"""
+
+import hashlib
+import json
+import os
+import re
+import threading
+import time
+from urllib.parse import parse_qsl, urlencode, urlparse, urlunparse
+
+DEFAULT_CACHE_DIR = os.path.join("~", ".cache", "claude-ads", "http")
+DEFAULT_MAX_BYTES = 500 * 1024 * 1024
+# Eviction frees down to this share of max_bytes, so it runs once per many stores
+EVICT_TO = 0.9
+
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """Normalize a URL for use as a cache key (case, default port, fragment, query order)."""
+    parsed = urlparse(url)
+    scheme = parsed.scheme.lower()
+    host = (parsed.hostname or "").lower()
+    if parsed.port and parsed.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parsed.port}"
+    query = urlencode(sorted(parse_qsl(parsed.query, keep_blank_values=True)))
+    return urlunparse((scheme, host, parsed.path or "/", parsed.params, query, ""))
+
+
+def parse_cache_control(value: str) -> dict:
+    """Parse a Cache-Control header into {directive: value or True}."""
+    directives = {}
+    for part in (value or "").split(","):
+        name, _, arg = part.strip().partition("=")
+        if name:
+            directives[name.lower()] = arg.strip('"') if arg else True
+    return directives
+
+
+def cache_key(url: str, follow_redirects: bool = True) -> str:
+    """Cache key of a fetch: a redirect followed to its target is a different response than the redirect."""
+    key = normalize_url(url)
+    return key if follow_redirects else f"{key} noredirect"
+
+
+def _http_date(value: str):
+    """An HTTP date header as seconds since the epoch, or None if absent or invalid."""
+    if not value:
+        return None
+    from email.utils import parsedate_to_datetime
+    from datetime import timezone
+
+    try:
+        parsed = parsedate_to_datetime(value)
+    except (TypeError, ValueError, IndexError, OverflowError):
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed.timestamp()
+
+
+def freshness_lifetime(headers: dict) -> int:
+    """
+    Seconds a response may be served without revalidation (0 = always revalidate).
+
+    Cache-Control max-age takes precedence over Expires, which counts from the
+    response's Date; an invalid Expires means already expired.
+    """
+    directives = parse_cache_control(header_value(headers, "Cache-Control"))
+    if "no-cache" in directives or "no-store" in directives:
+        return 0
+    max_age = directives.get("max-age")
+    if max_age is not None:
+        return int(max_age) if isinstance(max_age, str) and re.fullmatch(r"\d+", max_age) else 0
+    expires = header_value(headers, "Expires")
+    if expires is None:
+        return 0
+    expires_at = _http_date(expires)
+    if expires_at is None:
+        return 0
+    date = _http_date(header_value(headers, "Date")) or time.time()
+    return max(0, int(expires_at - date))
+
+
+def current_age(headers: dict, now: float) -> int:
+    """Age of a response on receipt: its Age header or its apparent age from Date, whichever is larger."""
+    age = header_value(headers, "Age")
+    age = int(age) if age and re.fullmatch(r"\d+", age.strip()) else 0
+    date = _http_date(header_value(headers, "Date"))
+    apparent = max(0, int(now - date)) if date is not None else 0
+    return max(age, apparent)
+
+
+def _expires_at(headers: dict, now: float) -> float:
+    return now + freshness_lifetime(headers) - current_age(headers, now)
+
+
+def vary_values(headers: dict, request_headers: dict):
+    """
+    {header: request value} for the request headers a response varies on,
+    or None when it varies on something unknowable (Vary: *).
+
+    Accept-Encoding is left out: bodies are stored decoded.
+    """
+    values = {}
+    for name in (header_value(headers, "Vary") or "").split(","):
+        name = name.strip().lower()
+        if name == "*":
+            return None
+        if name and name != "accept-encoding":
+            values[name] = header_value(request_headers or {}, name)
+    return values
+
+
+def header_value(headers: dict, name: str):
+    """Value of a header in a plain dict, matching its name case-insensitively (None if absent)."""
+    for key, value in headers.items():
+        if key.lower() == name.lower():
+            return value
+    return None
+
+
+class HttpCache:
+    """Content-addressed disk cache with conditional revalidation and LRU eviction."""
+
+    def __init__(self, path: str = DEFAULT_CACHE_DIR, max_bytes: int = DEFAULT_MAX_BYTES):
+        import sqlite3  # only once a cache is opened; fetch without --cache-dir never loads it
+
+        self.path = os.path.expanduser(path)
+        self.max_bytes = max_bytes
+        self.bodies_dir = os.path.join(self.path, "bodies")
+        os.makedirs(self.bodies_dir, exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(
+            os.path.join(self.path, "index.sqlite3"), check_same_thread=False
+        )
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                final_url TEXT NOT NULL,
+                status_code INTEGER NOT NULL,
+                headers TEXT NOT NULL,
+                redirect_chain TEXT NOT NULL,
+                body_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                stored_at REAL NOT NULL,
+                expires_at REAL NOT NULL,
+                last_access REAL NOT NULL
+            );
+            CREATE INDEX IF NOT EXISTS entries_lru ON entries (last_access);
+            CREATE INDEX IF NOT EXISTS entries_body ON entries (body_hash);
+            CREATE TABLE IF NOT EXISTS bodies (
+                hash TEXT PRIMARY KEY,
+                size INTEGER NOT NULL
+            );
+        """)
+        columns = {row[1] for row in self._db.execute("PRAGMA table_info(entries)")}
+        if "vary" not in columns:
+            # Indexes created before Vary was honoured; their entries vary on nothing
+            self._db.execute("ALTER TABLE entries ADD COLUMN vary TEXT")
+            self._db.commit()
+        self._size = self._total_size()
+
+        self.hits = 0
+        self.revalidated = 0
+        self.misses = 0
+        self.bytes_saved = 0
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def lookup(self, url: str, follow_redirects: bool = True, request_headers: dict = None):
+        """
+        Return the cached entry for a fetch of `url`, or None.
+
+        An entry whose Vary'd request headers differ from `request_headers`
+        is not returned. The entry dict has key, final_url, status_code,
+        headers, redirect_chain, content, etag, last_modified and fresh.
+        """
+        key = cache_key(url, follow_redirects)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT final_url, status_code, headers, redirect_chain, body_hash, "
+                "etag, last_modified, expires_at, vary FROM entries WHERE key = ?",
+                (key,),
+            ).fetchone()
+        if row is None:
+            return None
+        if row[8]:
+            varied = json.loads(row[8])
+            if any(header_value(request_headers or {}, name) != value for name, value in varied.items()):
+                return None
+
+        body_path = os.path.join(self.bodies_dir, row[4])
+        try:
+            with open(body_path, "rb") as f:
+                content = f.read().decode("utf-8")
+        except OSError:
+            # The body is gone; drop the entry unless it was replaced meanwhile
+            self._delete(key, body_hash=row[4])
+            return None
+
+        return {
+            "key": key,
+            "final_url": row[0],
+            "status_code": row[1],
+            "headers": json.loads(row[2]),
+            "redirect_chain": json.loads(row[3]),
+            "content": content,
+            "etag": row[5],
+            "last_modified": row[6],
+            "fresh": time.time() < row[7],
+        }
+
+    def conditional_headers(self, entry) -> dict:
+        """If-None-Match / If-Modified-Since headers to revalidate an entry."""
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def record_hit(self, entry: dict, revalidated_headers: dict = None) -> None:
+        """
+        Count a served lookup() entry; after a 304, refresh its freshness from
+        the stored headers updated with the 304's.
+        """
+        now = time.time()
+        size = len(entry["content"].encode("utf-8"))
+        with self._lock:
+            if revalidated_headers is None:
+                self.hits += 1
+                self._db.execute(
+                    "UPDATE entries SET last_access = ? WHERE key = ?",
+                    (now, entry["key"]),
+                )
+            else:
+                self.revalidated += 1
+                headers = {
+                    k: v for k, v in entry["headers"].items() if header_value(revalidated_headers, k) is None
+                }
+                headers.update(revalidated_headers)
+                self._db.execute(
+                    "UPDATE entries SET last_access = ?, expires_at = ? WHERE key = ?",
+                    (now, _expires_at(headers, now), entry["key"]),
+                )
+            self.bytes_saved += size
+            self._db.commit()
+
+    def store(self, url: str, result: dict, follow_redirects: bool = True, request_headers: dict = None) -> None:
+        """
+        Store a successful fetch_page() result unless the response forbids it.
+
+        `follow_redirects` and `request_headers` describe the request, as for lookup().
+        """
+        headers = result["headers"]
+        with self._lock:
+            self.misses += 1
+        if result["status_code"] != 200 or result["content"] is None:
+            return
+        if "no-store" in parse_cache_control(header_value(headers, "Cache-Control")):
+            return
+        vary = vary_values(headers, request_headers)
+        if vary is None:
+            return
+
+        body = result["content"].encode("utf-8")
+        body_hash = hashlib.sha256(body).hexdigest()
+        body_path = os.path.join(self.bodies_dir, body_hash)
+        if not os.path.exists(body_path):
+            tmp_path = f"{body_path}.{os.getpid()}.{threading.get_ident()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(body)
+            os.replace(tmp_path, body_path)
+
+        key = cache_key(url, follow_redirects)
+        now = time.time()
+        with self._lock:
+            replaced = self._db.execute("SELECT body_hash FROM entries WHERE key = ?", (key,)).fetchone()
+            inserted = self._db.execute(
+                "INSERT OR IGNORE INTO bodies (hash, size) VALUES (?, ?)", (body_hash, len(body))
+            )
+            if inserted.rowcount:
+                self._size += len(body)
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries (key, final_url, status_code, headers, redirect_chain, "
+                "body_hash, etag, last_modified, stored_at, expires_at, last_access, vary) "
+                "VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    result["url"],
+                    result["status_code"],
+                    json.dumps(headers),
+                    json.dumps(result["redirect_chain"]),
+                    body_hash,
+                    header_value(headers, "ETag"),
+                    header_value(headers, "Last-Modified"),
+                    now,
+                    _expires_at(headers, now),
+                    now,
+                    json.dumps(vary) if vary else None,
+                ),
+            )
+            if replaced and replaced[0] != body_hash:
+                self._size -= self._release_body(replaced[0])
+            self._db.commit()
+            self._evict()
+
+    def size_bytes(self) -> int:
+        with self._lock:
+            return self._total_size()
+
+    def _total_size(self) -> int:
+        return self._db.execute("SELECT COALESCE(SUM(size), 0) FROM bodies").fetchone()[0]
+
+    def stats(self) -> dict:
+        return {
+            "hits": self.hits,
+            "revalidated": self.revalidated,
+            "misses": self.misses,
+            "bytes_saved": self.bytes_saved,
+            "size_bytes": self.size_bytes(),
+        }
+
+    def _delete(self, key: str, body_hash: str = None) -> None:
+        """Delete an entry; with `body_hash`, only while the entry still points at that body."""
+        with self._lock:
+            row = self._db.execute("SELECT body_hash FROM entries WHERE key = ?", (key,)).fetchone()
+            if row is None or (body_hash is not None and row[0] != body_hash):
+                return
+            self._db.execute("DELETE FROM entries WHERE key = ?", (key,))
+            self._size -= self._release_body(row[0])
+            self._db.commit()
+
+    def _release_body(self, body_hash: str) -> int:
+        """
+        Delete a body if no entry references it any more (one indexed lookup).
+        Returns the bytes freed. Caller holds the lock.
+        """
+        if self._db.execute("SELECT 1 FROM entries WHERE body_hash = ? LIMIT 1", (body_hash,)).fetchone():
+            return 0
+        row = self._db.execute("SELECT size FROM bodies WHERE hash = ?", (body_hash,)).fetchone()
+        if row is None:
+            return 0
+        try:
+            os.remove(os.path.join(self.bodies_dir, body_hash))
+        except OSError:
+            pass
+        self._db.execute("DELETE FROM bodies WHERE hash = ?", (body_hash,))
+        return row[0]
+
+    def _evict(self) -> None:
+        """
+        Once bodies exceed max_bytes, drop least recently used entries until
+        they fit in EVICT_TO of it. Caller holds the lock.
+        """
+        if self._size <= self.max_bytes:
+            return
+        # Other processes may share the cache directory; evict from the true total
+        self._size = self._total_size()
+        while self._size > self.max_bytes * EVICT_TO:
+            row = self._db.execute(
+                "SELECT key, body_hash FROM entries ORDER BY last_access LIMIT 1"
+            ).fetchone()
+            if row is None:
+                break
+            self._db.execute("DELETE FROM entries WHERE key = ?", (row[0],))
+            self._size -= self._release_body(row[1])
+        self._db.commit()
@@ -0,0 +1,147 @@
+#!/usr/bin/env python3
+"""
+Streaming JSONL output with payload spilling and a resumable checkpoint.
+
+Batch modes write each URL's record as one JSON line the moment it
+completes instead of collecting every result and printing one big document
+at the end, so memory stays flat and progress is visible as the run goes.
+
+Large payloads (any top-level string or bytes value over `spill_bytes`,
+typically an HTML body) are written to content-addressed files under
+`spill_dir` and replaced by a path: record["content"] becomes None and
+record["content_path"] points at the file.
+
+With a checkpoint, every written record is followed by a checkpoint line
+holding the output offset and the record's input URL. Resuming truncates
+the output back to the last checkpointed record (dropping a line torn by
+the interruption) and skips every URL already recorded, so an interrupted
+run continues where it stopped without duplicates.
+
+Usage:
+    with JsonlWriter("results.jsonl", spill_dir="bodies", resume=True) as out:
+        for result in iter_fetch(out.remaining(urls)):
+            out.write(result, key=result["requested_url"])
+"""
+
+import hashlib
+import json
+import os
+import sys
+
+DEFAULT_SPILL_BYTES = 64 * 1024
+
+_EXTENSIONS = {"content": "html"}
+
+
+class JsonlWriter:
+    """Append one JSON line per record to a file or stdout ('-')."""
+
+    def __init__(
+        self,
+        path: str = "-",
+        spill_dir: str = None,
+        spill_bytes: int = DEFAULT_SPILL_BYTES,
+        resume: bool = False,
+    ):
+        self.path = path
+        self.spill_dir = spill_dir
+        self.spill_bytes = spill_bytes
+        self.done = set()
+        self.written = 0
+        self.spilled = 0
+        self.spilled_bytes = 0
+        if spill_dir:
+            os.makedirs(spill_dir, exist_ok=True)
+
+        if path == "-":
+            if resume:
+                raise ValueError("resume needs an output file, not stdout")
+            self._out = sys.stdout
+            self._checkpoint = None
+            return
+
+        self.checkpoint_path = f"{path}.checkpoint"
+        offset = self._load_checkpoint() if resume else 0
+        self._out = open(path, "r+b" if offset else "wb")
+        self._out.seek(offset)
+        self._out.truncate()
+        self._checkpoint = open(self.checkpoint_path, "a" if offset else "w", encoding="utf-8")
+
+    def _load_checkpoint(self) -> int:
+        """Read completed keys; returns the output offset to resume from (0 = start over)."""
+        if not os.path.exists(self.path) or not os.path.exists(self.checkpoint_path):
+            return 0
+        offset = 0
+        good = 0
+        with open(self.checkpoint_path, encoding="utf-8") as f:
+            for line in f:
+                position, _, key = line.rstrip("\n").partition("\t")
+                if not line.endswith("\n") or not position.isdigit():
+                    break
+                offset = int(position)
+                good += len(line.encode("utf-8"))
+                self.done.add(key)
+        if offset > os.path.getsize(self.path):
+            self.done.clear()
+            return 0
+        # Drop a checkpoint line torn by the interruption.
+        with open(self.checkpoint_path, "r+b") as f:
+            f.truncate(good)
+        return offset
+
+    def remaining(self, urls: list) -> list:
+        """The URLs not yet written by a previous run."""
+        return [url for url in urls if url not in self.done]
+
+    def _spill(self, key: str, value) -> str:
+        data = value if isinstance(value, bytes) else value.encode("utf-8")
+        digest = hashlib.sha256(data).hexdigest()
+        extension = _EXTENSIONS.get(key, "bin" if isinstance(value, bytes) else "txt")
+        path = os.path.join(self.spill_dir, digest[:2], f"{digest}.{extension}")
+        if not os.path.exists(path):
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.{os.getpid()}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(data)
+            os.replace(tmp_path, path)
+            self.spilled_bytes += len(data)
+        self.spilled += 1
+        return path
+
+    def write(self, record: dict, key: str = None) -> None:
+        """Write one record (spilling large payloads) and checkpoint it under `key`."""
+        if self.spill_dir:
+            record = dict(record)
+            for field, value in list(record.items()):
+                if isinstance(value, (str, bytes)) and len(value) > self.spill_bytes:
+                    record[field] = None
+                    record[f"{field}_path"] = self._spill(field, value)
+        line = json.dumps(record) + "\n"
+        self._out.write(line if self._out is sys.stdout else line.encode("utf-8"))
+        self._out.flush()
+        self.written += 1
+        if self._checkpoint:
+            key = key or record.get("url")
+            self._checkpoint.write(f"{self._out.tell()}\t{key}\n")
+            self._checkpoint.flush()
+            self.done.add(key)
+
+    def close(self) -> None:
+        if self._out is not sys.stdout:
+            self._out.close()
+        if self._checkpoint:
+            self._checkpoint.close()
+
+    def stats(self) -> dict:
+        return {
+            "written": self.written,
+            "resumed_past": len(self.done) - self.written if self._checkpoint else 0,
+            "spilled": self.spilled,
+            "spilled_bytes": self.spilled_bytes,
+        }
+
+    def __enter__(self) -> "JsonlWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
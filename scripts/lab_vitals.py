@@ -0,0 +1,269 @@
+#!/usr/bin/env python3
+"""
+Repeated-sample lab measurement of Core Web Vitals under device throttling.
+
+One unthrottled page load from a data-center connection is both noisy and
+optimistic. This module loads the page N times on the mobile viewport, each
+sample in its own isolated browser context (cold cache, no shared cookies)
+with Chrome DevTools Protocol CPU slowdown and network throttling applied,
+and reports the median and p75 of:
+
+    lcp_ms        Largest Contentful Paint
+    cls           Cumulative Layout Shift
+    ttfb_ms       navigation responseStart
+    tbt_ms        Total Blocking Time (long-task time over 50ms after FCP),
+                  the usual lab proxy for INP
+    inp_proxy_ms  longest main-thread task during the load: the worst delay
+                  an interaction arriving then would have seen
+
+The samples of a URL run concurrently in one browser, so measuring N
+samples costs roughly one throttled load of wall time. Only one URL's
+samples run in a browser at a time: samples of other pages would compete
+for the same CPU and skew each other's throttled timings. grade_landing()
+grades G59 from the p75 LCP when the lab samples produced one.
+
+Throttle profiles (THROTTLE_PROFILES):
+    mobile-4g  mid-tier mobile: 4x CPU slowdown, 150ms RTT, 1.6Mbps down (default)
+    fast-3g    4x CPU slowdown, 562.5ms RTT, 1.44Mbps down
+    desktop    no CPU slowdown, 40ms RTT, 10Mbps down
+    none       no throttling (repeated samples only)
+
+Usage:
+    python lab_vitals.py https://example.com/landing
+    python lab_vitals.py https://example.com/landing --samples 9 --throttle fast-3g --json
+    python analyze_landing.py https://example.com/landing --lab-samples 5
+"""
+
+import argparse
+import asyncio
+import json
+import sys
+import time
+import weakref
+
+from core import DEFAULT_TIMEOUT_MS, MOBILE
+from page_ready import DEFAULT_DEADLINE_MS, WAIT_FOR_READY, ready_options, remaining_ms
+from timing import nearest_rank, span
+
+DEFAULT_SAMPLES = 5
+DEFAULT_THROTTLE = "mobile-4g"
+
+# Throughputs in kilobits per second; matches Lighthouse's mobile preset and
+# the DevTools "Fast 3G" preset.
+THROTTLE_PROFILES = {
+    "mobile-4g": {"cpu_slowdown": 4, "latency_ms": 150, "download_kbps": 1638.4, "upload_kbps": 750},
+    "fast-3g": {"cpu_slowdown": 4, "latency_ms": 562.5, "download_kbps": 1474.56, "upload_kbps": 675},
+    "desktop": {"cpu_slowdown": 1, "latency_ms": 40, "download_kbps": 10240, "upload_kbps": 10240},
+    "none": None,
+}
+
+METRICS = ("lcp_ms", "cls", "ttfb_ms", "tbt_ms", "inp_proxy_ms")
+
+# browser -> asyncio.Lock held while one URL's samples run
+_lab_locks = weakref.WeakKeyDictionary()
+
+# Long tasks are not in the buffered performance timeline, so observe them
+# from document start.
+OBSERVE_LONG_TASKS = """
+(() => {
+    const tasks = window.__claudeAdsLongTasks = [];
+    try {
+        new PerformanceObserver(list => {
+            for (const entry of list.getEntries()) tasks.push([entry.startTime, entry.duration]);
+        }).observe({type: 'longtask', buffered: true});
+    } catch (e) {}
+})();
+"""
+
+COLLECT_SAMPLE = """
+() => {
+    const nav = performance.getEntriesByType('navigation')[0];
+    const fcpEntry = performance.getEntriesByName('first-contentful-paint')[0];
+    const fcp = fcpEntry ? fcpEntry.startTime : 0;
+    let tbt = 0, longest = 0;
+    for (const [start, duration] of (window.__claudeAdsLongTasks || [])) {
+        if (start + duration > fcp) tbt += Math.max(0, duration - 50);
+        longest = Math.max(longest, duration);
+    }
+    return {ttfb: nav && nav.responseStart ? nav.responseStart : null, tbt, longest};
+}
+"""
+
+
+async def apply_throttle(cdp, throttle: str) -> None:
+    """Apply a THROTTLE_PROFILES entry to the page behind a CDP session."""
+    settings = THROTTLE_PROFILES[throttle]
+    if not settings:
+        return
+    await cdp.send("Emulation.setCPUThrottlingRate", {"rate": settings["cpu_slowdown"]})
+    await cdp.send("Network.enable")
+    await cdp.send("Network.emulateNetworkConditions", {
+        "offline": False,
+        "latency": settings["latency_ms"],
+        # CDP takes bytes per second
+        "downloadThroughput": settings["download_kbps"] * 1024 / 8,
+        "uploadThroughput": settings["upload_kbps"] * 1024 / 8,
+    })
+
+
+async def _sample(browser, url: str, throttle: str, timeout: int, deadline: int) -> dict:
+    """Load the page once, throttled, in a fresh context emulating a mobile device."""
+    sample = {metric: None for metric in METRICS}
+    sample.update({"readiness": None, "error": None})
+    context = await browser.new_context(**MOBILE.context_options(), is_mobile=True, has_touch=True)
+    try:
+        await context.add_init_script(OBSERVE_LONG_TASKS)
+        page = await context.new_page()
+        await apply_throttle(await context.new_cdp_session(page), throttle)
+
+        started = time.perf_counter()
+        await page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+        ready = await page.evaluate(
+            WAIT_FOR_READY, ready_options(("lcp", "cls"), deadline_ms=remaining_ms(started, deadline))
+        )
+        data = await page.evaluate(COLLECT_SAMPLE)
+
+        sample["readiness"] = ready["reason"]
+        sample["lcp_ms"] = round(ready["lcp_ms"]) if ready["lcp_ms"] else None
+        sample["cls"] = round(ready["cls"], 4) if ready["cls"] is not None else None
+        sample["ttfb_ms"] = round(data["ttfb"]) if data["ttfb"] else None
+        sample["tbt_ms"] = round(data["tbt"])
+        sample["inp_proxy_ms"] = round(data["longest"])
+    except Exception as e:
+        sample["error"] = str(e)
+    finally:
+        try:
+            await context.close()
+        except Exception:
+            pass
+    return sample
+
+
+def summarize_samples(samples: list, throttle: str) -> dict:
+    """Median and p75 of each metric over the samples that produced it."""
+    summary = {
+        "throttle": throttle,
+        "samples": len(samples),
+        "errors": sum(bool(s["error"]) for s in samples),
+    }
+    for metric in METRICS:
+        values = sorted(s[metric] for s in samples if s[metric] is not None)
+        summary[metric] = {
+            "count": len(values),
+            "median": nearest_rank(values, 50) if values else None,
+            "p75": nearest_rank(values, 75) if values else None,
+        }
+    summary["runs"] = samples
+    return summary
+
+
+async def measure_vitals(
+    browser,
+    url: str,
+    samples: int = DEFAULT_SAMPLES,
+    throttle: str = DEFAULT_THROTTLE,
+    timeout: int = DEFAULT_TIMEOUT_MS,
+    deadline: int = DEFAULT_DEADLINE_MS,
+    tracer=None,
+) -> dict:
+    """
+    Measure a page `samples` times concurrently in isolated throttled contexts of `browser`.
+
+    Waits while another page's samples run in the same browser.
+
+    Returns:
+        Dictionary with throttle, samples, errors, runs (per-sample values)
+        and, for each of METRICS, {"count", "median", "p75"}
+    """
+    if throttle not in THROTTLE_PROFILES:
+        raise ValueError(f"Unknown throttle profile: {throttle}. Choose from: {list(THROTTLE_PROFILES)}")
+    lock = _lab_locks.get(browser)
+    if lock is None:
+        lock = _lab_locks[browser] = asyncio.Lock()
+    async with lock:
+        with span(tracer, "lab.samples", samples=samples, throttle=throttle):
+            runs = await asyncio.gather(
+                *(_sample(browser, url, throttle, timeout, deadline) for _ in range(max(1, samples)))
+            )
+    return summarize_samples(list(runs), throttle)
+
+
+def lab_vitals(
+    url: str,
+    samples: int = DEFAULT_SAMPLES,
+    throttle: str = DEFAULT_THROTTLE,
+    timeout: int = DEFAULT_TIMEOUT_MS,
+    deadline: int = DEFAULT_DEADLINE_MS,
+) -> dict:
+    """Run measure_vitals() on the browser daemon or a dedicated browser."""
+    try:
+        from playwright.async_api import async_playwright
+    except ImportError:
+        print("Error: playwright required. Install with: pip install -r requirements.txt && playwright install chromium")
+        sys.exit(1)
+    from browser_daemon import attach_async, release
+
+    async def run() -> dict:
+        async with async_playwright() as p:
+            browser, lease_id = await attach_async(p)
+            try:
+                return await measure_vitals(
+                    browser, url, samples=samples, throttle=throttle, timeout=timeout, deadline=deadline
+                )
+            finally:
+                await browser.close()
+                if lease_id is not None:
+                    release(lease_id)
+
+    started = time.perf_counter()
+    try:
+        lab = asyncio.run(run())
+    except Exception as e:
+        return {"url": url, "error": str(e)}
+    return {"url": url, **lab, "elapsed_s": round(time.perf_counter() - started, 2), "error": None}
+
+
+def format_lab(lab: dict) -> str:
+    """One line per metric: median and p75."""
+    lines = [f"Lab ({lab['throttle']}, {lab['samples'] - lab['errors']}/{lab['samples']} samples):"]
+    for metric in METRICS:
+        values = lab[metric]
+        unit = "" if metric == "cls" else "ms"
+        if values["count"]:
+            lines.append(f"  {metric:13s} median {values['median']}{unit}  p75 {values['p75']}{unit}")
+        else:
+            lines.append(f"  {metric:13s} N/A")
+    return "\n".join(lines)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Measure LCP/CLS/TTFB/INP proxies over repeated throttled loads")
+    parser.add_argument("url", help="URL to measure")
+    parser.add_argument("--samples", "-n", type=int, default=DEFAULT_SAMPLES, help="Page loads to run concurrently")
+    parser.add_argument("--throttle", choices=THROTTLE_PROFILES, default=DEFAULT_THROTTLE,
+                        help="CPU and network throttling profile")
+    parser.add_argument("--timeout", "-t", type=int, default=DEFAULT_TIMEOUT_MS, help="Timeout in ms")
+    parser.add_argument("--deadline", "-d", type=int, default=DEFAULT_DEADLINE_MS,
+                        help="Hard per-sample readiness deadline in ms")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    result = lab_vitals(args.url, samples=args.samples, throttle=args.throttle,
+                        timeout=args.timeout, deadline=args.deadline)
+    if args.json:
+        print(json.dumps(result, indent=2))
+        return
+    if result["error"]:
+        print(f"Error: {result['error']}")
+        sys.exit(1)
+    print(f"URL: {result['url']}")
+    print(format_lab(result))
+    for index, run in enumerate(result["runs"], 1):
+        if run["error"]:
+            print(f"  sample {index}: {run['error']}")
+    print(f"Elapsed: {result['elapsed_s']}s")
+
+
+if __name__ == "__main__":
+    main()
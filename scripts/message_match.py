@@ -0,0 +1,593 @@
+#!/usr/bin/env python3
+"""
+Batch message-match relevance scoring for G60 (ad group vs landing page).
+
+Scores how well each landing page reflects the ad groups that send traffic
+to it, using the levels from skills/ads-landing/SKILL.md:
+
+    100  exact     page heading (title/H1) reflects the ad copy and the
+                   page covers the ad group's keywords
+     60  partial   page heading reflects the ad copy
+     30  weak      page content is loosely related
+      0  mismatch  page content does not reflect the ad
+
+Text is tokenized, stop words dropped, tokens stemmed with a light suffix
+stemmer and folded onto canonical synonyms (SYNONYMS, plus --synonyms FILE).
+Ad groups (keywords + headlines) and pages (title + H1, and title + H1 +
+meta description + body text) become sparse TF-IDF rows; the IDF is fitted
+on all of them. Every ad group × landing page pair is then scored with one
+vectorized sparse join per batch (NumPy, no per-pair Python):
+
+    heading_similarity  cosine(ad group, page title + H1)
+    body_similarity     cosine(ad group, whole page)
+    keyword_coverage    share of the ad group's keyword terms found on the page
+
+--suggest also ranks every page in the input for every ad group (a batched
+sparse matrix product) and reports a better-matching landing page when one
+exists.
+
+Ad groups are JSONL, JSON (list) or CSV rows with ad_group (or name/id),
+keywords, headlines and final_url (or final_urls); list fields in CSV are
+separated by "|". Pages are analyze_landing.py / static_landing.py results
+(JSONL or JSON), whose content.text carries the first CONTENT_TEXT_CHARS of
+body text, or --fetch downloads the final URLs and reads the same text
+directly.
+
+--graded FILE writes the --pages results back out as JSONL with
+message_match (the page's lowest-scoring ad group) attached and grades
+recomputed, so G60 is graded from the message-match level.
+
+Usage:
+    python message_match.py ad_groups.csv --pages results.jsonl
+    python message_match.py ad_groups.jsonl --fetch --json > matches.json
+    python message_match.py ad_groups.jsonl --pages results.jsonl --suggest --synonyms synonyms.json
+    python message_match.py ad_groups.csv --pages results.jsonl --graded graded.jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import re
+import sys
+import time
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from core import CONTENT_TEXT_CHARS, lazy_import
+from http_cache import normalize_url
+
+np = lazy_import("numpy")
+
+LEVELS = (
+    (100, "exact"),
+    (60, "partial"),
+    (30, "weak"),
+    (0, "mismatch"),
+)
+# G60 passes when the page heading reflects the ad group theme (google-audit.md)
+LEVEL_GRADES = {100: "PASS", 60: "PASS", 30: "WARNING", 0: "FAIL"}
+
+EXACT_HEADING = 0.5
+EXACT_COVERAGE = 0.75
+PARTIAL_HEADING = 0.25
+WEAK_SIMILARITY = 0.1
+WEAK_COVERAGE = 0.25
+
+PAIR_BATCH = 50000
+SUGGEST_CELLS = 4_000_000
+
+STOP_WORDS = frozenset("""
+a about above after again all also am an and any are as at be because been before being below
+between both but by can could did do does doing down during each few for from further get had has
+have having he her here hers him his how i if in into is it its itself just me more most my no nor
+not now of off on once only or other our ours out over own same she should so some such than that
+the their theirs them then there these they this those through to too under until up us very was
+we were what when where which while who whom why will with would you your yours
+""".split())
+
+# canonical: variants (single words; matched after stemming)
+SYNONYMS = {
+    "buy": ["purchase", "order", "shop"],
+    "cheap": ["affordable", "inexpensive", "budget", "lowcost"],
+    "free": ["complimentary", "nocost"],
+    "discount": ["sale", "deal", "coupon", "promo", "savings"],
+    "quote": ["estimate"],
+    "lawyer": ["attorney", "counsel"],
+    "car": ["auto", "automobile", "vehicle"],
+    "doctor": ["physician"],
+    "repair": ["fix"],
+    "home": ["house"],
+    "job": ["career", "vacancy"],
+    "loan": ["lending", "financing"],
+    "tv": ["television"],
+    "phone": ["smartphone", "mobile"],
+    "near": ["nearby", "local"],
+    "online": ["web", "internet"],
+}
+
+# Click and campaign parameters that do not change which page is served
+TRACKING_PARAMS = ("utm_", "gclid", "gbraid", "wbraid", "fbclid", "msclkid", "ttclid", "li_fat_id", "_ga")
+
+_TOKEN = re.compile(r"[^\W_]+", re.UNICODE)
+
+
+def stem(token: str) -> str:
+    """Light suffix-stripping stemmer (plurals, -ing, -ed, -er, -ly, final -e)."""
+    if len(token) <= 3 or token.isdigit():
+        return token
+    if token.endswith("ies") and len(token) > 4:
+        token = token[:-3] + "y"
+    elif token.endswith("sses"):
+        token = token[:-2]
+    elif token.endswith("s") and not token.endswith(("ss", "us", "is")):
+        token = token[:-1]
+    for suffix, keep in (("ing", 3), ("ed", 3), ("er", 4)):
+        if token.endswith(suffix) and len(token) - len(suffix) >= keep:
+            token = token[:-len(suffix)]
+            if len(token) > 3 and token[-1] == token[-2] and token[-1] not in "lsz":
+                token = token[:-1]
+            break
+    if token.endswith("ly") and len(token) > 5:
+        token = token[:-2]
+    if token.endswith("e") and len(token) > 4:
+        token = token[:-1]
+    return token
+
+
+class Analyzer:
+    """Tokenize, drop stop words, stem and fold synonyms; assigns term ids."""
+
+    def __init__(self, synonyms: dict = None):
+        self.canonical = {}
+        for canonical, variants in {**SYNONYMS, **(synonyms or {})}.items():
+            for variant in variants:
+                self.canonical[stem(variant.lower())] = stem(canonical.lower())
+        self.vocabulary = {}
+        self._stems = {}
+
+    def terms(self, text: str) -> list:
+        """Term ids of a text, in order (repeats kept)."""
+        ids = []
+        for token in _TOKEN.findall((text or "").lower()):
+            if token in STOP_WORDS:
+                continue
+            term = self._stems.get(token)
+            if term is None:
+                term = stem(token)
+                term = self.canonical.get(term, term)
+                self._stems[token] = term
+            ids.append(self.vocabulary.setdefault(term, len(self.vocabulary)))
+        return ids
+
+
+class SparseRows:
+    """CSR rows of term weights: indptr, indices (sorted per row), data."""
+
+    def __init__(self, indptr, indices, data):
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @property
+    def rows(self) -> int:
+        return len(self.indptr) - 1
+
+    def nnz_per_row(self) -> np.ndarray:
+        return np.diff(self.indptr)
+
+
+def term_counts(documents: list, vocabulary_size: int) -> SparseRows:
+    """CSR term counts from lists of term ids."""
+    lengths = np.fromiter((len(doc) for doc in documents), dtype=np.int64, count=len(documents))
+    flat = np.fromiter((term for doc in documents for term in doc), dtype=np.int64, count=int(lengths.sum()))
+    rows = np.repeat(np.arange(len(documents), dtype=np.int64), lengths)
+    keys, counts = np.unique(rows * vocabulary_size + flat, return_counts=True)
+    row_of = keys // vocabulary_size
+    indptr = np.zeros(len(documents) + 1, dtype=np.int64)
+    np.cumsum(np.bincount(row_of, minlength=len(documents)), out=indptr[1:])
+    return SparseRows(indptr, keys % vocabulary_size, counts.astype(np.float64))
+
+
+def document_frequency(matrices: list, vocabulary_size: int) -> tuple:
+    """(df per term, document count) over several CSR matrices."""
+    df = np.zeros(vocabulary_size)
+    documents = 0
+    for matrix in matrices:
+        df += np.bincount(matrix.indices, minlength=vocabulary_size)
+        documents += matrix.rows
+    return df, documents
+
+
+def tfidf(counts: SparseRows, idf: np.ndarray) -> SparseRows:
+    """Sublinear TF × IDF, L2-normalized per row."""
+    data = (1 + np.log(counts.data)) * idf[counts.indices]
+    rows = np.repeat(np.arange(counts.rows), counts.nnz_per_row())
+    norms = np.sqrt(np.bincount(rows, weights=data * data, minlength=counts.rows))
+    norms[norms == 0] = 1
+    return SparseRows(counts.indptr, counts.indices, data / norms[rows])
+
+
+def binary(counts: SparseRows) -> SparseRows:
+    return SparseRows(counts.indptr, counts.indices, np.ones_like(counts.data))
+
+
+def _explode(matrix: SparseRows, rows: np.ndarray) -> tuple:
+    """(pair index, term, weight) for every nonzero of matrix[rows[i]]."""
+    starts = matrix.indptr[rows]
+    counts = matrix.indptr[rows + 1] - starts
+    pairs = np.repeat(np.arange(len(rows)), counts)
+    ends = np.cumsum(counts)
+    positions = np.arange(ends[-1] if len(ends) else 0) - np.repeat(ends - counts, counts) + np.repeat(starts, counts)
+    return pairs, matrix.indices[positions], matrix.data[positions]
+
+
+def pair_dot(x: SparseRows, y: SparseRows, rows_x, rows_y, vocabulary_size: int) -> np.ndarray:
+    """Dot products x[rows_x[i]] · y[rows_y[i]] for every pair i, in batches of PAIR_BATCH."""
+    rows_x = np.asarray(rows_x, dtype=np.int64)
+    rows_y = np.asarray(rows_y, dtype=np.int64)
+    out = np.zeros(len(rows_x))
+    for start in range(0, len(rows_x), PAIR_BATCH):
+        stop = min(start + PAIR_BATCH, len(rows_x))
+        pairs_x, terms_x, weights_x = _explode(x, rows_x[start:stop])
+        pairs_y, terms_y, weights_y = _explode(y, rows_y[start:stop])
+        # Terms are unique within a row, so (pair, term) keys are unique per side
+        _, ix, iy = np.intersect1d(
+            pairs_x * vocabulary_size + terms_x,
+            pairs_y * vocabulary_size + terms_y,
+            assume_unique=True, return_indices=True,
+        )
+        out[start:stop] = np.bincount(pairs_x[ix], weights=weights_x[ix] * weights_y[iy], minlength=stop - start)
+    return out
+
+
+def best_matches(x: SparseRows, y: SparseRows) -> tuple:
+    """For every row of x, the row of y with the highest dot product: (index, score)."""
+    order = np.argsort(y.indices, kind="stable")
+    postings_rows = np.repeat(np.arange(y.rows), y.nnz_per_row())[order]
+    postings_data = y.data[order]
+    vocabulary_size = int(max(x.indices.max(initial=-1), y.indices.max(initial=-1))) + 1
+    term_ptr = np.zeros(vocabulary_size + 1, dtype=np.int64)
+    np.cumsum(np.bincount(y.indices, minlength=vocabulary_size), out=term_ptr[1:])
+    postings = SparseRows(term_ptr, postings_rows, postings_data)
+
+    best = np.full(x.rows, -1, dtype=np.int64)
+    scores = np.zeros(x.rows)
+    batch = max(1, SUGGEST_CELLS // max(1, y.rows))
+    for start in range(0, x.rows, batch):
+        stop = min(start + batch, x.rows)
+        local, terms, weights = _explode(x, np.arange(start, stop))
+        # Each (ad group, term) nonzero meets every page posting of that term
+        hit_local = np.repeat(local, np.diff(term_ptr)[terms])
+        hit_weight = np.repeat(weights, np.diff(term_ptr)[terms])
+        _, hit_page, hit_page_weight = _explode(postings, terms)
+        matrix = np.bincount(
+            hit_local * y.rows + hit_page, weights=hit_weight * hit_page_weight, minlength=(stop - start) * y.rows
+        ).reshape(stop - start, y.rows)
+        if y.rows:
+            best[start:stop] = matrix.argmax(axis=1)
+            scores[start:stop] = matrix.max(axis=1)
+    return best, scores
+
+
+def level_of(heading: np.ndarray, body: np.ndarray, coverage: np.ndarray) -> np.ndarray:
+    """Message-match level (100/60/30/0) per pair."""
+    return np.select(
+        [
+            (heading >= EXACT_HEADING) & (coverage >= EXACT_COVERAGE),
+            heading >= PARTIAL_HEADING,
+            (np.maximum(heading, body) >= WEAK_SIMILARITY) | (coverage >= WEAK_COVERAGE),
+        ],
+        [100, 60, 30],
+        default=0,
+    )
+
+
+def _as_list(value) -> list:
+    if value is None:
+        return []
+    if isinstance(value, str):
+        return [part.strip() for part in re.split(r"[|\n]", value) if part.strip()]
+    return [str(item) for item in value if item]
+
+
+def ad_group_rows(rows) -> list:
+    """Normalize ad group rows to {ad_group, keywords, headlines, final_urls}."""
+    groups = []
+    for index, row in enumerate(rows):
+        final_urls = _as_list(row.get("final_urls")) or _as_list(row.get("final_url"))
+        groups.append({
+            "ad_group": row.get("ad_group") or row.get("name") or row.get("id") or str(index),
+            "keywords": _as_list(row.get("keywords")),
+            "headlines": _as_list(row.get("headlines")),
+            "final_urls": final_urls,
+        })
+    return groups
+
+
+def _read_records(path: str) -> list:
+    """Rows from a JSONL, JSON (list or {"results": [...]}) or CSV file ('-' for stdin)."""
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    if path.lower().endswith(".csv"):
+        return list(csv.DictReader(io.StringIO(text)))
+    try:
+        data = json.loads(text)
+    except json.JSONDecodeError:
+        pass
+    else:
+        return data.get("results", [data]) if isinstance(data, dict) else data
+    lines = [line for line in text.splitlines() if line.strip()]
+    try:
+        return json.loads("[" + ",".join(lines) + "]")
+    except json.JSONDecodeError as e:
+        raise ValueError(f"Invalid JSONL input: {e}") from None
+
+
+def read_ad_groups(path: str) -> list:
+    return ad_group_rows(_read_records(path))
+
+
+def page_documents(result: dict) -> dict:
+    """The heading and full text of an analyze_landing()/static_landing result."""
+    content = result.get("content") or {}
+    heading = " ".join(filter(None, (content.get("title"), content.get("h1"))))
+    full = " ".join(filter(None, (heading, content.get("meta_description"), content.get("text"))))
+    return {"heading": heading, "full": full}
+
+
+def fetch_page_documents(urls: list, workers: int = 32, per_host: int = 4) -> dict:
+    """Fetch pages and read title, H1, meta description and body text: {page_key(): result}."""
+    from fetch_page import iter_fetch
+    from static_landing import _LandingParser
+
+    pages = {}
+    for fetched in iter_fetch(urls, workers=workers, per_host=per_host):
+        result = {"url": fetched["url"], "content": {}, "error": fetched["error"]}
+        if not fetched["error"] and fetched["content"]:
+            parser = _LandingParser()
+            try:
+                parser.feed(fetched["content"])
+                parser.close()
+            except Exception as e:
+                result["error"] = f"HTML parse error: {e}"
+            result["content"] = {
+                "title": parser.title,
+                "h1": parser.h1,
+                "meta_description": parser.meta_description,
+                "text": re.sub(r"\s+", " ", " ".join(parser.text)).strip()[:CONTENT_TEXT_CHARS],
+            }
+        pages[page_key(fetched.get("requested_url") or fetched["url"])] = result
+    return pages
+
+
+def page_key(url: str) -> str:
+    """normalize_url() without tracking parameters, so tagged final URLs find their page."""
+    parts = urlsplit(url if "://" in url else f"https://{url}")
+    query = [(k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+             if not k.lower().startswith(TRACKING_PARAMS)]
+    return normalize_url(urlunsplit(parts._replace(query=urlencode(query))))
+
+
+def index_pages(results) -> dict:
+    """{page_key(): result}, keyed by both the requested and the final URL."""
+    pages = {}
+    for result in results:
+        for url in (result.get("requested_url"), result.get("url")):
+            if url:
+                pages[page_key(url)] = result
+    return pages
+
+
+def match_ad_groups(ad_groups: list, pages: dict, synonyms: dict = None, suggest: bool = False) -> dict:
+    """
+    Score every ad group × landing page pair.
+
+    Args:
+        ad_groups: ad_group_rows() output
+        pages: {page_key(): page result} (see index_pages())
+        synonyms: Extra {canonical: [variants]} merged over SYNONYMS
+        suggest: Also find the best-matching page of the input for every ad group
+
+    Returns:
+        Dictionary with pairs (ad_group, url, level, label, grade, relevance,
+        heading_similarity, body_similarity, keyword_coverage, and
+        suggested_url/suggested_similarity with suggest), missing (pairs whose
+        page was not found or errored) and stats
+    """
+    started = time.perf_counter()
+    analyzer = Analyzer(synonyms)
+
+    # One row per distinct page result; several URLs may point at it
+    page_urls, page_index, rows_by_result, documents = [], {}, {}, []
+    for url, result in pages.items():
+        if result.get("error"):
+            continue
+        if id(result) not in rows_by_result:
+            rows_by_result[id(result)] = len(page_urls)
+            page_urls.append(result.get("url") or url)
+            documents.append(page_documents(result))
+        page_index[url] = rows_by_result[id(result)]
+    heading_terms = [analyzer.terms(d["heading"]) for d in documents]
+    full_terms = [analyzer.terms(d["full"]) for d in documents]
+
+    ad_terms = [analyzer.terms(" ".join(g["keywords"] + g["headlines"])) for g in ad_groups]
+    keyword_terms = [analyzer.terms(" ".join(g["keywords"])) for g in ad_groups]
+
+    pair_ads, pair_pages, missing = [], [], []
+    for index, group in enumerate(ad_groups):
+        for url in group["final_urls"]:
+            page = page_index.get(page_key(url))
+            if page is None:
+                missing.append({"ad_group": group["ad_group"], "url": url})
+            else:
+                pair_ads.append(index)
+                pair_pages.append(page)
+    tokenized = time.perf_counter()
+
+    vocabulary_size = max(1, len(analyzer.vocabulary))
+    ads = term_counts(ad_terms, vocabulary_size)
+    keywords = term_counts(keyword_terms, vocabulary_size)
+    headings = term_counts(heading_terms, vocabulary_size)
+    full = term_counts(full_terms, vocabulary_size)
+    df, documents_count = document_frequency([ads, full], vocabulary_size)
+    idf = np.log((1 + documents_count) / (1 + df)) + 1
+
+    ads_tfidf = tfidf(ads, idf)
+    heading = pair_dot(ads_tfidf, tfidf(headings, idf), pair_ads, pair_pages, vocabulary_size)
+    full_tfidf = tfidf(full, idf)
+    body = pair_dot(ads_tfidf, full_tfidf, pair_ads, pair_pages, vocabulary_size)
+    keyword_total = keywords.nnz_per_row()[np.asarray(pair_ads, dtype=np.int64)]
+    found = pair_dot(binary(keywords), binary(full), pair_ads, pair_pages, vocabulary_size)
+    coverage = np.divide(found, keyword_total, out=np.zeros(len(found)), where=keyword_total > 0)
+    levels = level_of(heading, body, coverage)
+    relevance = 100 * (0.5 * heading + 0.3 * coverage + 0.2 * body)
+
+    suggested = None
+    if suggest:
+        suggested = best_matches(ads_tfidf, full_tfidf)
+    scored = time.perf_counter()
+
+    labels = dict(LEVELS)
+    pairs = []
+    for i, (ad, page) in enumerate(zip(pair_ads, pair_pages)):
+        level = int(levels[i])
+        pair = {
+            "ad_group": ad_groups[ad]["ad_group"],
+            "url": page_urls[page],
+            "level": level,
+            "label": labels[level],
+            "grade": LEVEL_GRADES[level],
+            "relevance": round(float(relevance[i]), 1),
+            "heading_similarity": round(float(heading[i]), 3),
+            "body_similarity": round(float(body[i]), 3),
+            "keyword_coverage": round(float(coverage[i]), 3),
+        }
+        if suggested is not None:
+            best, best_score = suggested[0][ad], suggested[1][ad]
+            if best >= 0 and best != page and best_score > body[i]:
+                pair["suggested_url"] = page_urls[best]
+                pair["suggested_similarity"] = round(float(best_score), 3)
+        pairs.append(pair)
+
+    elapsed = time.perf_counter() - started
+    return {
+        "pairs": pairs,
+        "missing": missing,
+        "stats": {
+            "ad_groups": len(ad_groups),
+            "pages": len(page_urls),
+            "pairs": len(pairs),
+            "terms": len(analyzer.vocabulary),
+            "levels": {labels[level]: int((levels == level).sum()) for level, _ in LEVELS},
+            "tokenize_s": round(tokenized - started, 3),
+            "score_s": round(scored - tokenized, 3),
+            "elapsed_s": round(elapsed, 3),
+            "pairs_per_sec": round(len(pairs) / (scored - tokenized)) if scored > tokenized else None,
+        },
+    }
+
+
+def attach_matches(results: list, pairs: list) -> None:
+    """
+    Add result["message_match"] (the page's lowest-scoring ad group pair) to
+    page results, so grade_landing() grades G60 from the message-match level.
+    """
+    worst = {}
+    for pair in pairs:
+        key = page_key(pair["url"])
+        if key not in worst or pair["relevance"] < worst[key]["relevance"]:
+            worst[key] = pair
+    for result in results:
+        pair = worst.get(page_key(result.get("url") or ""))
+        if pair:
+            result["message_match"] = {
+                key: pair[key] for key in ("ad_group", "level", "label", "grade", "relevance")
+            }
+
+
+def write_graded(path: str, results: list, pairs: list) -> int:
+    """
+    Write page results as JSONL with message_match attached and grades recomputed.
+
+    Returns:
+        Number of results that got a message_match
+    """
+    from jsonl_output import JsonlWriter
+    from static_landing import grade_landing
+
+    attach_matches(results, pairs)
+    with JsonlWriter(path) as out:
+        for result in results:
+            out.write({**result, "grades": grade_landing(result)})
+    return sum(1 for result in results if "message_match" in result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score ad group vs landing page message match (G60)")
+    parser.add_argument("ad_groups", help="Ad groups: JSONL, JSON or CSV ('-' for stdin)")
+    parser.add_argument("--pages", "-p", metavar="FILE",
+                        help="analyze_landing.py/static_landing.py results (JSONL or JSON)")
+    parser.add_argument("--fetch", action="store_true", help="Fetch the ad groups' final URLs instead of --pages")
+    parser.add_argument("--synonyms", metavar="FILE", help="JSON {canonical: [variants]} merged over the built-ins")
+    parser.add_argument("--suggest", action="store_true",
+                        help="Rank every page for every ad group and suggest better-matching landing pages")
+    parser.add_argument("--graded", metavar="FILE",
+                        help="Write the --pages results as JSONL with message_match attached and G60 regraded")
+    parser.add_argument("--workers", "-w", type=int, default=32, help="Concurrent fetches (--fetch)")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if bool(args.pages) == bool(args.fetch):
+        parser.error("provide either --pages FILE or --fetch")
+    if args.graded and not args.pages:
+        parser.error("--graded needs --pages")
+
+    synonyms = None
+    if args.synonyms:
+        with open(args.synonyms, encoding="utf-8") as f:
+            synonyms = json.load(f)
+
+    try:
+        ad_groups = read_ad_groups(args.ad_groups)
+        if args.fetch:
+            urls = sorted({url for group in ad_groups for url in group["final_urls"]})
+            pages = fetch_page_documents(urls, workers=args.workers)
+        else:
+            results = _read_records(args.pages)
+            pages = index_pages(results)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+
+    output = match_ad_groups(ad_groups, pages, synonyms=synonyms, suggest=args.suggest)
+    if args.graded:
+        matched = write_graded(args.graded, results, output["pairs"])
+        print(f"Wrote {len(results)} results ({matched} with message_match) to {args.graded}", file=sys.stderr)
+    if args.json:
+        print(json.dumps(output, indent=2))
+        return
+
+    for pair in sorted(output["pairs"], key=lambda p: p["relevance"]):
+        if pair["level"] >= 60 and "suggested_url" not in pair:
+            continue
+        print(f"[{pair['label'].upper():8s} {pair['level']:3d}] {pair['ad_group']} -> {pair['url']} "
+              f"(heading {pair['heading_similarity']}, body {pair['body_similarity']}, "
+              f"keywords {pair['keyword_coverage']:.0%})")
+        if "suggested_url" in pair:
+            print(f"    better match: {pair['suggested_url']} ({pair['suggested_similarity']})")
+    for item in output["missing"]:
+        print(f"[MISSING] {item['ad_group']} -> {item['url']}: page not in input or failed to load")
+    stats = output["stats"]
+    levels = ", ".join(f"{count} {label}" for label, count in stats["levels"].items())
+    print(f"\nScored {stats['pairs']} pairs ({stats['ad_groups']} ad groups, {stats['pages']} pages): {levels} "
+          f"in {stats['elapsed_s']}s (scoring {stats['score_s']}s)")
+
+
+if __name__ == "__main__":
+    main()
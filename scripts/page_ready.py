@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+Signal-driven page readiness for the Playwright landing page scripts.
+
+Instead of waiting for `networkidle` (which pages with chat widgets or
+polling trackers never reach) and then sleeping a fixed few seconds for the
+CLS/LCP observers, navigate with `wait_until="domcontentloaded"` and evaluate
+WAIT_FOR_READY. It resolves as soon as every requested signal is final:
+
+    dom  DOMContentLoaded has fired and a quiet window has passed
+    lcp  the load event has fired and no new LCP candidate appeared for the
+         quiet window (pages without any LCP element settle on load + quiet)
+    cls  the load event has fired and no layout shift happened for the
+         quiet window
+
+or when the hard deadline expires, and reports which condition ended the wait.
+
+Usage (sync or async page, same script):
+    page.goto(url, wait_until="domcontentloaded", timeout=timeout)
+    ready = page.evaluate(WAIT_FOR_READY, ready_options(("lcp", "cls"), deadline_ms=10000))
+    ready["reason"]  # "settled" or "deadline"
+"""
+
+import time
+
+SIGNALS = ("dom", "lcp", "cls")
+
+DEFAULT_QUIET_MS = 500
+DEFAULT_DEADLINE_MS = 15000
+
+WAIT_FOR_READY = """
+(opts) => new Promise(resolve => {
+    const started = performance.now();
+    let lcp = null, lcpAt = 0, cls = 0, shiftAt = 0;
+    const observers = [];
+
+    const observe = (type, onEntries) => {
+        try {
+            const po = new PerformanceObserver(list => onEntries(list.getEntries()));
+            po.observe({type, buffered: true});
+            observers.push(po);
+        } catch (e) {}
+    };
+    observe('largest-contentful-paint', entries => {
+        if (entries.length) {
+            const last = entries[entries.length - 1];
+            lcp = last.startTime;
+            lcpAt = Math.max(lcpAt, last.startTime);
+        }
+    });
+    observe('layout-shift', entries => {
+        for (const entry of entries) {
+            if (!entry.hadRecentInput) cls += entry.value;
+            shiftAt = Math.max(shiftAt, entry.startTime);
+        }
+    });
+
+    const pendingSignals = now => {
+        const nav = performance.getEntriesByType('navigation')[0];
+        const dcl = nav && nav.domContentLoadedEventEnd ? nav.domContentLoadedEventEnd : null;
+        const load = nav && nav.loadEventEnd ? nav.loadEventEnd : null;
+        const quiet = since => since !== null && now - since >= opts.quietMs;
+        const pending = [];
+        for (const signal of opts.needs) {
+            if (signal === 'dom' && !quiet(dcl)) pending.push(signal);
+            if (signal === 'lcp' && !(load && quiet(Math.max(load, lcpAt)))) pending.push(signal);
+            if (signal === 'cls' && !(load && quiet(Math.max(load, shiftAt)))) pending.push(signal);
+        }
+        return pending;
+    };
+
+    const finish = (reason, pending) => {
+        observers.forEach(po => po.disconnect());
+        resolve({
+            reason,
+            pending,
+            waited_ms: Math.round(performance.now() - started),
+            lcp_ms: lcp,
+            cls,
+        });
+    };
+
+    const tick = () => {
+        const now = performance.now();
+        const pending = pendingSignals(now);
+        if (pending.length === 0) return finish('settled', pending);
+        if (now - started >= opts.deadlineMs) return finish('deadline', pending);
+        setTimeout(tick, opts.pollMs);
+    };
+    tick();
+})
+"""
+
+
+def ready_options(
+    needs=SIGNALS,
+    quiet_ms: int = DEFAULT_QUIET_MS,
+    deadline_ms: int = DEFAULT_DEADLINE_MS,
+    poll_ms: int = 50,
+) -> dict:
+    """Build the argument passed to WAIT_FOR_READY."""
+    unknown = [s for s in needs if s not in SIGNALS]
+    if unknown:
+        raise ValueError(f"Unknown readiness signals: {unknown}. Choose from: {list(SIGNALS)}")
+    return {
+        "needs": list(needs),
+        "quietMs": quiet_ms,
+        "deadlineMs": max(0, deadline_ms),
+        "pollMs": poll_ms,
+    }
+
+
+def remaining_ms(started: float, deadline_ms: int) -> int:
+    """Milliseconds left of a per-page deadline that began at time.perf_counter() `started`."""
+    return max(0, deadline_ms - round((time.perf_counter() - started) * 1000))
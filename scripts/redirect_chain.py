@@ -0,0 +1,484 @@
+#!/usr/bin/env python3
+"""
+Resolve ad final URL redirect chains and profile each hop's latency.
+
+Tracking templates and click trackers put several redirects between the ad
+click and the landing page, and every hop adds post-click latency. This
+resolver walks each chain hop by hop without downloading bodies (at most a
+few KB of an HTML response is read to spot a meta refresh), and times every
+hop's DNS lookup, TCP connect, TLS handshake and response (request sent to
+response headers received).
+
+Work shared across a large URL list is done once:
+    - DNS answers are cached per host
+    - keep-alive connections are pooled per origin, so the same tracker
+      domain is connected to once rather than once per URL
+    - a hop URL already resolved (a shared tracking template, or the
+      landing page many ads point at) is answered from a hop cache
+
+Because of that sharing, measured hop times understate what a first-time
+visitor pays, so each chain also reports cold_ms: response times plus the
+DNS, connect and TLS cost of every distinct origin in the chain, as first
+measured. Chains whose cold_ms exceeds the threshold are flagged slow.
+
+Usage:
+    python redirect_chain.py "https://ad.doubleclick.net/..."
+    python redirect_chain.py --batch final_urls.txt --threshold-ms 800
+    python redirect_chain.py --batch final_urls.txt --workers 64 --jsonl chains.jsonl
+"""
+
+import argparse
+import http.client
+import json
+import re
+import socket
+import ssl
+import sys
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import urljoin, urlsplit
+
+from url_list import read_urls
+
+DEFAULT_MAX_HOPS = 10
+DEFAULT_THRESHOLD_MS = 1000
+DEFAULT_HOP_CACHE_SIZE = 10000
+META_REFRESH_BYTES = 16 * 1024
+MAX_DRAIN_BYTES = 64 * 1024
+
+REDIRECT_STATUSES = {301, 302, 303, 307, 308}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+_META_REFRESH = re.compile(
+    rb"""<meta[^>]+http-equiv\s*=\s*["']?refresh["']?[^>]*content\s*=\s*["']?\s*\d*\s*;?\s*url\s*=\s*([^"'>\s]+)""",
+    re.IGNORECASE,
+)
+
+REQUEST_HEADERS = {
+    "User-Agent": (
+        "Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 "
+        "(KHTML, like Gecko) Chrome/120.0.0.0 Safari/537.36"
+    ),
+    "Accept": "text/html,application/xhtml+xml,application/xml;q=0.9,*/*;q=0.8",
+    "Accept-Language": "en-US,en;q=0.9",
+    "Accept-Encoding": "identity",
+}
+
+
+class RedirectResolver:
+    """Hop-by-hop redirect resolver with DNS, connection and hop caches shared across chains."""
+
+    def __init__(
+        self,
+        timeout: float = 10,
+        max_hops: int = DEFAULT_MAX_HOPS,
+        method: str = "GET",
+        per_host: int = 8,
+        hop_cache_size: int = DEFAULT_HOP_CACHE_SIZE,
+    ):
+        self.timeout = timeout
+        self.max_hops = max_hops
+        self.method = method
+        self.per_host = per_host
+        self.hop_cache_size = hop_cache_size
+        self._ssl = ssl.create_default_context()
+        self._lock = threading.Lock()
+        self._dns = {}          # (host, port) -> (addrinfo, dns_ms)
+        self._setup = {}        # origin -> {"dns_ms", "connect_ms", "tls_ms"} of the first connection
+        self._idle = {}         # origin -> [HTTPConnection]
+        self._slots = {}        # host -> BoundedSemaphore
+        self._hops = OrderedDict()
+        self.stats = {
+            "requests": 0,
+            "hop_cache_hits": 0,
+            "dns_lookups": 0,
+            "dns_cache_hits": 0,
+            "connections": 0,
+            "connections_reused": 0,
+        }
+
+    def _count(self, key: str) -> None:
+        with self._lock:
+            self.stats[key] += 1
+
+    def _lookup(self, host: str, port: int):
+        """Cached getaddrinfo(); returns (addrinfo, dns_ms, cached)."""
+        with self._lock:
+            entry = self._dns.get((host, port))
+        if entry:
+            self._count("dns_cache_hits")
+            return entry[0], entry[1], True
+        started = time.perf_counter()
+        info = socket.getaddrinfo(host, port, type=socket.SOCK_STREAM)[0]
+        dns_ms = (time.perf_counter() - started) * 1000
+        self._count("dns_lookups")
+        with self._lock:
+            self._dns[(host, port)] = (info, dns_ms)
+        return info, dns_ms, False
+
+    def _connect(self, origin: tuple, timing: dict) -> http.client.HTTPConnection:
+        scheme, host, port = origin
+        info, timing["dns_ms"], _ = self._lookup(host, port)
+        family, socktype, proto, _, address = info
+
+        started = time.perf_counter()
+        sock = socket.socket(family, socktype, proto)
+        sock.settimeout(self.timeout)
+        try:
+            sock.connect(address)
+            timing["connect_ms"] = (time.perf_counter() - started) * 1000
+            if scheme == "https":
+                started = time.perf_counter()
+                sock = self._ssl.wrap_socket(sock, server_hostname=host)
+                timing["tls_ms"] = (time.perf_counter() - started) * 1000
+        except BaseException:
+            sock.close()
+            raise
+        self._count("connections")
+        with self._lock:
+            self._setup.setdefault(origin, {
+                "dns_ms": timing["dns_ms"],
+                "connect_ms": timing["connect_ms"],
+                "tls_ms": timing["tls_ms"],
+            })
+
+        conn = http.client.HTTPConnection(host, port, timeout=self.timeout)
+        conn.sock = sock
+        return conn
+
+    def _checkout(self, origin: tuple):
+        with self._lock:
+            idle = self._idle.get(origin)
+            return idle.pop() if idle else None
+
+    def _checkin(self, origin: tuple, conn: http.client.HTTPConnection) -> None:
+        with self._lock:
+            self._idle.setdefault(origin, []).append(conn)
+
+    def _slot(self, host: str) -> threading.BoundedSemaphore:
+        with self._lock:
+            if host not in self._slots:
+                self._slots[host] = threading.BoundedSemaphore(max(1, self.per_host))
+            return self._slots[host]
+
+    def setup_cost(self, origin: tuple) -> dict:
+        """DNS/connect/TLS cost of the first connection to an origin (zeros if never connected)."""
+        with self._lock:
+            return dict(self._setup.get(origin) or {"dns_ms": 0.0, "connect_ms": 0.0, "tls_ms": 0.0})
+
+    def _send(self, conn, parsed, host_header: str):
+        path = parsed.path or "/"
+        if parsed.query:
+            path = f"{path}?{parsed.query}"
+        conn.putrequest(self.method, path, skip_host=True, skip_accept_encoding=True)
+        conn.putheader("Host", host_header)
+        for name, value in REQUEST_HEADERS.items():
+            conn.putheader(name, value)
+        conn.endheaders()
+        return conn.getresponse()
+
+    def hop(self, url: str) -> dict:
+        """
+        Request one URL without following redirects.
+
+        Returns:
+            Dictionary with url, origin, status, location (next hop or None),
+            dns_ms, connect_ms, tls_ms, response_ms, total_ms,
+            reused_connection, cached and error. A hop cache hit keeps the
+            first request's dns/connect/tls/response timings (for cold_ms),
+            but its total_ms is the time actually spent: the lookup
+        """
+        started = time.perf_counter()
+        with self._lock:
+            cached = self._hops.get(url)
+            if cached:
+                self._hops.move_to_end(url)
+        if cached:
+            self._count("hop_cache_hits")
+            return {**cached, "cached": True, "total_ms": round((time.perf_counter() - started) * 1000, 1)}
+
+        parsed = urlsplit(url)
+        scheme = parsed.scheme.lower()
+        host = (parsed.hostname or "").lower()
+        port = parsed.port or _DEFAULT_PORTS.get(scheme)
+        hop = {
+            "url": url,
+            "origin": f"{scheme}://{host}:{port}",
+            "status": None,
+            "location": None,
+            "dns_ms": 0.0,
+            "connect_ms": 0.0,
+            "tls_ms": 0.0,
+            "response_ms": None,
+            "total_ms": None,
+            "reused_connection": False,
+            "cached": False,
+            "error": None,
+        }
+        if scheme not in _DEFAULT_PORTS or not host:
+            hop["error"] = f"Unsupported URL: {url}"
+            return hop
+
+        origin = (scheme, host, port)
+        host_header = host if port == _DEFAULT_PORTS[scheme] else f"{host}:{port}"
+        started = time.perf_counter()
+        with self._slot(host):
+            conn = None
+            try:
+                response, conn = self._exchange(origin, parsed, host_header, hop)
+                self._count("requests")
+                hop["status"] = response.status
+                location = response.getheader("Location")
+                if response.status in REDIRECT_STATUSES and location:
+                    hop["location"] = urljoin(url, location.strip())
+                elif response.status == 200 and "html" in (response.getheader("Content-Type") or "") \
+                        and self.method == "GET":
+                    # The body can stall like any other read (e.g. a socket timeout)
+                    match = _META_REFRESH.search(response.read(META_REFRESH_BYTES))
+                    if match:
+                        hop["location"] = urljoin(url, match.group(1).decode("utf-8", "replace"))
+                        hop["meta_refresh"] = True
+                self._release(origin, conn, response)
+            except (OSError, http.client.HTTPException) as e:
+                if conn is not None:
+                    conn.close()
+                hop["error"] = f"{type(e).__name__}: {e}"
+                hop["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+                return hop
+        hop["total_ms"] = round((time.perf_counter() - started) * 1000, 1)
+        for key in ("dns_ms", "connect_ms", "tls_ms", "response_ms"):
+            hop[key] = round(hop[key], 1)
+
+        with self._lock:
+            self._hops[url] = dict(hop)
+            while len(self._hops) > self.hop_cache_size:
+                self._hops.popitem(last=False)
+        return hop
+
+    def _exchange(self, origin: tuple, parsed, host_header: str, hop: dict):
+        """Send the request on a pooled connection (retrying once on a fresh one if it went stale)."""
+        conn = self._checkout(origin)
+        if conn is not None:
+            try:
+                started = time.perf_counter()
+                response = self._send(conn, parsed, host_header)
+                hop["response_ms"] = (time.perf_counter() - started) * 1000
+                hop["reused_connection"] = True
+                self._count("connections_reused")
+                return response, conn
+            except (OSError, http.client.HTTPException):
+                conn.close()
+
+        timing = {"dns_ms": 0.0, "connect_ms": 0.0, "tls_ms": 0.0}
+        conn = self._connect(origin, timing)
+        hop.update(timing)
+        try:
+            started = time.perf_counter()
+            response = self._send(conn, parsed, host_header)
+        except BaseException:
+            conn.close()
+            raise
+        hop["response_ms"] = (time.perf_counter() - started) * 1000
+        return response, conn
+
+    def _release(self, origin: tuple, conn, response) -> None:
+        """Return the connection to the pool if the response can be drained cheaply, else close it."""
+        try:
+            length = response.getheader("Content-Length")
+            if (
+                not response.will_close
+                and length is not None
+                and length.isdigit()
+                and int(length) <= MAX_DRAIN_BYTES
+            ):
+                response.read()
+                self._checkin(origin, conn)
+                return
+        except (OSError, http.client.HTTPException):
+            pass
+        conn.close()
+
+    def resolve(self, url: str, threshold_ms: float = DEFAULT_THRESHOLD_MS) -> dict:
+        """
+        Follow a URL's redirect chain to its final URL.
+
+        Returns:
+            Dictionary with url, final_url, status, hops (see hop()),
+            hop_count, total_ms (time this chain spent; hop cache hits
+            cost next to nothing), cold_ms (first-visit estimate),
+            slowest_hop, slow and error
+        """
+        if "://" not in url:
+            url = f"https://{url}"
+        chain = {
+            "url": url,
+            "final_url": None,
+            "status": None,
+            "hops": [],
+            "hop_count": 0,
+            "total_ms": 0.0,
+            "cold_ms": 0.0,
+            "slowest_hop": None,
+            "slow": False,
+            "error": None,
+        }
+        seen = set()
+        origins = {}
+        current = url
+        while True:
+            if current in seen:
+                chain["error"] = f"Redirect loop at {current}"
+                break
+            if len(chain["hops"]) > self.max_hops:
+                chain["error"] = f"Too many redirects (max {self.max_hops})"
+                break
+            seen.add(current)
+            hop = self.hop(current)
+            chain["hops"].append(hop)
+            if hop["error"]:
+                chain["error"] = hop["error"]
+                break
+            parsed = urlsplit(current)
+            origin = (parsed.scheme.lower(), (parsed.hostname or "").lower(),
+                      parsed.port or _DEFAULT_PORTS.get(parsed.scheme.lower()))
+            origins.setdefault(origin, self.setup_cost(origin))
+            if not hop["location"]:
+                chain["final_url"] = current
+                chain["status"] = hop["status"]
+                break
+            current = hop["location"]
+
+        chain["hop_count"] = max(0, len(chain["hops"]) - 1)
+        chain["total_ms"] = round(sum(h["total_ms"] or 0 for h in chain["hops"]), 1)
+        chain["cold_ms"] = round(
+            sum(h["response_ms"] or 0 for h in chain["hops"])
+            + sum(sum(cost.values()) for cost in origins.values()),
+            1,
+        )
+        redirects = chain["hops"][:-1] if chain["final_url"] else chain["hops"]
+        if redirects:
+            slowest = max(redirects, key=lambda h: h["total_ms"] or 0)
+            chain["slowest_hop"] = {"url": slowest["url"], "total_ms": slowest["total_ms"]}
+        chain["slow"] = chain["cold_ms"] > threshold_ms
+        return chain
+
+    def close(self) -> None:
+        with self._lock:
+            idle, self._idle = self._idle, {}
+        for conns in idle.values():
+            for conn in conns:
+                conn.close()
+
+
+def iter_resolve(
+    urls: list,
+    workers: int = 32,
+    threshold_ms: float = DEFAULT_THRESHOLD_MS,
+    resolver: RedirectResolver = None,
+    **resolver_options,
+):
+    """
+    Resolve many redirect chains concurrently, yielding results as they complete.
+
+    All workers share one RedirectResolver (its DNS, connection and hop
+    caches); requests against any single host are limited to its per_host.
+    """
+    from concurrent.futures import ThreadPoolExecutor, as_completed
+
+    own = resolver is None
+    resolver = resolver or RedirectResolver(**resolver_options)
+    try:
+        with ThreadPoolExecutor(max_workers=max(1, workers)) as pool:
+            futures = [pool.submit(resolver.resolve, url, threshold_ms) for url in urls]
+            for future in as_completed(futures):
+                yield future.result()
+    finally:
+        if own:
+            resolver.close()
+
+
+def print_chain(chain: dict) -> None:
+    flag = "SLOW" if chain["slow"] else "ok"
+    print(f"[{flag}] {chain['url']} -> {chain['final_url'] or 'unresolved'} "
+          f"({chain['hop_count']} redirects, cold {chain['cold_ms']}ms, measured {chain['total_ms']}ms)")
+    for hop in chain["hops"]:
+        if hop["error"]:
+            print(f"    {hop['url']}: {hop['error']}")
+            continue
+        note = " cached" if hop["cached"] else " reused" if hop["reused_connection"] else ""
+        print(f"    {hop['status']} {hop['url'][:100]}  dns={hop['dns_ms']} connect={hop['connect_ms']} "
+              f"tls={hop['tls_ms']} response={hop['response_ms']}ms{note}")
+    if chain["error"]:
+        print(f"    Error: {chain['error']}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Resolve ad final URL redirect chains with per-hop timing")
+    parser.add_argument("url", nargs="?", help="URL to resolve")
+    parser.add_argument("--batch", "-b", metavar="FILE", help="File with one URL per line ('-' for stdin)")
+    parser.add_argument("--threshold-ms", type=float, default=DEFAULT_THRESHOLD_MS,
+                        help="Flag chains whose first-visit latency exceeds this")
+    parser.add_argument("--max-hops", type=int, default=DEFAULT_MAX_HOPS, help="Maximum redirects to follow")
+    parser.add_argument("--timeout", "-t", type=float, default=10, help="Per-hop timeout in seconds")
+    parser.add_argument("--method", choices=["GET", "HEAD"], default="GET",
+                        help="Request method (GET also detects meta refresh redirects)")
+    parser.add_argument("--workers", "-w", type=int, default=32, help="Chains resolved at once (batch mode)")
+    parser.add_argument("--per-host", type=int, default=8, help="Max requests in flight per host")
+    parser.add_argument("--jsonl", metavar="FILE",
+                        help="Stream one JSON line per chain as it completes ('-' for stdout; batch mode)")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if bool(args.url) == bool(args.batch):
+        parser.error("provide either a URL or --batch FILE")
+
+    resolver = RedirectResolver(
+        timeout=args.timeout, max_hops=args.max_hops, method=args.method, per_host=args.per_host
+    )
+    if args.url:
+        chain = resolver.resolve(args.url, threshold_ms=args.threshold_ms)
+        resolver.close()
+        if args.json:
+            print(json.dumps(chain, indent=2))
+        else:
+            print_chain(chain)
+        return
+
+    from jsonl_output import JsonlWriter
+
+    out = JsonlWriter(args.jsonl) if args.jsonl else None
+    urls = read_urls(args.batch)
+    started = time.perf_counter()
+    chains = []
+    summary = {"chains": 0, "slow": 0, "errors": 0, "redirects": 0}
+    for chain in iter_resolve(urls, workers=args.workers, threshold_ms=args.threshold_ms, resolver=resolver):
+        summary["chains"] += 1
+        summary["slow"] += chain["slow"]
+        summary["errors"] += bool(chain["error"])
+        summary["redirects"] += chain["hop_count"]
+        if out:
+            out.write(chain, key=chain["url"])
+        elif args.json:
+            chains.append(chain)
+        elif chain["slow"] or chain["error"]:
+            print_chain(chain)
+    resolver.close()
+    if out:
+        out.close()
+    elapsed = time.perf_counter() - started
+    summary["elapsed_s"] = round(elapsed, 2)
+    summary["chains_per_sec"] = round(summary["chains"] / elapsed, 2) if elapsed > 0 else None
+    summary["cache"] = resolver.stats
+
+    if args.json and not out:
+        print(json.dumps({"results": chains, "stats": summary}, indent=2))
+    else:
+        print(f"\nResolved {summary['chains']} chains ({summary['redirects']} redirects, {summary['slow']} over "
+              f"{args.threshold_ms:g}ms, {summary['errors']} errors) in {summary['elapsed_s']}s — "
+              f"{summary['chains_per_sec']} chains/sec", file=sys.stderr if out else sys.stdout)
+        print(f"Cache: {resolver.stats}", file=sys.stderr if out else sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
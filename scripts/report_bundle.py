@@ -0,0 +1,251 @@
+#!/usr/bin/env python3
+"""
+Write an audit report as a compact bundle the dashboard can open instantly.
+
+A monolithic AuditReport JSON (see dashboard/src/data/sample-report.json)
+carries every check of every platform, and the dashboard derives its
+counts from them on every render. A bundle splits it into:
+
+    index.json               report metadata, platform and category scores,
+                             per-platform check counts, grade distribution,
+                             budget, benchmarks, creative alerts, top issues
+                             and quick wins (tagged with their platform)
+    checks-<platform>.json.gz
+                             that platform's checks in columnar form,
+                             gzip-compressed (plain .json with --no-gzip)
+
+The dashboard loads index.json up front and fetches a platform's shard
+only when its checks are shown. Columns with few distinct values
+(category, severity, status, estimatedTime) are dictionary-encoded:
+{"dict": [...], "codes": [...]}.
+
+Usage:
+    python report_bundle.py report.json --output bundle/
+    python report_bundle.py report.json --output bundle/ --rescore
+    python report_bundle.py dashboard/src/data/sample-report.json -o /tmp/bundle --no-gzip --json
+"""
+
+import argparse
+import gzip
+import json
+import os
+import sys
+
+from scoring import get_grade, rows_from_report, score_rows
+
+BUNDLE_FORMAT = "claude-ads-report-bundle"
+BUNDLE_VERSION = 1
+INDEX_NAME = "index.json"
+
+CHECK_FIELDS = (
+    "id", "check", "category", "severity", "status",
+    "finding", "recommendation", "estimatedTime", "isQuickWin",
+)
+DICT_COLUMNS = ("category", "severity", "status", "estimatedTime")
+_SEVERITY_ORDER = {"Critical": 0, "High": 1, "Medium": 2, "Low": 3}
+_STATUS_COUNTS = {"PASS": "passed", "WARNING": "warnings", "FAIL": "failed", "N/A": "na"}
+TOP_ISSUES = 5
+
+
+def columnar_checks(checks: list) -> dict:
+    """Checks as one array per field, dictionary-encoding the low-cardinality ones."""
+    columns = {}
+    for field in CHECK_FIELDS:
+        values = [check.get(field) for check in checks]
+        if all(value is None for value in values):
+            continue
+        if field in DICT_COLUMNS:
+            codes = {}
+            columns[field] = {
+                "codes": [codes.setdefault(value, len(codes)) for value in values],
+            }
+            columns[field]["dict"] = list(codes)
+        else:
+            columns[field] = values
+    return {"count": len(checks), "columns": columns}
+
+
+def checks_from_columnar(shard: dict) -> list:
+    """Inverse of columnar_checks()."""
+    columns = {}
+    for field, column in shard["columns"].items():
+        if isinstance(column, dict):
+            columns[field] = [column["dict"][code] for code in column["codes"]]
+        else:
+            columns[field] = column
+    return [
+        {field: values[i] for field, values in columns.items() if values[i] is not None}
+        for i in range(shard["count"])
+    ]
+
+
+def check_counts(checks: list) -> dict:
+    counts = {"total": len(checks), "passed": 0, "warnings": 0, "failed": 0, "na": 0}
+    for check in checks:
+        counts[_STATUS_COUNTS.get(check["status"], "na")] += 1
+    return counts
+
+
+def _tagged(checks: list, platform: str) -> list:
+    return [{**check, "platform": platform} for check in checks]
+
+
+def _by_severity(items: list) -> list:
+    return sorted(items, key=lambda check: _SEVERITY_ORDER.get(check["severity"], len(_SEVERITY_ORDER)))
+
+
+def _locate(checks: list, platform_of: dict) -> list:
+    """Tag report-level checks (topIssues, quickWins) with the platform they belong to."""
+    return [
+        check if check.get("platform") else {**check, "platform": platform_of.get(check["id"])}
+        for check in checks
+    ]
+
+
+def rescore(report: dict) -> dict:
+    """A copy of the report with platform, category and total scores recomputed from its checks."""
+    scores = score_rows(rows_from_report(report))
+    categories = {(c["platform"], c["name"]): c for c in scores["categories"]}
+    platforms = {p["platform"]: p for p in scores["platforms"]}
+
+    rescored = []
+    for platform in report.get("platforms") or []:
+        scored = platforms.get(platform["platform"])
+        if scored is None:
+            rescored.append(platform)
+            continue
+        updated = []
+        for category in platform["categories"]:
+            computed = categories.get((platform["platform"], category["name"]))
+            if computed:
+                category = {
+                    **category,
+                    "score": round(computed["score"]),
+                    **{key: computed[key] for key in ("totalChecks", "passed", "warnings", "failed", "na")},
+                }
+            updated.append(category)
+        rescored.append({
+            **platform, "score": round(scored["score"]), "grade": scored["grade"], "categories": updated,
+        })
+
+    report = {**report, "platforms": rescored}
+    if scores["accounts"]:
+        report["totalScore"] = round(scores["accounts"][0]["score"])
+        report["totalGrade"] = get_grade(report["totalScore"])
+    return report
+
+
+def build_bundle(report: dict, compress: bool = True) -> tuple:
+    """
+    Split an AuditReport into a bundle index and per-platform check shards.
+
+    Returns:
+        (index, shards): the index dict and {file name: columnar shard}
+    """
+    suffix = ".json.gz" if compress else ".json"
+    platform_of = {}
+    shards = {}
+    platforms = []
+    grades = {"platforms": {}, "categories": {}}
+    all_checks = []
+
+    for platform in report.get("platforms") or []:
+        checks = platform.get("checks") or []
+        name = f"checks-{platform['platform']}{suffix}"
+        shards[name] = columnar_checks(checks)
+        for check in checks:
+            platform_of.setdefault(check["id"], platform["platform"])
+        all_checks += _tagged(checks, platform["platform"])
+
+        grades["platforms"][platform["grade"]] = grades["platforms"].get(platform["grade"], 0) + 1
+        for category in platform["categories"]:
+            grade = category.get("grade") or get_grade(category["score"])
+            grades["categories"][grade] = grades["categories"].get(grade, 0) + 1
+
+        summary = {key: value for key, value in platform.items() if key != "checks"}
+        summary["counts"] = check_counts(checks)
+        summary["shard"] = name
+        platforms.append(summary)
+
+    top_issues = report.get("topIssues") or _by_severity(
+        [check for check in all_checks if check["status"] == "FAIL"]
+    )[:TOP_ISSUES]
+    quick_wins = report.get("quickWins") or _by_severity(
+        [check for check in all_checks if check.get("isQuickWin")]
+    )
+
+    index = {
+        "format": BUNDLE_FORMAT,
+        "version": BUNDLE_VERSION,
+        **{key: value for key, value in report.items() if key not in ("platforms", "topIssues", "quickWins")},
+        "platforms": platforms,
+        "counts": check_counts(all_checks),
+        "grades": grades,
+        "topIssues": _locate(top_issues, platform_of),
+        "quickWins": _locate(quick_wins, platform_of),
+    }
+    return index, shards
+
+
+def write_bundle(report: dict, output_dir: str, compress: bool = True) -> dict:
+    """
+    Write index.json and the check shards of a report to output_dir.
+
+    Returns:
+        Dictionary with files ({name: bytes}), index_bytes, shard_bytes and
+        monolithic_bytes (the report as one compact JSON)
+    """
+    index, shards = build_bundle(report, compress=compress)
+    os.makedirs(output_dir, exist_ok=True)
+    files = {}
+    for name, shard in shards.items():
+        data = json.dumps(shard, separators=(",", ":")).encode("utf-8")
+        if compress:
+            data = gzip.compress(data, compresslevel=9, mtime=0)
+        with open(os.path.join(output_dir, name), "wb") as f:
+            f.write(data)
+        files[name] = len(data)
+    data = json.dumps(index, separators=(",", ":")).encode("utf-8")
+    with open(os.path.join(output_dir, INDEX_NAME), "wb") as f:
+        f.write(data)
+    files[INDEX_NAME] = len(data)
+    return {
+        "files": files,
+        "index_bytes": files[INDEX_NAME],
+        "shard_bytes": sum(size for name, size in files.items() if name != INDEX_NAME),
+        "monolithic_bytes": len(json.dumps(report, separators=(",", ":")).encode("utf-8")),
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Write an audit report as a lazily loaded dashboard bundle")
+    parser.add_argument("report", help="AuditReport JSON file ('-' for stdin)")
+    parser.add_argument("--output", "-o", required=True, help="Bundle directory")
+    parser.add_argument("--no-gzip", action="store_true", help="Write plain .json shards")
+    parser.add_argument("--rescore", action="store_true",
+                        help="Recompute platform, category and total scores from the checks")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if args.report == "-":
+        report = json.load(sys.stdin)
+    else:
+        with open(args.report, encoding="utf-8") as f:
+            report = json.load(f)
+    if args.rescore:
+        report = rescore(report)
+
+    stats = write_bundle(report, args.output, compress=not args.no_gzip)
+    if args.json:
+        print(json.dumps(stats, indent=2))
+        return
+    print(f"Wrote bundle to {args.output}")
+    for name, size in stats["files"].items():
+        print(f"  {name:32s} {size / 1024:8.1f}KB")
+    print(f"Index {stats['index_bytes'] / 1024:.1f}KB + shards {stats['shard_bytes'] / 1024:.1f}KB "
+          f"(monolithic report: {stats['monolithic_bytes'] / 1024:.1f}KB)")
+
+
+if __name__ == "__main__":
+    main()
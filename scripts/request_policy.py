@@ -0,0 +1,192 @@
+#!/usr/bin/env python3
+"""
+Request blocking and accounting profiles for the Playwright landing page scripts.
+
+Profiles:
+    faithful      block nothing; account for every request so page weight,
+                  request count and third-party share can be graded
+    content-only  abort images, media, fonts and known ad/analytics hosts for
+                  fast content checks (LCP, CLS and page weight are then not
+                  representative and are not graded)
+
+Accounting listens to the browser context's request events, so it covers
+every page, frame (out-of-process iframes included) and worker of the
+context, not just the page's own target. The encoded (on-the-wire) size of
+each finished request, headers and body, is read once the page is done, in
+one concurrent batch. Blocking uses a context route that aborts matching
+requests and falls back to any other route (e.g. response replay).
+
+Usage (async API; the sync API uses settle_sync()):
+    ledger = RequestLedger(url)
+    ledger.attach(context)
+    await context.route("**/*", async_route_handler("content-only"))
+    ...
+    await ledger.settle()
+    ledger.summary()
+"""
+
+from url_list import host_of
+
+PROFILES = ("faithful", "content-only")
+
+BLOCKED_RESOURCE_TYPES = {
+    "content-only": {"image", "media", "font"},
+}
+
+# Ad, analytics and tag-manager hosts that never affect page content. Chat
+# vendors are deliberately absent: the chat-widget check needs their markup.
+AD_ANALYTICS_HOSTS = [
+    "doubleclick.net", "googlesyndication.com", "googleadservices.com",
+    "googletagmanager.com", "google-analytics.com", "analytics.google.com",
+    "connect.facebook.net", "analytics.tiktok.com", "bat.bing.com",
+    "snap.licdn.com", "px.ads.linkedin.com", "ads.linkedin.com",
+    "static.ads-twitter.com", "sc-static.net", "ct.pinterest.com",
+    "hotjar.com", "clarity.ms", "cdn.segment.com", "mixpanel.com",
+    "fullstory.com", "quantserve.com", "scorecardresearch.com", "criteo.com",
+    "taboola.com", "outbrain.com", "adnxs.com", "amazon-adsystem.com",
+]
+
+BLOCKED_HOSTS = {
+    "content-only": AD_ANALYTICS_HOSTS,
+}
+
+# Second-level labels under which registrations happen (example.co.uk)
+_SECOND_LEVEL = {"co", "com", "net", "org", "gov", "edu", "ac", "ne", "or"}
+
+
+def site_of(host: str) -> str:
+    """Approximate registrable domain of a host (example.co.uk, example.com)."""
+    host = host.split(":")[0].lower().rstrip(".")
+    labels = host.split(".")
+    if len(labels) >= 3 and len(labels[-1]) == 2 and labels[-2] in _SECOND_LEVEL:
+        return ".".join(labels[-3:])
+    return ".".join(labels[-2:])
+
+
+def _host_matches(host: str, patterns) -> bool:
+    return any(host == p or host.endswith("." + p) for p in patterns)
+
+
+def should_block(profile: str, resource_type: str, url: str) -> bool:
+    """True if `profile` aborts a request of this resource type and URL."""
+    if resource_type in BLOCKED_RESOURCE_TYPES.get(profile, ()):
+        return True
+    return _host_matches(host_of(url).split(":")[0], BLOCKED_HOSTS.get(profile, ()))
+
+
+def blocks_anything(profile: str) -> bool:
+    return bool(BLOCKED_RESOURCE_TYPES.get(profile) or BLOCKED_HOSTS.get(profile))
+
+
+def async_route_handler(profile: str):
+    """context.route("**/*") handler for the async API."""
+    async def handler(route):
+        request = route.request
+        if should_block(profile, request.resource_type, request.url):
+            await route.abort("blockedbyclient")
+        else:
+            await route.fallback()
+    return handler
+
+
+def sync_route_handler(profile: str):
+    """context.route("**/*") handler for the sync API."""
+    def handler(route):
+        request = route.request
+        if should_block(profile, request.resource_type, request.url):
+            route.abort("blockedbyclient")
+        else:
+            route.fallback()
+    return handler
+
+
+class RequestLedger:
+    """Per-page request accounting fed by a browser context's request events."""
+
+    # Driver calls request.sizes() makes: the request's response, then its sizes
+    SIZE_ROUND_TRIPS = 2
+
+    def __init__(self, page_url: str):
+        self.site = site_of(host_of(page_url))
+        self.count = 0
+        self.failed = 0
+        self.blocked = 0
+        self.transfer_bytes = 0
+        self.third_party_bytes = 0
+        self.third_party_requests = 0
+        self.third_party_scripts = 0
+        self._finished = []
+
+    def attach(self, context) -> None:
+        """Subscribe to the request events of a browser context (before its pages load)."""
+        context.on("request", self._on_request)
+        context.on("requestfinished", self._finished.append)
+        context.on("requestfailed", self._on_failed)
+
+    def _on_request(self, request) -> None:
+        # Each redirect hop is a request of its own, with its own bytes
+        self.count += 1
+
+    def _is_third_party(self, url: str) -> bool:
+        host = host_of(url)
+        return bool(host) and url.startswith("http") and site_of(host) != self.site
+
+    def _add(self, request, sizes) -> None:
+        if isinstance(sizes, BaseException):
+            return  # The context went away before the sizes were read
+        size = sizes["responseHeadersSize"] + max(0, sizes["responseBodySize"])
+        self.transfer_bytes += size
+        if self._is_third_party(request.url):
+            self.third_party_bytes += size
+            self.third_party_requests += 1
+            if request.resource_type == "script":
+                self.third_party_scripts += 1
+
+    def _on_failed(self, request) -> None:
+        # Route aborts, CSP and other browser-side blocks
+        if "ERR_BLOCKED_BY" in (request.failure or ""):
+            self.blocked += 1
+        else:
+            self.failed += 1
+
+    async def settle(self) -> int:
+        """
+        Read the sizes of the requests finished so far (async API); call before summary().
+
+        Returns:
+            Number of driver calls made
+        """
+        import asyncio
+
+        finished = self._finished[:]
+        del self._finished[:]
+        sizes = await asyncio.gather(*(request.sizes() for request in finished), return_exceptions=True)
+        for request, size in zip(finished, sizes):
+            self._add(request, size)
+        return len(finished) * self.SIZE_ROUND_TRIPS
+
+    def settle_sync(self) -> int:
+        """settle() for the sync Playwright API."""
+        finished = self._finished[:]
+        del self._finished[:]
+        for request in finished:
+            try:
+                size = request.sizes()
+            except Exception as e:
+                size = e
+            self._add(request, size)
+        return len(finished) * self.SIZE_ROUND_TRIPS
+
+    def summary(self) -> dict:
+        return {
+            "count": self.count,
+            "failed": self.failed,
+            "blocked": self.blocked,
+            "transfer_bytes": self.transfer_bytes,
+            "third_party_bytes": self.third_party_bytes,
+            "third_party_share": (
+                round(self.third_party_bytes / self.transfer_bytes, 4) if self.transfer_bytes else None
+            ),
+            "third_party_requests": self.third_party_requests,
+            "third_party_scripts": self.third_party_scripts,
+        }
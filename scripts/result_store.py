@@ -0,0 +1,386 @@
+#!/usr/bin/env python3
+"""
+Incremental re-audit: reuse stored landing page results for unchanged pages.
+
+A SQLite store keyed by the page's final URL (after redirects) keeps, per
+page, a hash of the normalized HTML, the analyze_landing() result, its
+grade_landing() grades, the response validators (ETag / Last-Modified) and
+when it was analyzed. A re-audit first checks every URL cheaply over
+pooled connections: a conditional GET that answers 304, or a body whose
+normalized hash matches the stored one, means the page is unchanged and
+its stored result is reused. Only new, changed or expired entries (older
+than max_age_days) go through the full browser analysis.
+
+The hash covers the HTML document only; changes to scripts, styles or
+images that leave the HTML untouched are picked up when the entry expires.
+
+Usage:
+    python result_store.py --batch urls.txt
+    python result_store.py --batch urls.txt --max-age-days 7 --json
+    python result_store.py --batch urls.txt --force        # re-analyze everything
+    python result_store.py --stats
+"""
+
+import argparse
+import copy
+import hashlib
+import json
+import os
+import re
+import sqlite3
+import threading
+import time
+
+from http_cache import header_value, normalize_url
+
+DEFAULT_STORE_PATH = os.path.join("~", ".cache", "claude-ads", "results.sqlite3")
+DEFAULT_MAX_AGE_DAYS = 30
+
+_COMMENT = re.compile(r"<!--.*?-->", re.DOTALL)
+# Per-response values that change on every request without the page changing.
+_VOLATILE_ATTRS = re.compile(r"""\s(?:nonce|integrity)\s*=\s*(?:"[^"]*"|'[^']*'|[^\s>]+)""", re.IGNORECASE)
+_TOKEN_TAG = re.compile(
+    r"""<(?:input|meta)\b[^>]*(?:csrf|xsrf|authenticity_token|_token|__requestverificationtoken)[^>]*>""",
+    re.IGNORECASE,
+)
+_WHITESPACE = re.compile(r"\s+")
+_TAG_END = re.compile(r"\s+(/?>)")
+
+
+def content_hash(html: str) -> str:
+    """sha256 of the HTML with comments, nonces, CSRF tokens and whitespace runs normalized away."""
+    html = _COMMENT.sub("", html or "")
+    html = _VOLATILE_ATTRS.sub("", html)
+    html = _TOKEN_TAG.sub("", html)
+    html = _TAG_END.sub(r"\1", _WHITESPACE.sub(" ", html)).strip()
+    return hashlib.sha256(html.encode("utf-8")).hexdigest()
+
+
+class ResultStore:
+    """SQLite store of analyzed landing pages keyed by normalized final URL."""
+
+    def __init__(self, path: str = DEFAULT_STORE_PATH):
+        self.path = os.path.expanduser(path)
+        os.makedirs(os.path.dirname(self.path) or ".", exist_ok=True)
+
+        self._lock = threading.Lock()
+        self._db = sqlite3.connect(self.path, check_same_thread=False)
+        self._db.execute("PRAGMA journal_mode=WAL")
+        self._db.executescript("""
+            CREATE TABLE IF NOT EXISTS entries (
+                key TEXT PRIMARY KEY,
+                final_url TEXT NOT NULL,
+                content_hash TEXT NOT NULL,
+                etag TEXT,
+                last_modified TEXT,
+                result TEXT NOT NULL,
+                grades TEXT NOT NULL,
+                analyzed_at REAL NOT NULL,
+                checked_at REAL NOT NULL
+            );
+            CREATE TABLE IF NOT EXISTS aliases (
+                requested TEXT PRIMARY KEY,
+                key TEXT NOT NULL
+            );
+        """)
+
+    def close(self) -> None:
+        with self._lock:
+            self._db.close()
+
+    def lookup(self, url: str):
+        """
+        Return the stored entry for a requested or final URL, or None.
+
+        The entry dict has key, final_url, content_hash, etag, last_modified,
+        result, grades, analyzed_at and checked_at.
+        """
+        requested = normalize_url(url)
+        with self._lock:
+            row = self._db.execute(
+                "SELECT e.key, e.final_url, e.content_hash, e.etag, e.last_modified, e.result, "
+                "e.grades, e.analyzed_at, e.checked_at FROM entries e "
+                "WHERE e.key = COALESCE((SELECT key FROM aliases WHERE requested = ?), ?)",
+                (requested, requested),
+            ).fetchone()
+        if row is None:
+            return None
+        return {
+            "key": row[0],
+            "final_url": row[1],
+            "content_hash": row[2],
+            "etag": row[3],
+            "last_modified": row[4],
+            "result": json.loads(row[5]),
+            "grades": json.loads(row[6]),
+            "analyzed_at": row[7],
+            "checked_at": row[8],
+        }
+
+    def conditional_headers(self, entry) -> dict:
+        """If-None-Match / If-Modified-Since headers to check an entry for changes."""
+        headers = {}
+        if entry and entry["etag"]:
+            headers["If-None-Match"] = entry["etag"]
+        if entry and entry["last_modified"]:
+            headers["If-Modified-Since"] = entry["last_modified"]
+        return headers
+
+    def touch(self, key: str) -> None:
+        """Record that an entry was checked and found unchanged."""
+        with self._lock:
+            self._db.execute("UPDATE entries SET checked_at = ? WHERE key = ?", (time.time(), key))
+            self._db.commit()
+
+    def save(self, requested_url: str, fetched: dict, result: dict, grades: dict, html_hash: str) -> None:
+        """Store an analysis under the final URL of `fetched` (a fetch_page() result)."""
+        final_url = fetched.get("url") or requested_url
+        key = normalize_url(final_url)
+        headers = fetched.get("headers") or {}
+        now = time.time()
+        with self._lock:
+            self._db.execute(
+                "INSERT OR REPLACE INTO entries VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)",
+                (
+                    key,
+                    final_url,
+                    html_hash,
+                    header_value(headers, "ETag"),
+                    header_value(headers, "Last-Modified"),
+                    json.dumps(result),
+                    json.dumps(grades),
+                    now,
+                    now,
+                ),
+            )
+            self._db.execute(
+                "INSERT OR REPLACE INTO aliases VALUES (?, ?)", (normalize_url(requested_url), key)
+            )
+            self._db.commit()
+
+    def stats(self) -> dict:
+        with self._lock:
+            entries, oldest, newest = self._db.execute(
+                "SELECT COUNT(*), MIN(analyzed_at), MAX(analyzed_at) FROM entries"
+            ).fetchone()
+        return {
+            "entries": entries,
+            "oldest_analyzed_at": oldest,
+            "newest_analyzed_at": newest,
+            "size_bytes": os.path.getsize(self.path),
+        }
+
+
+def check_freshness(entry, fetched: dict, max_age_s: float, force: bool = False):
+    """
+    Decide whether a page needs the full browser analysis.
+
+    Returns:
+        (reason, html_hash): reason is None when the stored result can be
+        reused, otherwise one of new, forced, expired, changed or
+        check_failed. html_hash is the normalized hash of the current HTML
+        (the stored one after a 304), or None if the check failed.
+    """
+    if fetched["status_code"] == 304 and entry:
+        html_hash = entry["content_hash"]
+    elif fetched["error"] or fetched["content"] is None:
+        html_hash = None
+    else:
+        html_hash = content_hash(fetched["content"])
+
+    if entry is None:
+        return "new", html_hash
+    if force:
+        return "forced", html_hash
+    if time.time() - entry["analyzed_at"] > max_age_s:
+        return "expired", html_hash
+    if html_hash is None:
+        return "check_failed", html_hash
+    if html_hash != entry["content_hash"] or normalize_url(fetched["url"]) != entry["key"]:
+        return "changed", html_hash
+    return None, html_hash
+
+
+def _per_input(result: dict, sources: list):
+    """Yield a result once per input URL it answers; inputs that normalize alike are checked once."""
+    for index, url in enumerate(sources):
+        if index:
+            result = copy.deepcopy(result)
+            result["url"] = url
+        yield result
+
+
+def iter_reaudit(
+    urls: list,
+    store: ResultStore,
+    max_age_days: float = DEFAULT_MAX_AGE_DAYS,
+    force: bool = False,
+    workers: int = 32,
+    per_host: int = 4,
+    render_options: dict = None,
+):
+    """
+    Re-audit many URLs, yielding results as they become available.
+
+    Unchanged pages are yielded first, straight from the store; the rest are
+    analyzed on the shared browser pool of analyze_landing.iter_batch(),
+    graded and stored. Every result carries result["reaudit"] with status
+    (skipped or analyzed), reason and analyzed_at, and result["grades"].
+    """
+    from fetch_page import iter_fetch
+    from static_landing import grade_landing
+
+    requested = {}  # normalized URL -> input URLs that normalize to it
+    for url in urls:
+        requested.setdefault(normalize_url(url), []).append(url)
+    entries = {key: store.lookup(sources[0]) for key, sources in requested.items()}
+    max_age_s = max_age_days * 86400
+
+    pending = {}
+    for fetched in iter_fetch(
+        [sources[0] for sources in requested.values()],
+        workers=workers,
+        per_host=per_host,
+        headers_for=lambda url: store.conditional_headers(entries.get(normalize_url(url))),
+    ):
+        key = normalize_url(fetched["requested_url"])
+        entry = entries.get(key)
+        reason, html_hash = check_freshness(entry, fetched, max_age_s, force=force)
+        if reason is None:
+            store.touch(entry["key"])
+            result = dict(entry["result"])
+            result["grades"] = entry["grades"]
+            result["reaudit"] = {
+                "status": "skipped",
+                "reason": "not_modified" if fetched["status_code"] == 304 else "same_hash",
+                "analyzed_at": entry["analyzed_at"],
+            }
+            yield from _per_input(result, requested[key])
+        else:
+            pending[key] = (fetched, reason, html_hash)
+
+    if not pending:
+        return
+
+    import asyncio
+    from analyze_landing import iter_batch
+
+    loop = asyncio.new_event_loop()
+    batch = iter_batch([requested[key][0] for key in pending], **(render_options or {}))
+    try:
+        while True:
+            try:
+                result = loop.run_until_complete(batch.__anext__())
+            except StopAsyncIteration:
+                break
+            key = normalize_url(result["url"])
+            fetched, reason, html_hash = pending[key]
+            grades = grade_landing(result)
+            # Errored analyses and pages whose HTML could not be hashed are
+            # not stored, so the next run analyzes them again.
+            if not result["error"] and html_hash:
+                store.save(result["url"], fetched, result, grades, html_hash)
+            result["grades"] = grades
+            result["reaudit"] = {"status": "analyzed", "reason": reason, "analyzed_at": time.time()}
+            yield from _per_input(result, requested[key])
+    finally:
+        loop.run_until_complete(batch.aclose())
+        loop.close()
+
+
+def reaudit(urls: list, store: ResultStore, on_result=None, **options) -> dict:
+    """
+    Run iter_reaudit() to completion.
+
+    Returns:
+        Dictionary with results and stats (pages, skipped, analyzed, errors,
+        reasons, elapsed_s, pages_per_sec)
+    """
+    results = []
+    reasons = {}
+    started = time.perf_counter()
+    for result in iter_reaudit(urls, store, **options):
+        results.append(result)
+        if result["reaudit"]["status"] == "analyzed":
+            reasons[result["reaudit"]["reason"]] = reasons.get(result["reaudit"]["reason"], 0) + 1
+        if on_result:
+            on_result(result)
+    elapsed = time.perf_counter() - started
+
+    skipped = sum(1 for r in results if r["reaudit"]["status"] == "skipped")
+    return {
+        "results": results,
+        "stats": {
+            "pages": len(results),
+            "skipped": skipped,
+            "analyzed": len(results) - skipped,
+            "errors": sum(1 for r in results if r["error"]),
+            "reasons": reasons,
+            "elapsed_s": round(elapsed, 2),
+            "pages_per_sec": round(len(results) / elapsed, 2) if elapsed > 0 else None,
+        },
+    }
+
+
+def print_reaudit_line(result: dict) -> None:
+    """Print a one-line summary of a re-audit result."""
+    reaudit_info = result["reaudit"]
+    tag = "skip" if reaudit_info["status"] == "skipped" else reaudit_info["reason"]
+    if result["error"]:
+        print(f"[{tag}] {result['url']}: ERROR {result['error']}")
+        return
+    failed = [check for check, grade in result["grades"].items() if grade == "FAIL"]
+    print(f"[{tag}] {result['url']}" + (f" FAIL: {', '.join(failed)}" if failed else ""))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Re-audit landing pages, reusing results for unchanged pages")
+    parser.add_argument("--batch", "-b", metavar="FILE", help="File with one URL per line ('-' for stdin)")
+    parser.add_argument("--store", default=DEFAULT_STORE_PATH, help="Results store path")
+    parser.add_argument("--max-age-days", type=float, default=DEFAULT_MAX_AGE_DAYS,
+                        help="Re-analyze entries older than this even if the HTML is unchanged")
+    parser.add_argument("--force", action="store_true", help="Re-analyze every page and refresh the store")
+    parser.add_argument("--stats", action="store_true", help="Print store statistics and exit")
+    parser.add_argument("--workers", "-w", type=int, default=32, help="Max freshness checks in flight")
+    parser.add_argument("--per-host", type=int, default=4, help="Max freshness checks in flight per host")
+    parser.add_argument("--browsers", type=int, default=2, help="Browser pool size for re-analysis")
+    parser.add_argument("--concurrency", "-c", type=int, default=8, help="Max pages analyzed at once")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    store = ResultStore(args.store)
+    try:
+        if args.stats:
+            print(json.dumps(store.stats(), indent=2))
+            return
+        if not args.batch:
+            parser.error("provide --batch FILE or --stats")
+
+        from url_list import read_urls
+
+        batch = reaudit(
+            read_urls(args.batch),
+            store,
+            max_age_days=args.max_age_days,
+            force=args.force,
+            workers=args.workers,
+            per_host=args.per_host,
+            render_options={"browsers": args.browsers, "concurrency": args.concurrency},
+            on_result=None if args.json else print_reaudit_line,
+        )
+    finally:
+        store.close()
+
+    stats = batch["stats"]
+    if args.json:
+        print(json.dumps(batch, indent=2))
+    else:
+        reasons = ", ".join(f"{n} {reason}" for reason, n in sorted(stats["reasons"].items()))
+        print(f"\nRe-audited {stats['pages']} pages: {stats['skipped']} skipped (unchanged), "
+              f"{stats['analyzed']} analyzed" + (f" ({reasons})" if reasons else "")
+              + f", {stats['errors']} errors in {stats['elapsed_s']}s")
+
+
+if __name__ == "__main__":
+    main()
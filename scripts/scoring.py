@@ -0,0 +1,449 @@
+#!/usr/bin/env python3
+"""
+Vectorized audit health scoring (ads/references/scoring-system.md).
+
+Scores check results in one NumPy pass per level, with the same rules as
+the dashboard's scoring.ts:
+
+    category score  = Σ(points × severity) / Σ(severity) × 100 over non-N/A
+                      checks (PASS 1, WARNING 0.5, FAIL 0; 0 if all N/A)
+    platform score  = Σ(category score × category weight) / Σ(category weight)
+    total score     = Σ(platform score × budget share) / Σ(budget share)
+    grade           = A ≥90, B ≥75, C ≥60, D ≥40, else F
+
+Input is one check per row with platform, category, severity and status,
+plus optional account (default ""), weight (category weight; defaults to
+CATEGORY_WEIGHTS) and budget_share (platform share of the account's budget;
+platforms count equally when absent). Rows are read from JSONL or CSV, or
+from an AuditReport JSON such as the dashboard's sample-report.json.
+
+A platform's score uses the categories that appear in its rows, as the
+dashboard does for the categories listed in a report.
+
+Usage:
+    python scoring.py checks.jsonl
+    python scoring.py checks.csv --json > scores.json
+    python scoring.py --report dashboard/src/data/sample-report.json
+    cat checks.jsonl | python scoring.py - --format jsonl
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import io
+import json
+import os
+import sys
+import time
+
+from core import lazy_import
+
+np = lazy_import("numpy")
+
+SEVERITY_MULTIPLIER = {
+    "Critical": 5.0,
+    "High": 3.0,
+    "Medium": 1.5,
+    "Low": 0.5,
+}
+
+# None = N/A, excluded from the possible points
+STATUS_POINTS = {
+    "PASS": 1.0,
+    "WARNING": 0.5,
+    "FAIL": 0.0,
+    "N/A": None,
+}
+
+GRADE_THRESHOLDS = [
+    (90, "A", "Excellent"),
+    (75, "B", "Good"),
+    (60, "C", "Needs Improvement"),
+    (40, "D", "Poor"),
+    (0, "F", "Critical"),
+]
+
+# Category weights per platform, with the category names the dashboard uses
+CATEGORY_WEIGHTS = {
+    "google": {
+        "Conversion Tracking": 0.25,
+        "Wasted Spend": 0.20,
+        "Account Structure": 0.15,
+        "Keywords & Quality Score": 0.15,
+        "Ads & Assets": 0.15,
+        "Settings & Targeting": 0.10,
+    },
+    "meta": {
+        "Pixel/CAPI Health": 0.30,
+        "Creative": 0.30,
+        "Account Structure": 0.20,
+        "Audience & Targeting": 0.20,
+    },
+    "linkedin": {
+        "Technical Setup": 0.25,
+        "Audience Quality": 0.25,
+        "Creative & Formats": 0.20,
+        "Lead Gen Forms": 0.15,
+        "Bidding & Budget": 0.15,
+    },
+    "tiktok": {
+        "Creative Quality": 0.30,
+        "Technical Setup": 0.25,
+        "Bidding & Learning": 0.20,
+        "Structure & Settings": 0.15,
+        "Performance": 0.10,
+    },
+    "microsoft": {
+        "Technical Setup": 0.25,
+        "Syndication & Bidding": 0.20,
+        "Structure & Audience": 0.20,
+        "Creative & Extensions": 0.20,
+        "Settings & Performance": 0.15,
+    },
+}
+
+# grade_landing() checks that are Google audit items (google-audit.md)
+LANDING_CHECKS = {
+    "G59_mobile_speed": ("G59", "High"),
+    "G60_relevance": ("G60", "High"),
+    "G61_schema": ("G61", "Medium"),
+}
+LANDING_CATEGORY = ("google", "Settings & Targeting")
+
+_GRADE_MINS = [float(t[0]) for t in reversed(GRADE_THRESHOLDS)]
+_GRADE_NAMES = [t[1] for t in reversed(GRADE_THRESHOLDS)]
+_LABELS = {grade: label for _, grade, label in GRADE_THRESHOLDS}
+
+
+def get_grade(score: float) -> str:
+    """Letter grade for a 0-100 score."""
+    for minimum, grade, _ in GRADE_THRESHOLDS:
+        if score >= minimum:
+            return grade
+    return "F"
+
+
+def grade_array(scores) -> np.ndarray:
+    """Letter grades for an array of scores."""
+    index = np.searchsorted(_GRADE_MINS, np.asarray(scores, dtype=np.float64), side="right") - 1
+    return np.array(_GRADE_NAMES)[np.clip(index, 0, len(_GRADE_NAMES) - 1)]
+
+
+def _factorize(values):
+    """
+    Integer codes for `values` numbered in order of first appearance.
+
+    Returns:
+        (codes array, unique values in first-appearance order)
+    """
+    values = np.asarray(values)
+    if values.dtype.kind in "iu":
+        uniques, first, inverse = np.unique(values, return_index=True, return_inverse=True)
+        order = np.argsort(first, kind="stable")
+        rank = np.empty_like(order)
+        rank[order] = np.arange(len(order))
+        return rank[inverse.reshape(-1)], uniques[order]
+    # Hashing beats sorting for strings
+    table = {}
+    codes = np.fromiter(
+        (table.setdefault(v, len(table)) for v in values.tolist()), dtype=np.int64, count=len(values)
+    )
+    uniques = np.empty(len(table), dtype=object)
+    uniques[:] = list(table)
+    return codes, uniques
+
+
+def _lookup(values: np.ndarray, table: dict, column: str) -> np.ndarray:
+    """Map a string array through `table` (None → NaN), rejecting unknown values."""
+    codes, uniques = _factorize(values)
+    unknown = [str(u) for u in uniques if u not in table]
+    if unknown:
+        raise ValueError(f"Unknown {column}: {unknown}. Choose from: {list(table)}")
+    mapped = np.array([np.nan if table[u] is None else table[u] for u in uniques], dtype=np.float64)
+    return mapped[codes]
+
+
+def _floats(values: list) -> np.ndarray:
+    return np.array([np.nan if v in (None, "") else float(v) for v in values], dtype=np.float64)
+
+
+def columns_from_rows(rows) -> dict:
+    """
+    Convert check dicts to the columnar arrays score_columns() takes.
+
+    Returns:
+        Dictionary of equal-length arrays: account, platform and category
+        (object arrays of str), multiplier (float), points (float, NaN for N/A), weight and
+        budget_share (float, NaN when not given)
+    """
+    rows = list(rows)
+    try:
+        platform = np.array([row["platform"] for row in rows], dtype=object)
+        category = np.array([row["category"] for row in rows], dtype=object)
+        severity = np.array([row["severity"] for row in rows], dtype=object)
+        status = np.array([row["status"] for row in rows], dtype=object)
+    except KeyError as e:
+        raise ValueError(f"Check rows need platform, category, severity and status (missing {e})") from None
+
+    return {
+        "account": np.array([str(row.get("account") or "") for row in rows], dtype=object),
+        "platform": platform,
+        "category": category,
+        "multiplier": _lookup(severity, SEVERITY_MULTIPLIER, "severity"),
+        "points": _lookup(status, STATUS_POINTS, "status"),
+        "weight": _floats([row.get("weight") for row in rows]),
+        "budget_share": _floats([row.get("budget_share") for row in rows]),
+    }
+
+
+def read_checks(path: str, input_format: str = None) -> dict:
+    """Read check rows from a JSONL or CSV file ('-' for stdin) into columns."""
+    if input_format is None:
+        input_format = "csv" if path.lower().endswith(".csv") else "jsonl"
+    if path == "-":
+        text = sys.stdin.read()
+    else:
+        with open(path, encoding="utf-8") as f:
+            text = f.read()
+    if input_format == "csv":
+        reader = csv.reader(io.StringIO(text))
+        header = next(reader, [])
+        rows = (dict(zip(header, record)) for record in reader if record)
+    else:
+        # One json.loads over the whole file is far faster than one per line
+        lines = [line for line in text.splitlines() if line.strip()]
+        try:
+            rows = json.loads("[" + ",".join(lines) + "]")
+        except json.JSONDecodeError as e:
+            raise ValueError(f"Invalid JSONL input: {e}") from None
+    return columns_from_rows(rows)
+
+
+def rows_from_report(report: dict, account: str = "") -> list:
+    """Check rows of an AuditReport (dashboard JSON), with its category weights and budget shares."""
+    rows = []
+    for platform in report["platforms"]:
+        weights = {c["name"]: c["weight"] for c in platform["categories"]}
+        for check in platform["checks"]:
+            rows.append({
+                "account": account,
+                "platform": platform["platform"],
+                "category": check["category"],
+                "severity": check["severity"],
+                "status": check["status"],
+                "weight": weights.get(check["category"]),
+                "budget_share": platform.get("budgetShare"),
+            })
+    return rows
+
+
+def landing_check_rows(url: str, grades: dict) -> list:
+    """Check rows for the Google audit items in a grade_landing() result (skipped checks are N/A)."""
+    platform, category = LANDING_CATEGORY
+    return [
+        {
+            "account": url,
+            "platform": platform,
+            "category": category,
+            "id": check_id,
+            "severity": severity,
+            "status": grades.get(key, "N/A"),
+        }
+        for key, (check_id, severity) in LANDING_CHECKS.items()
+    ]
+
+
+def _first(values: np.ndarray, groups: np.ndarray, count: int) -> np.ndarray:
+    """First non-NaN value of `values` per group (NaN if none)."""
+    out = np.full(count, np.nan)
+    idx = np.nonzero(~np.isnan(values))[0]
+    # return_index gives each group's first position among the present rows
+    present_groups, first = np.unique(groups[idx], return_index=True)
+    out[present_groups] = values[idx[first]]
+    return out
+
+
+def score_columns(columns: dict, category_weights: dict = CATEGORY_WEIGHTS) -> dict:
+    """
+    Score check columns at category, platform and account level.
+
+    Args:
+        columns: Arrays as returned by columns_from_rows() / read_checks()
+        category_weights: {platform: {category: weight}} used where a row
+            has no weight
+
+    Returns:
+        Dictionary with categories, platforms and accounts lists (first
+        appearance order), each entry carrying its score and grade
+    """
+    account_codes, accounts = _factorize(columns["account"])
+    platform_codes, platforms = _factorize(columns["platform"])
+    category_codes, categories = _factorize(columns["category"])
+
+    # Category level: one group per (account, platform, category)
+    cat_group, cat_keys = _factorize(
+        (account_codes.astype(np.int64) * len(platforms) + platform_codes) * len(categories) + category_codes
+    )
+    n_cat = len(cat_keys)
+    cat_account = cat_keys // (len(platforms) * len(categories))
+    cat_platform = (cat_keys // len(categories)) % len(platforms)
+    cat_category = cat_keys % len(categories)
+
+    points = columns["points"]
+    applicable = ~np.isnan(points)
+    multiplier = columns["multiplier"]
+    possible = np.bincount(cat_group, weights=np.where(applicable, multiplier, 0.0), minlength=n_cat)
+    earned = np.bincount(
+        cat_group, weights=np.where(applicable, np.nan_to_num(points) * multiplier, 0.0), minlength=n_cat
+    )
+    with np.errstate(invalid="ignore", divide="ignore"):
+        cat_score = np.where(possible > 0, earned / possible * 100, 0.0)
+
+    counts = {
+        name: np.bincount(cat_group[mask], minlength=n_cat)
+        for name, mask in (
+            ("passed", points == 1.0),
+            ("warnings", points == 0.5),
+            ("failed", points == 0.0),
+            ("na", ~applicable),
+        )
+    }
+    total_checks = np.bincount(cat_group, minlength=n_cat)
+
+    cat_weight = _first(columns["weight"], cat_group, n_cat)
+    missing = np.isnan(cat_weight)
+    for i in np.nonzero(missing)[0]:
+        platform, category = platforms[cat_platform[i]], categories[cat_category[i]]
+        weight = category_weights.get(platform, {}).get(category)
+        if weight is None:
+            raise ValueError(f"No weight for category {category!r} on platform {platform!r}")
+        cat_weight[i] = weight
+
+    # Platform level: one group per (account, platform)
+    plat_group, plat_keys = _factorize(cat_account.astype(np.int64) * len(platforms) + cat_platform)
+    n_plat = len(plat_keys)
+    weighted = np.bincount(plat_group, weights=cat_score * cat_weight, minlength=n_plat)
+    total_weight = np.bincount(plat_group, weights=cat_weight, minlength=n_plat)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        plat_score = np.where(total_weight > 0, weighted / total_weight, 0.0)
+    plat_account = plat_keys // len(platforms)
+    plat_platform = plat_keys % len(platforms)
+
+    row_plat_group = plat_group[cat_group]
+    share = _first(columns["budget_share"], row_plat_group, n_plat)
+    share = np.where(np.isnan(share), 1.0, share)
+
+    # Account level
+    n_acc = len(accounts)
+    acc_weighted = np.bincount(plat_account, weights=plat_score * share, minlength=n_acc)
+    acc_share = np.bincount(plat_account, weights=share, minlength=n_acc)
+    with np.errstate(invalid="ignore", divide="ignore"):
+        acc_score = np.where(acc_share > 0, acc_weighted / acc_share, 0.0)
+
+    cat_grades = grade_array(cat_score)
+    plat_grades = grade_array(plat_score)
+    acc_grades = grade_array(acc_score)
+
+    return {
+        "categories": [
+            {
+                "account": str(accounts[cat_account[i]]),
+                "platform": str(platforms[cat_platform[i]]),
+                "name": str(categories[cat_category[i]]),
+                "weight": float(cat_weight[i]),
+                "score": float(cat_score[i]),
+                "grade": str(cat_grades[i]),
+                "totalChecks": int(total_checks[i]),
+                **{name: int(values[i]) for name, values in counts.items()},
+            }
+            for i in range(n_cat)
+        ],
+        "platforms": [
+            {
+                "account": str(accounts[plat_account[i]]),
+                "platform": str(platforms[plat_platform[i]]),
+                "score": float(plat_score[i]),
+                "grade": str(plat_grades[i]),
+                "budgetShare": float(share[i]),
+            }
+            for i in range(n_plat)
+        ],
+        "accounts": [
+            {
+                "account": str(accounts[i]),
+                "score": float(acc_score[i]),
+                "grade": str(acc_grades[i]),
+                "label": _LABELS[str(acc_grades[i])],
+            }
+            for i in range(n_acc)
+        ],
+    }
+
+
+def score_rows(rows, category_weights: dict = CATEGORY_WEIGHTS) -> dict:
+    """score_columns() for an iterable of check dicts."""
+    return score_columns(columns_from_rows(rows), category_weights)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Score audit check results (weighted health score)")
+    parser.add_argument("input", nargs="?", help="JSONL or CSV file of check rows ('-' for stdin)")
+    parser.add_argument("--format", "-f", choices=["jsonl", "csv"],
+                        help="Input format (default: from the file extension, else jsonl)")
+    parser.add_argument("--report", "-r", metavar="FILE", help="Score the checks of an AuditReport JSON instead")
+    parser.add_argument("--weights", "-w", metavar="FILE",
+                        help="JSON {platform: {category: weight}} overriding CATEGORY_WEIGHTS")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if bool(args.input) == bool(args.report):
+        parser.error("provide either an input file or --report FILE")
+
+    weights = CATEGORY_WEIGHTS
+    if args.weights:
+        with open(args.weights) as f:
+            weights = json.load(f)
+
+    started = time.perf_counter()
+    try:
+        if args.report:
+            with open(args.report, encoding="utf-8") as f:
+                columns = columns_from_rows(rows_from_report(json.load(f), account=os.path.basename(args.report)))
+        else:
+            columns = read_checks(args.input, args.format)
+        loaded = time.perf_counter()
+        scores = score_columns(columns, weights)
+    except ValueError as e:
+        print(f"Error: {e}")
+        sys.exit(1)
+    finished = time.perf_counter()
+
+    rows = len(columns["points"])
+    stats = {
+        "rows": rows,
+        "load_s": round(loaded - started, 3),
+        "score_s": round(finished - loaded, 3),
+        "rows_per_sec": round(rows / (finished - loaded)) if finished > loaded else None,
+    }
+
+    if args.json:
+        print(json.dumps({**scores, "stats": stats}, indent=2))
+        return
+
+    for account in scores["accounts"]:
+        print(f"{account['account'] or 'Account'}: {account['score']:.1f} ({account['grade']}, {account['label']})")
+        for platform in (p for p in scores["platforms"] if p["account"] == account["account"]):
+            print(f"  {platform['platform']:10s} {platform['score']:5.1f} ({platform['grade']})")
+            for category in (
+                c for c in scores["categories"]
+                if c["account"] == account["account"] and c["platform"] == platform["platform"]
+            ):
+                print(f"    {category['name']:28s} {category['score']:5.1f} ({category['grade']}) "
+                      f"{category['passed']}P/{category['warnings']}W/{category['failed']}F/{category['na']}NA")
+    print(f"\nScored {rows} checks in {stats['score_s']}s (loaded in {stats['load_s']}s)", file=sys.stderr)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,434 @@
+#!/usr/bin/env python3
+"""
+Perceptual-hash index of landing page screenshots for near-duplicate pages.
+
+Large accounts point many ads at pages that look the same: UTM variants,
+A/B clones, locale mirrors. Each rendered page gets a 64-bit perceptual
+hash (DCT pHash) of its top region (page width × up to HASH_ASPECT widths
+tall), taken as a tiny CDP screenshot so no image library is needed. Hashes
+go into a BK-tree, and a page within `threshold` bits (Hamming distance)
+of an existing cluster representative joins that cluster.
+
+Batch runs with --dedupe (analyze_landing.py, capture_screenshot.py)
+fingerprint each page right after its first viewport is ready. A page that
+joins a cluster reuses the representative's analysis or screenshots instead
+of running its remaining viewports, and its result records duplicate_of and
+visual_cluster. --index FILE keeps the clusters between runs.
+
+The cluster report (clusters with more than one page) feeds the creative
+audit: how many distinct pages an account really sends traffic to, and
+which URLs are interchangeable.
+
+Usage:
+    python capture_screenshot.py --batch urls.txt --all --dedupe --index shots-index.json
+    python analyze_landing.py --batch urls.txt --dedupe --jsonl results.jsonl
+    python screenshot_index.py --report shots-index.json
+    python screenshot_index.py --scan screenshots/ --threshold 8 --json
+"""
+
+from __future__ import annotations
+
+import argparse
+import base64
+import functools
+import json
+import os
+import struct
+import sys
+import zlib
+
+from core import lazy_import
+
+np = lazy_import("numpy")
+
+HASH_BITS = 64
+DEFAULT_THRESHOLD = 6
+# Hashed region: the top of the page, at most this many page widths tall
+HASH_ASPECT = 2
+# Width of the CDP screenshot the hash is computed from
+THUMBNAIL_WIDTH = 64
+IMAGE_EXTENSIONS = (".png", ".jpg", ".jpeg", ".webp")
+
+PAGE_HEIGHT = "() => document.documentElement.scrollHeight"
+
+_DCT_SIZE = 32
+_DCT_LOW = 8
+
+
+@functools.lru_cache(maxsize=None)
+def _dct_matrix(n: int) -> np.ndarray:
+    k = np.arange(n)[:, None]
+    matrix = np.cos(np.pi * (2 * np.arange(n)[None, :] + 1) * k / (2 * n))
+    matrix[0] /= np.sqrt(2)
+    return matrix * np.sqrt(2 / n)
+
+
+def decode_png(data: bytes) -> np.ndarray:
+    """
+    Grayscale pixels (float, H×W) of an 8-bit non-interlaced PNG, as
+    Chromium's screenshots are.
+    """
+    if data[:8] != b"\x89PNG\r\n\x1a\n":
+        raise ValueError("Not a PNG image")
+    position, idat = 8, []
+    width = height = channels = None
+    while position < len(data):
+        length, kind = struct.unpack(">I4s", data[position:position + 8])
+        chunk = data[position + 8:position + 8 + length]
+        position += 12 + length
+        if kind == b"IHDR":
+            width, height, depth, color, _, _, interlace = struct.unpack(">IIBBBBB", chunk)
+            channels = {0: 1, 2: 3, 4: 2, 6: 4}.get(color)
+            if depth != 8 or channels is None or interlace:
+                raise ValueError(f"Unsupported PNG (depth {depth}, color type {color}, interlace {interlace})")
+        elif kind == b"IDAT":
+            idat.append(chunk)
+        elif kind == b"IEND":
+            break
+    if width is None:
+        raise ValueError("PNG has no IHDR chunk")
+
+    stride = width * channels
+    raw = np.frombuffer(zlib.decompress(b"".join(idat)), dtype=np.uint8).reshape(height, stride + 1)
+    pixels = np.zeros((height, stride), dtype=np.int32)
+    previous = np.zeros(stride, dtype=np.int32)
+    for y in range(height):
+        kind, line = raw[y, 0], raw[y, 1:].astype(np.int32)
+        if kind == 0:
+            row = line
+        elif kind == 2:
+            row = (line + previous) & 0xFF
+        else:
+            # Sub, Average and Paeth depend on the pixel to the left
+            row = np.zeros(stride, dtype=np.int32)
+            for x in range(stride):
+                left = row[x - channels] if x >= channels else 0
+                if kind == 1:
+                    predictor = left
+                elif kind == 3:
+                    predictor = (left + previous[x]) >> 1
+                else:
+                    up_left = previous[x - channels] if x >= channels else 0
+                    p = left + previous[x] - up_left
+                    pa, pb, pc = abs(p - left), abs(p - previous[x]), abs(p - up_left)
+                    predictor = left if pa <= pb and pa <= pc else previous[x] if pb <= pc else up_left
+                row[x] = (line[x] + predictor) & 0xFF
+        pixels[y] = row
+        previous = row
+    pixels = pixels.reshape(height, width, channels).astype(np.float64)
+    if channels >= 3:
+        return pixels[..., 0] * 0.299 + pixels[..., 1] * 0.587 + pixels[..., 2] * 0.114
+    return pixels[..., 0]
+
+
+def _resize(gray: np.ndarray, size: int) -> np.ndarray:
+    """Area-average (or repeat, when smaller) a grayscale image to size×size."""
+    for axis in (0, 1):
+        length = gray.shape[axis]
+        edges = np.linspace(0, length, size + 1)
+        starts = np.minimum(np.floor(edges[:-1]).astype(int), length - 1)
+        stops = np.maximum(np.ceil(edges[1:]).astype(int), starts + 1)
+        cumulative = np.concatenate([np.zeros_like(np.take(gray, [0], axis=axis)), np.cumsum(gray, axis=axis)], axis=axis)
+        sums = np.take(cumulative, stops, axis=axis) - np.take(cumulative, starts, axis=axis)
+        shape = [1, 1]
+        shape[axis] = size
+        gray = sums / (stops - starts).reshape(shape)
+    return gray
+
+
+def phash(gray: np.ndarray) -> int:
+    """64-bit DCT perceptual hash of a grayscale image."""
+    top = gray[: min(gray.shape[0], gray.shape[1] * HASH_ASPECT)]
+    dct = _dct_matrix(_DCT_SIZE)
+    coefficients = dct @ _resize(top, _DCT_SIZE) @ dct.T
+    low = coefficients[:_DCT_LOW, :_DCT_LOW].flatten()
+    bits = low > np.median(low[1:])
+    return int("".join("1" if bit else "0" for bit in bits), 2)
+
+
+def hamming(a: int, b: int) -> int:
+    return (a ^ b).bit_count()
+
+
+# Driver calls page_fingerprint() makes: evaluate, CDP session, screenshot, detach
+FINGERPRINT_ROUND_TRIPS = 4
+
+
+async def page_fingerprint(context, page) -> str:
+    """Perceptual hash (16 hex digits) of a rendered page, from a THUMBNAIL_WIDTH-wide CDP screenshot."""
+    size = page.viewport_size
+    height = await page.evaluate(PAGE_HEIGHT) or size["height"]
+    height = max(size["height"], min(height, size["width"] * HASH_ASPECT))
+    cdp = await context.new_cdp_session(page)
+    try:
+        shot = await cdp.send("Page.captureScreenshot", {
+            "format": "png",
+            "captureBeyondViewport": height > size["height"],
+            "clip": {"x": 0, "y": 0, "width": size["width"], "height": height,
+                     "scale": THUMBNAIL_WIDTH / size["width"]},
+        })
+    finally:
+        await cdp.detach()
+    return f"{phash(decode_png(base64.b64decode(shot['data']))):016x}"
+
+
+def file_fingerprint(path: str) -> str:
+    """
+    Perceptual hash of a screenshot file.
+
+    Uses Pillow when installed; without it PNGs are decoded by decode_png()
+    (slow for full-size shots) and JPEG/WebP cannot be read.
+    """
+    try:
+        from PIL import Image
+    except ImportError:
+        with open(path, "rb") as f:
+            data = f.read()
+        if data[:8] != b"\x89PNG\r\n\x1a\n":
+            print("Error: Pillow required to hash JPEG/WebP screenshots. Install with: pip install -r requirements.txt")
+            sys.exit(1)
+        return f"{phash(decode_png(data)):016x}"
+    with Image.open(path) as image:
+        return f"{phash(np.asarray(image.convert('L'), dtype=np.float64)):016x}"
+
+
+class BKTree:
+    """Burkhard-Keller tree over 64-bit hashes with Hamming distance."""
+
+    def __init__(self):
+        self._root = None  # [hash, item, {distance: child}]
+        self.size = 0
+
+    def add(self, value: int, item) -> None:
+        self.size += 1
+        if self._root is None:
+            self._root = [value, item, {}]
+            return
+        node = self._root
+        while True:
+            distance = hamming(value, node[0])
+            child = node[2].get(distance)
+            if child is None:
+                node[2][distance] = [value, item, {}]
+                return
+            node = child
+
+    def search(self, value: int, max_distance: int) -> list:
+        """(distance, item) pairs within max_distance, nearest first."""
+        found = []
+        stack = [self._root] if self._root else []
+        while stack:
+            node = stack.pop()
+            distance = hamming(value, node[0])
+            if distance <= max_distance:
+                found.append((distance, node[1]))
+            # Triangle inequality: only children at |d - k| <= max_distance can match
+            for edge, child in node[2].items():
+                if distance - max_distance <= edge <= distance + max_distance:
+                    stack.append(child)
+        return sorted(found, key=lambda pair: pair[0])
+
+
+class ScreenshotIndex:
+    """
+    Clusters of visually near-identical pages.
+
+    Each cluster has a representative (the first page seen) whose hash is in
+    the BK-tree; later pages within `threshold` bits of it become members.
+    In batch runs, claim() assigns a page to a cluster and reuse() waits for
+    the representative's finished result.
+    """
+
+    def __init__(self, threshold: int = DEFAULT_THRESHOLD, viewport: str = None):
+        self.threshold = threshold
+        self.viewport = viewport
+        self.clusters = []
+        self._tree = BKTree()
+        self._by_url = {}
+        self._done = {}  # cluster id -> asyncio.Future of the representative's result
+        # Clusters whose representative has finished, in this run or a saved one;
+        # their result (None if it failed) is final
+        self._settled = set()
+
+    def _new_cluster(self, url: str, fingerprint: str, result=None) -> dict:
+        cluster = {
+            "id": len(self.clusters),
+            "representative": url,
+            "hash": fingerprint,
+            "members": [],
+            "result": result,
+        }
+        self.clusters.append(cluster)
+        self._tree.add(int(fingerprint, 16), cluster)
+        self._by_url[url] = cluster
+        return cluster
+
+    def claim(self, url: str, fingerprint: str) -> tuple:
+        """
+        Assign a page to a cluster.
+
+        Returns:
+            (cluster, distance); distance is None when the page became the
+            representative of a new cluster (or already is one)
+        """
+        if url in self._by_url:
+            cluster = self._by_url[url]
+            if cluster["representative"] == url:
+                return cluster, None
+            return cluster, next(m["distance"] for m in cluster["members"] if m["url"] == url)
+        matches = self._tree.search(int(fingerprint, 16), self.threshold)
+        if not matches:
+            return self._new_cluster(url, fingerprint), None
+        distance, cluster = matches[0]
+        cluster["members"].append({"url": url, "distance": distance})
+        self._by_url[url] = cluster
+        return cluster, distance
+
+    def _future(self, cluster: dict):
+        import asyncio  # only the browser scripts' event loops get here
+
+        future = self._done.get(cluster["id"])
+        if future is None:
+            future = self._done[cluster["id"]] = asyncio.get_running_loop().create_future()
+            if cluster["id"] in self._settled:
+                future.set_result(cluster["result"])
+        return future
+
+    def resolve(self, cluster: dict, result: dict) -> None:
+        """Record the representative's finished result; usable only if it has no error."""
+        usable = result if not result.get("error") else None
+        cluster["result"] = usable
+        self._settled.add(cluster["id"])
+        future = self._future(cluster)
+        if not future.done():
+            future.set_result(usable)
+
+    async def reuse(self, cluster: dict):
+        """
+        The representative's result once it is finished (None if it failed).
+
+        Returns at once for clusters loaded from a saved index, whose
+        representative will not run again.
+        """
+        if cluster["id"] in self._settled:
+            return cluster["result"]
+        return await self._future(cluster)
+
+    def report(self, min_size: int = 2) -> list:
+        """Clusters with at least min_size pages, largest first (without stored results)."""
+        rows = [
+            {key: cluster[key] for key in ("id", "representative", "hash", "members")}
+            | {"size": 1 + len(cluster["members"])}
+            for cluster in self.clusters
+            if 1 + len(cluster["members"]) >= min_size
+        ]
+        return sorted(rows, key=lambda row: -row["size"])
+
+    def stats(self) -> dict:
+        pages = sum(1 + len(c["members"]) for c in self.clusters)
+        return {
+            "pages": pages,
+            "clusters": len(self.clusters),
+            "duplicates": pages - len(self.clusters),
+            "threshold": self.threshold,
+            "viewport": self.viewport,
+        }
+
+    def save(self, path: str) -> None:
+        """
+        Write the clusters to `path`.
+
+        Each cluster keeps its representative's result (without per-run
+        timings) so a later run can reuse it, so the file grows by about one
+        analysis or capture result, a few KB, per cluster.
+        """
+        clusters = [
+            {**cluster, "result": _stored(cluster["result"])} for cluster in self.clusters
+        ]
+        data = {"threshold": self.threshold, "viewport": self.viewport, "clusters": clusters}
+        with open(path + ".tmp", "w", encoding="utf-8") as f:
+            json.dump(data, f)
+        os.replace(path + ".tmp", path)
+
+    @classmethod
+    def load(cls, path: str, threshold: int = None, viewport: str = None) -> "ScreenshotIndex":
+        """Load a saved index, or start an empty one if the file does not exist."""
+        if not os.path.exists(path):
+            return cls(threshold if threshold is not None else DEFAULT_THRESHOLD, viewport)
+        with open(path, encoding="utf-8") as f:
+            data = json.load(f)
+        if viewport and data.get("viewport") and data["viewport"] != viewport:
+            raise ValueError(f"{path} was built from {data['viewport']} fingerprints, not {viewport}")
+        index = cls(threshold if threshold is not None else data["threshold"], viewport or data.get("viewport"))
+        for saved in data["clusters"]:
+            cluster = index._new_cluster(saved["representative"], saved["hash"], saved.get("result"))
+            cluster["members"] = saved["members"]
+            index._settled.add(cluster["id"])
+            for member in saved["members"]:
+                index._by_url[member["url"]] = cluster
+        return index
+
+
+def _stored(result: dict) -> dict:
+    """A representative's result as saved in an index: everything reuse copies."""
+    if result is None:
+        return None
+    return {key: value for key, value in result.items() if key != "timings"}
+
+
+def print_report(index: ScreenshotIndex, min_size: int = 2, file=None) -> None:
+    """Print the clusters with at least min_size pages and a one-line summary."""
+    for cluster in index.report(min_size=min_size):
+        print(f"Cluster {cluster['id']} ({cluster['size']} pages, hash {cluster['hash']}):", file=file)
+        print(f"  * {cluster['representative']}", file=file)
+        for member in cluster["members"]:
+            print(f"    {member['url']} (distance {member['distance']})", file=file)
+    stats = index.stats()
+    print(f"{stats['pages']} pages in {stats['clusters']} visual clusters "
+          f"({stats['duplicates']} near-duplicates at threshold {stats['threshold']})", file=file)
+
+
+def scan(paths: list, threshold: int = DEFAULT_THRESHOLD) -> ScreenshotIndex:
+    """Cluster existing screenshot files (keyed by path)."""
+    index = ScreenshotIndex(threshold)
+    for path in paths:
+        index.claim(path, file_fingerprint(path))
+    return index
+
+
+def _image_files(directory: str) -> list:
+    return sorted(
+        os.path.join(root, name)
+        for root, _, names in os.walk(directory)
+        for name in names
+        if name.lower().endswith(IMAGE_EXTENSIONS)
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Cluster near-duplicate landing page screenshots")
+    parser.add_argument("--scan", metavar="DIR", help="Hash and cluster the screenshots in a directory")
+    parser.add_argument("--report", metavar="FILE", help="Print the clusters of a saved --index file")
+    parser.add_argument("--threshold", type=int, default=DEFAULT_THRESHOLD,
+                        help=f"Max differing bits (of {HASH_BITS}) for two pages to count as the same")
+    parser.add_argument("--min-size", type=int, default=2, help="Only show clusters with at least this many pages")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if bool(args.scan) == bool(args.report):
+        parser.error("provide either --scan DIR or --report FILE")
+
+    if args.scan:
+        index = scan(_image_files(args.scan), threshold=args.threshold)
+    else:
+        index = ScreenshotIndex.load(args.report)
+
+    if args.json:
+        print(json.dumps({"clusters": index.report(min_size=args.min_size), "stats": index.stats()}, indent=2))
+        return
+    print_report(index, min_size=args.min_size)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,550 @@
+#!/usr/bin/env python3
+"""
+Multi-process runner for the Chromium workloads, with crash isolation.
+
+One Python process driving Playwright saturates a single core and dies with
+its browser. This runner spreads a URL list over a pool of worker processes
+(one per core by default), each with its own Chromium, so driver-side work
+scales with cores and a crashed tab, browser or worker only costs the URLs
+it was handling.
+
+The parent keeps the shared work queue and hands each worker a URL whenever
+it has a free page slot, so fast and slow shards balance out. Every worker
+talks to the parent over its own pair of pipes; killing a wedged worker can
+never leave a lock held that the others need.
+
+Failure handling:
+    - Each URL gets a hard timeout inside its worker (the page is abandoned
+      and its context closed); a worker that does not answer within the
+      timeout plus a grace period is killed along with its Chromium
+      (process group) and restarted.
+    - A worker or browser that crashes is restarted; the URLs it was running
+      are retried.
+    - Failed URLs are retried up to `retries` times with exponential backoff
+      (backoff, 2 * backoff, ...); after that they are reported with an error.
+
+Usage:
+    python sharded_runner.py --batch final_urls.txt
+    python sharded_runner.py --batch final_urls.txt --workers 32 --jsonl results.jsonl --resume
+    python sharded_runner.py --batch final_urls.txt --job capture --output screenshots
+    python sharded_runner.py --batch final_urls.txt --hard-timeout 60 --retries 3 --backoff 5
+"""
+
+import argparse
+import asyncio
+import heapq
+import json
+import multiprocessing
+import os
+import signal
+import sys
+import time
+from collections import deque
+from multiprocessing.connection import wait
+
+from core import DEFAULT_TIMEOUT_MS, VIEWPORTS
+from jsonl_output import JsonlWriter
+from lab_vitals import DEFAULT_THROTTLE, THROTTLE_PROFILES
+from page_ready import DEFAULT_DEADLINE_MS
+from request_policy import PROFILES
+
+JOB_NAMES = ("analyze", "capture")
+DEFAULT_HARD_TIMEOUT_S = 90
+DEFAULT_RETRIES = 2
+DEFAULT_BACKOFF_S = 2.0
+KILL_GRACE_S = 15
+START_METHOD = "spawn"
+
+
+async def _analyze_job(browser, url: str, options: dict) -> dict:
+    from analyze_landing import _analyze_with_browser
+
+    return await _analyze_with_browser(browser, url, **options)
+
+
+async def _capture_job(browser, url: str, options: dict) -> dict:
+    from capture_screenshot import _capture_in_context, output_name
+
+    options = dict(options)
+    output_dir = options.pop("output_dir")
+    viewports = options.pop("viewports", tuple(VIEWPORTS))
+    image_format = options.get("image_format", "png")
+    os.makedirs(output_dir, exist_ok=True)
+    shots = await asyncio.gather(*(
+        _capture_in_context(
+            browser, url,
+            os.path.join(output_dir, output_name(url, viewport, image_format, with_path=True)),
+            viewport,
+            options.get("full_page", False),
+            options.get("timeout", DEFAULT_TIMEOUT_MS),
+            options.get("deadline", DEFAULT_DEADLINE_MS),
+            options.get("profile"),
+            image_format,
+            options.get("quality", 80),
+            options.get("max_height"),
+            None,
+        )
+        for viewport in viewports
+    ))
+    return {"url": url, "shots": list(shots), "error": None}
+
+
+JOBS = {"analyze": _analyze_job, "capture": _capture_job}
+
+
+def failed_result(job: str, url: str, error: str) -> dict:
+    """The result reported for a URL that failed every attempt."""
+    if job == "analyze":
+        from static_landing import empty_result
+
+        result = empty_result(url)
+        result["tier"] = "rendered"
+    else:
+        result = {"url": url, "shots": []}
+    result["error"] = error
+    return result
+
+
+async def _launch_browser(p):
+    return await p.chromium.launch(headless=True)
+
+
+async def _serve(tasks, results, job: str, options: dict, hard_timeout_s: float) -> None:
+    """Worker event loop: receive URLs, run them on this worker's browser, send results back."""
+    from playwright.async_api import async_playwright
+
+    loop = asyncio.get_running_loop()
+    run_job = JOBS[job]
+    running = set()
+
+    async with async_playwright() as p:
+        browser = await _launch_browser(p)
+        results.send(("ready",))
+
+        async def run_one(task_id: int, url: str, attempt: int) -> None:
+            current = browser
+            try:
+                result = await asyncio.wait_for(run_job(current, url, options), hard_timeout_s)
+            except asyncio.TimeoutError:
+                results.send(("failed", task_id, attempt, f"Hard timeout after {hard_timeout_s}s"))
+                return
+            except Exception as e:
+                results.send(("failed", task_id, attempt, str(e).splitlines()[0] if str(e) else repr(e)))
+                return
+            if not current.is_connected():
+                results.send(("failed", task_id, attempt, "Browser crashed"))
+            else:
+                results.send(("done", task_id, attempt, result))
+
+        while True:
+            try:
+                item = await loop.run_in_executor(None, tasks.recv)
+            except EOFError:
+                break
+            if item is None:
+                break
+            if not browser.is_connected():
+                browser = await _launch_browser(p)
+            task = asyncio.ensure_future(run_one(*item))
+            running.add(task)
+            task.add_done_callback(running.discard)
+
+        if running:
+            await asyncio.gather(*running, return_exceptions=True)
+        try:
+            await browser.close()
+        except Exception:
+            pass
+
+
+def _worker_main(tasks, results, job: str, options: dict, hard_timeout_s: float) -> None:
+    # A process group of its own lets the parent kill this worker and its
+    # Chromium processes together.
+    if hasattr(os, "setsid"):
+        os.setsid()
+    try:
+        asyncio.run(_serve(tasks, results, job, options, hard_timeout_s))
+    except Exception as e:
+        try:
+            results.send(("fatal", str(e).splitlines()[0] if str(e) else repr(e)))
+        except OSError:
+            pass
+
+
+class _Worker:
+    """Parent-side handle of one worker process."""
+
+    def __init__(self, ctx, worker_id: int, job: str, options: dict, hard_timeout_s: float):
+        self.id = worker_id
+        task_reader, self.tasks = ctx.Pipe(duplex=False)
+        self.results, result_writer = ctx.Pipe(duplex=False)
+        self.process = ctx.Process(
+            target=_worker_main,
+            args=(task_reader, result_writer, job, options, hard_timeout_s),
+            daemon=True,
+        )
+        self.process.start()
+        task_reader.close()
+        result_writer.close()
+        self.ready = False
+        self.in_flight = {}  # task id -> (url, attempt, dispatched_at)
+
+    def kill(self) -> None:
+        if self.process.is_alive():
+            try:
+                if hasattr(os, "killpg"):
+                    os.killpg(self.process.pid, signal.SIGKILL)
+                else:
+                    self.process.kill()
+            except OSError:
+                self.process.kill()
+        self.process.join(5)
+
+    def close(self) -> None:
+        self.tasks.close()
+        self.results.close()
+
+
+def iter_sharded(
+    urls: list,
+    job: str = "analyze",
+    workers: int = None,
+    pages_per_worker: int = 2,
+    hard_timeout: float = DEFAULT_HARD_TIMEOUT_S,
+    retries: int = DEFAULT_RETRIES,
+    backoff: float = DEFAULT_BACKOFF_S,
+    options: dict = None,
+    stats: dict = None,
+):
+    """
+    Run `job` over many URLs on a pool of worker processes, yielding results as they complete.
+
+    Args:
+        urls: Landing page URLs
+        job: "analyze" (analyze_landing()-shaped results) or "capture"
+            (iter_capture()-shaped results)
+        workers: Worker processes, each with its own browser (default: CPU count)
+        pages_per_worker: Pages each worker runs at once
+        hard_timeout: Seconds a single URL may take before it is abandoned
+        retries: Extra attempts for a URL that timed out or whose worker or
+            browser crashed
+        backoff: Seconds before the first retry; doubles with each attempt
+        options: Keyword arguments for the job (timeout, deadline, profile,
+            single_fetch for analyze; output_dir, viewports, image_format, ...
+            for capture)
+        stats: Optional dict updated with retries, timeouts, worker_restarts
+
+    Yields:
+        Result dicts with result["runner"] = {"worker", "attempts"}, in
+        completion order
+
+    Raises:
+        RuntimeError: if 2 × workers launches in a row fail before any worker
+        has started. Once one has, the same streak fails the URLs still
+        waiting for a worker instead, and no more workers are started.
+    """
+    if job not in JOBS:
+        raise ValueError(f"Unknown job: {job}. Choose from: {list(JOB_NAMES)}")
+    if not urls:
+        return
+    ctx = multiprocessing.get_context(START_METHOD)
+    workers = max(1, min(workers or os.cpu_count() or 1, len(urls) or 1))
+    options = options or {}
+    stats = stats if stats is not None else {}
+    for key in ("retries", "timeouts", "worker_restarts"):
+        stats.setdefault(key, 0)
+
+    # Tasks are identified by their input position, so a URL listed twice
+    # is run and reported twice
+    queue = deque((task_id, url, 0) for task_id, url in enumerate(urls))
+    delayed = []  # heap of (ready_at, task_id, url, attempt)
+    remaining = len(urls)
+    pool = {}
+    next_id = 0
+    launch_failures = 0  # in a row; reset when a worker reports ready
+    launch_error = None
+    last_error = None
+    ever_ready = False
+
+    def start_worker() -> None:
+        nonlocal next_id
+        worker = _Worker(ctx, next_id, job, options, hard_timeout)
+        pool[worker.id] = worker
+        next_id += 1
+
+    def retry_or_fail(worker: _Worker, task_id: int, url: str, attempt: int, error: str):
+        """Requeue a failed URL with backoff, or return its final error result."""
+        if attempt < retries:
+            stats["retries"] += 1
+            heapq.heappush(delayed, (time.monotonic() + backoff * 2 ** attempt, task_id, url, attempt + 1))
+            return None
+        result = failed_result(job, url, error)
+        result["runner"] = {"worker": worker.id, "attempts": attempt + 1}
+        return result
+
+    def handle(worker: _Worker, message):
+        """Apply one worker message; returns a finished result or None."""
+        nonlocal ever_ready, last_error, launch_failures
+        kind = message[0]
+        if kind == "ready":
+            worker.ready = True
+            ever_ready = True
+            launch_failures = 0
+            return None
+        if kind == "fatal":
+            last_error = message[1]
+            return None
+        _, task_id, attempt, payload = message
+        if task_id not in worker.in_flight:
+            return None
+        url = worker.in_flight.pop(task_id)[0]
+        if kind == "done":
+            payload["runner"] = {"worker": worker.id, "attempts": attempt + 1}
+            return payload
+        if payload.startswith("Hard timeout"):
+            stats["timeouts"] += 1
+        return retry_or_fail(worker, task_id, url, attempt, payload)
+
+    def drain(worker: _Worker) -> list:
+        """Collect what a dead or killed worker sent before it went away."""
+        finished = []
+        try:
+            while worker.results.poll():
+                result = handle(worker, worker.results.recv())
+                if result:
+                    finished.append(result)
+        except Exception:
+            pass
+        return finished
+
+    def fail_waiting() -> list:
+        """Fail every URL waiting for a worker once no more workers are started."""
+        waiting = list(queue) + [(task_id, url, attempt) for _, task_id, url, attempt in delayed]
+        queue.clear()
+        delayed.clear()
+        finished = []
+        for task_id, url, attempt in sorted(waiting):
+            result = failed_result(job, url, launch_error)
+            result["runner"] = {"worker": None, "attempts": attempt}
+            finished.append(result)
+        return finished
+
+    def replace(worker: _Worker, reason: str, overdue: int = None) -> list:
+        """Kill a worker, settle its URLs and start a fresh one."""
+        nonlocal launch_failures, launch_error
+        worker.kill()
+        finished = drain(worker)
+        worker.close()
+        for task_id, (url, attempt, _) in worker.in_flight.items():
+            if task_id == overdue:
+                stats["timeouts"] += 1
+                result = retry_or_fail(worker, task_id, url, attempt, reason)
+                if result:
+                    finished.append(result)
+            elif overdue is not None:
+                # Collateral of killing a wedged worker: no attempt is charged.
+                queue.appendleft((task_id, url, attempt))
+            else:
+                result = retry_or_fail(worker, task_id, url, attempt, reason)
+                if result:
+                    finished.append(result)
+        del pool[worker.id]
+        if not worker.ready:
+            launch_failures += 1
+            if launch_failures >= 2 * workers and launch_error is None:
+                launch_error = f"Could not start browser workers: {last_error or reason}"
+                if not ever_ready:
+                    raise RuntimeError(launch_error)
+        else:
+            stats["worker_restarts"] += 1
+        if launch_error:
+            finished += fail_waiting()
+        elif remaining - len(finished) > 0:
+            start_worker()
+        return finished
+
+    for _ in range(workers):
+        start_worker()
+    try:
+        while remaining:
+            now = time.monotonic()
+            while delayed and delayed[0][0] <= now:
+                _, task_id, url, attempt = heapq.heappop(delayed)
+                queue.append((task_id, url, attempt))
+
+            for worker in list(pool.values()):
+                while worker.ready and queue and len(worker.in_flight) < pages_per_worker:
+                    task_id, url, attempt = queue.popleft()
+                    try:
+                        worker.tasks.send((task_id, url, attempt))
+                    except OSError:
+                        queue.appendleft((task_id, url, attempt))
+                        break
+                    worker.in_flight[task_id] = (url, attempt, time.monotonic())
+
+            finished = []
+            readers = {worker.results: worker for worker in pool.values()}
+            for conn in wait(list(readers), timeout=0.25):
+                worker = readers[conn]
+                try:
+                    message = conn.recv()
+                except (EOFError, OSError):
+                    continue  # the liveness check below replaces it
+                result = handle(worker, message)
+                if result:
+                    finished.append(result)
+
+            now = time.monotonic()
+            for worker in list(pool.values()):
+                if not worker.process.is_alive():
+                    finished += replace(worker, last_error or "Worker process crashed")
+                    continue
+                overdue = [
+                    (dispatched_at, task_id) for task_id, (_, _, dispatched_at) in worker.in_flight.items()
+                    if now - dispatched_at > hard_timeout + KILL_GRACE_S
+                ]
+                if overdue:
+                    # The longest-running URL is the likely culprit; the rest
+                    # of the worker's URLs are requeued without penalty.
+                    finished += replace(
+                        worker, f"Hard timeout after {hard_timeout}s (worker killed)", overdue=min(overdue)[1]
+                    )
+
+            if launch_error:
+                # Retries of the workers still running have nowhere to go
+                finished += fail_waiting()
+            for result in finished:
+                remaining -= 1
+                yield result
+    finally:
+        for worker in pool.values():
+            try:
+                worker.tasks.send(None)
+            except OSError:
+                pass
+        deadline = time.monotonic() + 10
+        for worker in pool.values():
+            worker.process.join(max(0, deadline - time.monotonic()))
+            worker.kill()
+            worker.close()
+
+
+def run_sharded(urls: list, on_result=None, keep_results: bool = True, **options) -> dict:
+    """
+    Run iter_sharded() to completion (see it for options).
+
+    Returns:
+        Dictionary with results (completion order, empty without
+        keep_results) and stats (pages, errors, retries, timeouts,
+        worker_restarts, elapsed_s, pages_per_sec)
+    """
+    results = []
+    stats = {"pages": 0, "errors": 0}
+    started = time.perf_counter()
+    for result in iter_sharded(urls, stats=stats, **options):
+        stats["pages"] += 1
+        stats["errors"] += bool(result["error"])
+        if keep_results:
+            results.append(result)
+        if on_result:
+            on_result(result)
+    elapsed = time.perf_counter() - started
+    stats["elapsed_s"] = round(elapsed, 2)
+    stats["pages_per_sec"] = round(stats["pages"] / elapsed, 2) if elapsed > 0 else None
+    return {"results": results, "stats": stats}
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Run landing page analysis or screenshots on a process pool")
+    parser.add_argument("--batch", "-b", metavar="FILE", required=True,
+                        help="File with one URL per line ('-' for stdin)")
+    parser.add_argument("--job", choices=JOB_NAMES, default="analyze", help="What to run for each URL")
+    parser.add_argument("--workers", "-w", type=int, default=os.cpu_count(),
+                        help="Worker processes, one browser each (default: CPU count)")
+    parser.add_argument("--pages-per-worker", type=int, default=2, help="Pages each worker runs at once")
+    parser.add_argument("--hard-timeout", type=float, default=DEFAULT_HARD_TIMEOUT_S,
+                        help="Seconds before a URL is abandoned (its worker is killed if it does not respond)")
+    parser.add_argument("--retries", type=int, default=DEFAULT_RETRIES,
+                        help="Retries for URLs that timed out or whose worker/browser crashed")
+    parser.add_argument("--backoff", type=float, default=DEFAULT_BACKOFF_S,
+                        help="Seconds before the first retry (doubles per attempt)")
+    parser.add_argument("--timeout", "-t", type=int, default=DEFAULT_TIMEOUT_MS, help="Navigation timeout in ms")
+    parser.add_argument("--deadline", "-d", type=int, default=DEFAULT_DEADLINE_MS,
+                        help="Hard per-page readiness deadline in ms")
+    parser.add_argument("--profile", "-p", choices=PROFILES,
+                        help="Request profile (see request_policy.py)")
+    parser.add_argument("--single-fetch", action="store_true", help="analyze: replay the page into the second viewport")
+    parser.add_argument("--lab-samples", type=int, default=0, metavar="N",
+                        help="analyze: throttled mobile loads per page; G59 is graded from their p75 LCP")
+    parser.add_argument("--throttle", choices=THROTTLE_PROFILES, default=DEFAULT_THROTTLE, help="analyze: throttling profile for --lab-samples")
+    parser.add_argument("--output", "-o", default="screenshots", help="capture: output directory")
+    parser.add_argument("--format", default="png", choices=("png", "jpeg", "webp"), help="capture: image format")
+    parser.add_argument("--jsonl", metavar="FILE",
+                        help="Stream one JSON line per URL as it completes ('-' for stdout)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted --jsonl FILE run, skipping URLs already written")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+
+    args = parser.parse_args()
+
+    if args.resume and (not args.jsonl or args.jsonl == "-"):
+        parser.error("--resume needs --jsonl FILE")
+
+    from url_list import read_urls
+
+    options = {"timeout": args.timeout, "deadline": args.deadline, "profile": args.profile}
+    if args.job == "analyze":
+        options.update(single_fetch=args.single_fetch, lab_samples=args.lab_samples, throttle=args.throttle)
+        from static_landing import grade_landing
+
+        def record(result: dict) -> dict:
+            return {**result, "grades": grade_landing(result)}
+    else:
+        options.update(output_dir=args.output, image_format=args.format)
+
+        def record(result: dict) -> dict:
+            return result
+
+    def print_line(result: dict) -> None:
+        runner = result["runner"]
+        status = f"ERROR {result['error']}" if result["error"] else "ok"
+        print(f"[w{runner['worker']} x{runner['attempts']}] {result['url']} {status}")
+
+    urls = read_urls(args.batch)
+    out = JsonlWriter(args.jsonl, resume=args.resume) if args.jsonl else None
+    if out:
+        urls = out.remaining(urls)
+        on_result = lambda result: out.write(record(result), key=result["url"])
+    else:
+        on_result = None if args.json else print_line
+
+    sharded_options = dict(
+        job=args.job,
+        workers=args.workers,
+        pages_per_worker=args.pages_per_worker,
+        hard_timeout=args.hard_timeout,
+        retries=args.retries,
+        backoff=args.backoff,
+        options=options,
+    )
+    try:
+        batch = run_sharded(urls, on_result=on_result, keep_results=args.json and not out, **sharded_options)
+    except RuntimeError as e:
+        print(f"Error: {e}", file=sys.stderr)
+        sys.exit(1)
+    finally:
+        if out:
+            out.close()
+
+    stats = batch["stats"]
+    if args.json and not out:
+        print(json.dumps({"results": [record(r) for r in batch["results"]], "stats": stats}, indent=2))
+    else:
+        print(f"\nProcessed {stats['pages']} URLs on {min(args.workers or 1, max(1, len(urls)))} workers "
+              f"({stats['errors']} errors, {stats['retries']} retries, {stats['timeouts']} timeouts, "
+              f"{stats['worker_restarts']} worker restarts) in {stats['elapsed_s']}s "
+              f"— {stats['pages_per_sec']} pages/sec", file=sys.stderr if out else sys.stdout)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,501 @@
+#!/usr/bin/env python3
+"""
+Browserless landing page analysis from raw HTML.
+
+Computes the analyze_landing() fields that do not need rendering (title, H1,
+meta description, viewport meta, JSON-LD types for G61, forms and input
+counts, tel: links, testimonial/trust keywords) from fetch_page() output with
+the standard library HTML parser, at hundreds of pages per second per core.
+
+The tiered pipeline runs this static pass first and escalates a URL to the
+Playwright path only when a requested check needs rendering (LCP, CLS,
+above-fold CTA, horizontal scroll) or the HTML looks like a client-rendered
+shell whose content only exists after JavaScript runs.
+
+Usage:
+    python static_landing.py https://example.com/landing
+    python static_landing.py https://example.com/landing --json
+    python static_landing.py --batch final_urls.txt --json
+    python static_landing.py --batch final_urls.txt --checks G59_mobile_speed,G60_relevance
+    python static_landing.py --batch final_urls.txt --jsonl results.jsonl --resume
+"""
+
+import argparse
+import copy
+import json
+import re
+import sys
+import time
+from html.parser import HTMLParser
+
+from core import CONTENT_TEXT_CHARS, LandingResult
+
+# Selectors and keywords shared by the rendered (EXTRACT_PAGE) and static
+# analyzers. "button:has-text(...)" becomes a case-insensitive text match on
+# <button> elements.
+CTA_SELECTORS = [
+    "a[href*='signup']", "a[href*='register']", "a[href*='contact']",
+    "a[href*='demo']", "a[href*='trial']", "a[href*='buy']",
+    ".cta", "[class*='cta']",
+]
+CTA_BUTTON_TEXTS = ["Get Started", "Sign Up", "Buy Now", "Contact", "Free Trial", "Book"]
+CHAT_MARKERS = {
+    "class": ["chat", "intercom", "drift", "hubspot", "zendesk"],
+    "id": ["chat"],
+}
+CHAT_SELECTORS = [f"[{attr}*='{m}']" for attr, markers in CHAT_MARKERS.items() for m in markers]
+TESTIMONIAL_KEYWORDS = ["testimonial", "customer said", "what our"]
+TRUST_BADGE_KEYWORDS = ["trusted by", "as seen", "certified", "award"]
+
+
+def empty_result(url: str) -> dict:
+    """
+    Return the result skeleton that the static and rendered analyses fill in.
+
+    Fields a tier cannot determine stay None (e.g. cta_above_fold in a
+    static-only result) and grade_landing() skips the checks that need them.
+    The shape is defined by core.LandingResult.
+    """
+    return LandingResult(url).to_dict()
+
+
+def grade_landing(result: dict) -> dict:
+    """Grade landing page quality based on ad audit criteria."""
+    grades = {}
+
+    # Blocking media and fonts makes LCP and page weight unrepresentative
+    requests = result.get("requests") or {}
+    faithful = requests.get("profile") in (None, "faithful")
+
+    # G59: Mobile speed (LCP); the p75 of throttled lab samples when measured,
+    # which are never subject to the request profile's blocking, otherwise
+    # (no samples, or every sample failed) the analysis load's LCP
+    lab = result.get("lab")
+    lcp = lab["lcp_ms"]["p75"] if lab else None
+    if not lcp and faithful:
+        lcp = result["performance"].get("lcp_ms")
+    if lcp:
+        if lcp < 2500:
+            grades["G59_mobile_speed"] = "PASS"
+        elif lcp < 4000:
+            grades["G59_mobile_speed"] = "WARNING"
+        else:
+            grades["G59_mobile_speed"] = "FAIL"
+
+    # G60: Landing page relevance: the message-match level against the page's
+    # ad groups when scored (see message_match.py), otherwise H1 present
+    match = result.get("message_match")
+    if match:
+        grades["G60_relevance"] = match["grade"]
+    else:
+        grades["G60_relevance"] = "PASS" if result["content"]["h1"] else "FAIL"
+
+    # G61: Schema markup (Product/FAQ/Service per google-audit.md)
+    has_relevant_schema = (
+        result["schema"]["product_schema"]
+        or result["schema"]["faq_schema"]
+        or result["schema"]["service_schema"]
+    )
+    grades["G61_schema"] = "PASS" if has_relevant_schema else "FAIL"
+
+    # CTA above fold (needs rendering)
+    if result["conversion"]["cta_above_fold"] is not None:
+        grades["cta_above_fold"] = "PASS" if result["conversion"]["cta_above_fold"] else "FAIL"
+
+    # Mobile responsive (a missing viewport meta fails without rendering)
+    has_viewport = result["mobile"]["viewport_meta"]
+    horizontal_scroll = result["mobile"]["horizontal_scroll"]
+    if not has_viewport:
+        grades["mobile_responsive"] = "FAIL"
+    elif horizontal_scroll is not None:
+        grades["mobile_responsive"] = "PASS" if not horizontal_scroll else "FAIL"
+
+    # Form friction (for lead gen)
+    if result["conversion"]["form_present"]:
+        fields = result["conversion"]["form_fields"]
+        if fields <= 5:
+            grades["form_friction"] = "PASS"
+        elif fields <= 8:
+            grades["form_friction"] = "WARNING"
+        else:
+            grades["form_friction"] = "FAIL"
+
+    # Page weight (<2MB / 2-5MB / >5MB per ads-landing), from the mobile load
+    weight = (requests.get("mobile") or requests.get("desktop") or {}).get("transfer_bytes")
+    if weight is not None and requests.get("profile") == "faithful":
+        if weight < 2 * 1024 * 1024:
+            grades["page_weight"] = "PASS"
+        elif weight <= 5 * 1024 * 1024:
+            grades["page_weight"] = "WARNING"
+        else:
+            grades["page_weight"] = "FAIL"
+
+    return grades
+
+
+# Checks from grade_landing() that can only be graded on a rendered page
+RENDER_CHECKS = {"G59_mobile_speed", "cta_above_fold", "mobile_responsive", "page_weight"}
+# Checks that read page content, which a client-rendered shell does not have
+CONTENT_CHECKS = {"G60_relevance", "G61_schema", "form_friction"}
+ALL_CHECKS = RENDER_CHECKS | CONTENT_CHECKS
+DEFAULT_CHECKS = sorted(CONTENT_CHECKS)
+
+# A page that ships scripts but has no H1 and fewer words than this is
+# treated as a client-rendered shell
+SHELL_WORD_COUNT = 20
+
+_SKIP_TEXT_TAGS = {"script", "style", "noscript", "template", "title"}
+
+
+class _LandingParser(HTMLParser):
+    """Single pass over the HTML collecting everything analyze_static() needs."""
+
+    def __init__(self):
+        super().__init__(convert_charrefs=True)
+        self.title = None
+        self.h1 = None
+        self.meta_description = None
+        self.viewport_meta = False
+        self.forms = 0
+        self.form_fields = 0
+        self.phone_number = False
+        self.chat_widget = False
+        self.scripts = 0
+        self.json_ld = []
+        self.text = []
+
+        self._skip_depth = 0
+        self._form_depth = 0
+        self._in_title = False
+        self._title_parts = []
+        self._h1_depth = 0
+        self._h1_parts = []
+        self._json_ld_parts = None
+
+    def handle_starttag(self, tag, attrs):
+        attrs = {k: v or "" for k, v in attrs}
+
+        if tag == "meta":
+            name = attrs.get("name", "").lower()
+            if name == "description" and self.meta_description is None:
+                self.meta_description = attrs.get("content")
+            elif name == "viewport":
+                self.viewport_meta = True
+        elif tag == "form":
+            self.forms += 1
+            self._form_depth += 1
+        elif tag == "input" and self._form_depth:
+            if attrs.get("type", "").lower() not in ("hidden", "submit"):
+                self.form_fields += 1
+        elif tag == "a" and attrs.get("href", "").lower().startswith("tel:"):
+            self.phone_number = True
+        elif tag == "title" and self.title is None:
+            self._in_title = True
+        elif tag == "h1" and self.h1 is None:
+            self._h1_depth += 1
+
+        if tag == "script":
+            self.scripts += 1
+            if attrs.get("type", "").lower() == "application/ld+json":
+                self._json_ld_parts = []
+
+        if not self.chat_widget:
+            for attr, markers in CHAT_MARKERS.items():
+                value = attrs.get(attr, "")
+                if value and any(m in value for m in markers):
+                    self.chat_widget = True
+
+        if tag in _SKIP_TEXT_TAGS:
+            self._skip_depth += 1
+
+    def handle_endtag(self, tag):
+        if tag in _SKIP_TEXT_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+        if tag == "form" and self._form_depth:
+            self._form_depth -= 1
+        elif tag == "title" and self._in_title:
+            self._in_title = False
+            self.title = "".join(self._title_parts).strip()
+        elif tag == "h1" and self._h1_depth:
+            self._h1_depth -= 1
+            if not self._h1_depth:
+                self.h1 = "".join(self._h1_parts).strip()
+        elif tag == "script" and self._json_ld_parts is not None:
+            self.json_ld.append("".join(self._json_ld_parts))
+            self._json_ld_parts = None
+
+    def handle_data(self, data):
+        if self._json_ld_parts is not None:
+            self._json_ld_parts.append(data)
+        if self._in_title:
+            self._title_parts.append(data)
+        if self._h1_depth:
+            self._h1_parts.append(data)
+        if not self._skip_depth:
+            self.text.append(data)
+
+
+def schema_types(json_ld_blocks: list) -> list:
+    """Top-level and @graph @type values from JSON-LD blocks, like the in-page extraction."""
+    types = []
+    for block in json_ld_blocks:
+        try:
+            data = json.loads(block)
+        except ValueError:
+            continue
+        if not isinstance(data, dict):
+            continue
+        if data.get("@type"):
+            types.append(data["@type"])
+        if isinstance(data.get("@graph"), list):
+            types.extend(
+                item["@type"] for item in data["@graph"] if isinstance(item, dict) and item.get("@type")
+            )
+    return types
+
+
+def analyze_static(fetched: dict) -> dict:
+    """
+    Analyze a fetch_page() result without a browser.
+
+    Returns:
+        An analyze_landing()-shaped result with tier "static". Fields that need
+        rendering (LCP, CLS, above-fold CTA, horizontal scroll, font size) are
+        None; result["static"]["client_rendered"] flags pages whose content is
+        built by JavaScript and therefore not visible to this parser.
+    """
+    result = empty_result(fetched["url"])
+    result["tier"] = "static"
+    result["performance"]["ttfb_ms"] = (fetched.get("transfer") or {}).get("ttfb_ms")
+    result["conversion"]["cta_above_fold"] = None
+    result["mobile"]["horizontal_scroll"] = None
+    result["mobile"]["font_readable"] = None
+    result["static"] = {"client_rendered": False}
+
+    if fetched["error"] or fetched["content"] is None:
+        result["error"] = fetched["error"] or "No content fetched"
+        return result
+
+    parser = _LandingParser()
+    try:
+        parser.feed(fetched["content"])
+        parser.close()
+    except Exception as e:
+        result["error"] = f"HTML parse error: {e}"
+        return result
+
+    text = re.sub(r"\s+", " ", " ".join(parser.text)).strip()
+    words = len(text.split()) if text else 0
+    lower = text.lower()
+
+    result["content"]["title"] = parser.title
+    result["content"]["h1"] = parser.h1
+    result["content"]["meta_description"] = parser.meta_description
+    result["content"]["word_count"] = words
+    result["content"]["text"] = text[:CONTENT_TEXT_CHARS]
+
+    result["conversion"]["form_present"] = parser.forms > 0
+    result["conversion"]["form_fields"] = parser.form_fields if parser.forms else 0
+    result["conversion"]["phone_number"] = parser.phone_number
+    result["conversion"]["chat_widget"] = parser.chat_widget
+
+    result["trust"]["testimonials"] = any(k in lower for k in TESTIMONIAL_KEYWORDS)
+    result["trust"]["trust_badges"] = any(k in lower for k in TRUST_BADGE_KEYWORDS)
+
+    schemas = schema_types(parser.json_ld)
+    result["schema"]["types_found"] = schemas
+    result["schema"]["product_schema"] = "Product" in schemas
+    result["schema"]["faq_schema"] = "FAQPage" in schemas
+    result["schema"]["service_schema"] = "Service" in schemas
+    result["trust"]["reviews_schema"] = "Review" in schemas or "AggregateRating" in schemas
+
+    result["mobile"]["viewport_meta"] = parser.viewport_meta
+
+    result["static"]["client_rendered"] = (
+        parser.scripts > 0 and not parser.h1 and words < SHELL_WORD_COUNT
+    )
+    return result
+
+
+def escalation_reasons(result: dict, checks) -> list:
+    """Why a static result must be re-analyzed in the browser for `checks` (empty = it need not)."""
+    if result["error"]:
+        return []
+    reasons = sorted(set(checks) & RENDER_CHECKS)
+    if result["static"]["client_rendered"] and set(checks) & CONTENT_CHECKS:
+        reasons.append("client_rendered")
+    return reasons
+
+
+def analyze_tiered(url: str, checks=DEFAULT_CHECKS, **render_options) -> dict:
+    """
+    Analyze one landing page statically, escalating to Playwright only if needed.
+
+    Args:
+        checks: grade_landing() check names the caller needs
+        render_options: Passed to analyze_landing() when escalating
+    """
+    from fetch_page import fetch_page
+
+    result = analyze_static(fetch_page(url))
+    reasons = escalation_reasons(result, checks)
+    if not reasons:
+        return result
+
+    from analyze_landing import analyze_landing
+
+    if "page_weight" in checks:
+        render_options.setdefault("profile", "faithful")
+    rendered = analyze_landing(url, **render_options)
+    rendered["escalated_for"] = reasons
+    return rendered
+
+
+def iter_tiered(
+    urls: list,
+    checks=DEFAULT_CHECKS,
+    workers: int = 32,
+    per_host: int = 4,
+    fetch_options: dict = None,
+    render_options: dict = None,
+):
+    """
+    Run the tiered pipeline over many URLs, yielding results as they complete.
+
+    Every URL is fetched on pooled connections and parsed statically; only the
+    URLs that need rendering for `checks` are then sent to the shared browser
+    pool of analyze_landing.iter_batch(). Results of both tiers carry the
+    input URL as result["requested_url"]. Requested URLs that redirect to the
+    same page are rendered once and get one result each.
+    """
+    from fetch_page import iter_fetch
+
+    escalate = {}
+    requested = {}  # final URL -> requested URLs that redirected to it
+    for fetched in iter_fetch(urls, workers=workers, per_host=per_host, **(fetch_options or {})):
+        result = analyze_static(fetched)
+        result["requested_url"] = fetched["requested_url"]
+        reasons = escalation_reasons(result, checks)
+        if reasons:
+            escalate[fetched["url"]] = reasons
+            requested.setdefault(fetched["url"], []).append(fetched["requested_url"])
+        else:
+            yield result
+
+    if not escalate:
+        return
+
+    import asyncio
+    from analyze_landing import iter_batch
+
+    render_options = dict(render_options or {})
+    if "page_weight" in checks:
+        render_options.setdefault("profile", "faithful")
+    loop = asyncio.new_event_loop()
+    batch = iter_batch(list(escalate), **render_options)
+    try:
+        while True:
+            try:
+                rendered = loop.run_until_complete(batch.__anext__())
+            except StopAsyncIteration:
+                break
+            rendered["escalated_for"] = escalate.get(rendered["url"], [])
+            sources = requested.get(rendered["url"]) or [rendered["url"]]
+            for index, requested_url in enumerate(sources):
+                result = rendered if index == len(sources) - 1 else copy.deepcopy(rendered)
+                result["requested_url"] = requested_url
+                yield result
+    finally:
+        loop.run_until_complete(batch.aclose())
+        loop.close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Browserless landing page analysis with Playwright escalation")
+    parser.add_argument("url", nargs="?", help="URL to analyze")
+    parser.add_argument("--batch", "-b", metavar="FILE", help="File with one URL per line ('-' for stdin)")
+    parser.add_argument("--checks", default=",".join(DEFAULT_CHECKS),
+                        help=f"Comma-separated checks to grade (any of: {', '.join(sorted(ALL_CHECKS))})")
+    parser.add_argument("--workers", "-w", type=int, default=32, help="Max fetches in flight (batch mode)")
+    parser.add_argument("--per-host", type=int, default=4, help="Max fetches in flight per host (batch mode)")
+    parser.add_argument("--json", "-j", action="store_true", help="Output as JSON")
+    parser.add_argument("--jsonl", metavar="FILE",
+                        help="Stream one JSON line per URL as it completes ('-' for stdout; batch mode)")
+    parser.add_argument("--resume", action="store_true",
+                        help="Continue an interrupted --jsonl FILE run, skipping URLs already written")
+
+    args = parser.parse_args()
+
+    if bool(args.url) == bool(args.batch):
+        parser.error("provide either a URL or --batch FILE")
+    if args.resume and (not args.jsonl or args.jsonl == "-"):
+        parser.error("--resume needs --jsonl FILE")
+    checks = [c.strip() for c in args.checks.split(",") if c.strip()]
+    unknown = set(checks) - ALL_CHECKS
+    if unknown:
+        parser.error(f"unknown checks: {', '.join(sorted(unknown))}")
+
+    def grade(result: dict) -> dict:
+        return {k: v for k, v in grade_landing(result).items() if k in checks}
+
+    if args.batch:
+        from jsonl_output import JsonlWriter
+        from url_list import read_urls
+
+        urls = read_urls(args.batch)
+        out = JsonlWriter(args.jsonl, resume=args.resume) if args.jsonl else None
+        if out:
+            urls = out.remaining(urls)
+        started = time.perf_counter()
+        tiers = {"static": 0, "rendered": 0}
+        output = []
+        for result in iter_tiered(urls, checks=checks, workers=args.workers, per_host=args.per_host):
+            tiers[result["tier"]] += 1
+            if out:
+                out.write({**result, "grades": grade(result)}, key=result["requested_url"])
+            elif args.json:
+                output.append({**result, "grades": grade(result)})
+            else:
+                grades = grade(result)
+                status = result["error"] or " ".join(f"{k}={v}" for k, v in grades.items())
+                print(f"[{result['tier']}] {result['url']} {status}")
+        elapsed = time.perf_counter() - started
+        stats = {
+            "pages": len(urls),
+            "static": tiers["static"],
+            "rendered": tiers["rendered"],
+            "elapsed_s": round(elapsed, 2),
+            "pages_per_sec": round(len(urls) / elapsed, 2) if elapsed > 0 else None,
+        }
+        if out:
+            out.close()
+            print(f"Analyzed {stats['pages']} pages ({stats['static']} static, {stats['rendered']} rendered) "
+                  f"in {stats['elapsed_s']}s — {stats['pages_per_sec']} pages/sec", file=sys.stderr)
+        elif args.json:
+            print(json.dumps({"results": output, "stats": stats}, indent=2))
+        else:
+            print(f"\nAnalyzed {stats['pages']} pages ({stats['static']} static, {stats['rendered']} rendered) "
+                  f"in {stats['elapsed_s']}s — {stats['pages_per_sec']} pages/sec")
+        return
+
+    result = analyze_tiered(args.url, checks=checks)
+    grades = grade(result)
+    if args.json:
+        print(json.dumps({**result, "grades": grades}, indent=2))
+    else:
+        print(f"Landing Page Analysis ({result['tier']})")
+        print("=" * 50)
+        print(f"\nURL: {result['url']}")
+        print(f"  Title: {result['content']['title']}")
+        print(f"  H1: {result['content']['h1'] or 'MISSING'}")
+        print(f"  Words: {result['content']['word_count']}")
+        print(f"  Schema: {', '.join(map(str, result['schema']['types_found'])) or 'None'}")
+        print(f"\nAudit Grades:")
+        for check, grade_value in grades.items():
+            print(f"  [{grade_value}] {check}")
+        if result["error"]:
+            print(f"\nError: {result['error']}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,250 @@
+#!/usr/bin/env python3
+"""
+Opt-in span timing for the landing page scripts.
+
+A Tracer records named, nested spans (browser launch, navigation, readiness
+wait, DOM extraction, body read, ...). Instrumented functions take an
+optional `tracer` and, when given one, add result["timings"]:
+
+    {"started_at": <unix seconds>, "spans": [
+        {"id": 1, "parent": None, "name": "analyze", "start_ms": 0.0, "duration_ms": 5120.4},
+        {"id": 2, "parent": 1, "name": "browser.attach", "start_ms": 0.1, "duration_ms": 412.9},
+        ...]}
+
+Nesting follows the calling task (contextvars), so spans of viewports or
+pages running concurrently under asyncio keep the right parents.
+
+Timings can be exported as a Chrome trace-event file (chrome://tracing,
+Perfetto) or as OpenTelemetry-style JSON (OTLP resourceSpans), and
+summarize_phases() ranks the slowest phases across a batch of results.
+
+Usage:
+    tracer = Tracer()
+    result = analyze_landing(url, tracer=tracer)
+    write_trace("trace.json", [result], trace_format="chrome")
+"""
+
+import contextlib
+import contextvars
+import json
+import math
+import os
+import time
+
+TRACE_FORMATS = ("chrome", "otel")
+
+_current_span = contextvars.ContextVar("claude_ads_current_span", default=None)
+
+
+def nearest_rank(ordered: list, p: float) -> float:
+    """Nearest-rank p-th percentile of a non-empty, sorted list of numbers."""
+    return ordered[max(0, math.ceil(p / 100 * len(ordered)) - 1)]
+
+
+def percentiles(values: list) -> dict:
+    """Nearest-rank percentiles of a list of numbers."""
+    if not values:
+        return {"count": 0}
+    ordered = sorted(values)
+
+    def rank(p: float) -> float:
+        return nearest_rank(ordered, p)
+
+    return {
+        "count": len(ordered),
+        "mean": round(sum(ordered) / len(ordered), 2),
+        "min": round(ordered[0], 2),
+        "p50": round(rank(50), 2),
+        "p90": round(rank(90), 2),
+        "p95": round(rank(95), 2),
+        "p99": round(rank(99), 2),
+        "max": round(ordered[-1], 2),
+    }
+
+
+class Tracer:
+    """Collects spans for one page (one URL)."""
+
+    def __init__(self):
+        self.started_at = time.time()
+        self._origin = time.perf_counter()
+        self._ids = 0
+        self.spans = []
+
+    @contextlib.contextmanager
+    def span(self, name: str, **attributes):
+        """Time the enclosed block as a child of the current span."""
+        self._ids += 1
+        current = _current_span.get()
+        record = {
+            "id": self._ids,
+            "parent": current[1] if current and current[0] is self else None,
+            "name": name,
+            "start_ms": round((time.perf_counter() - self._origin) * 1000, 3),
+            "duration_ms": None,
+        }
+        if attributes:
+            record["attributes"] = attributes
+        self.spans.append(record)
+        token = _current_span.set((self, record["id"]))
+        started = time.perf_counter()
+        try:
+            yield record
+        finally:
+            record["duration_ms"] = round((time.perf_counter() - started) * 1000, 3)
+            _current_span.reset(token)
+
+    def to_dict(self) -> dict:
+        return {"started_at": self.started_at, "spans": list(self.spans)}
+
+
+def span(tracer, name: str, **attributes):
+    """tracer.span(), or a no-op when tracing is off (tracer is None)."""
+    if tracer is None:
+        return contextlib.nullcontext()
+    return tracer.span(name, **attributes)
+
+
+def phase_durations(timings: dict) -> dict:
+    """{span name: total ms} for one result's timings."""
+    totals = {}
+    for record in (timings or {}).get("spans", []):
+        if record["duration_ms"] is not None:
+            totals[record["name"]] = round(totals.get(record["name"], 0) + record["duration_ms"], 3)
+    return totals
+
+
+def summarize_phases(results: list, top: int = 10) -> list:
+    """
+    Rank phases by total time across a batch of results that carry timings.
+
+    Returns:
+        Up to `top` dicts with phase, count, total_ms, p50, p90, max and the
+        slowest_url, slowest phase first
+    """
+    durations = {}
+    slowest = {}
+    for result in results:
+        for phase, ms in phase_durations(result.get("timings")).items():
+            durations.setdefault(phase, []).append(ms)
+            if ms > slowest.get(phase, (0, None))[0]:
+                slowest[phase] = (ms, result.get("url"))
+
+    rows = []
+    for phase, values in durations.items():
+        stats = percentiles(values)
+        rows.append({
+            "phase": phase,
+            "count": stats["count"],
+            "total_ms": round(sum(values), 1),
+            "p50": stats["p50"],
+            "p90": stats["p90"],
+            "max": stats["max"],
+            "slowest_url": slowest[phase][1],
+        })
+    rows.sort(key=lambda row: row["total_ms"], reverse=True)
+    return rows[:top]
+
+
+def print_phase_summary(rows: list, file=None) -> None:
+    """Print summarize_phases() rows as a table."""
+    if not rows:
+        return
+    print("\nSlowest phases (total across pages):", file=file)
+    for row in rows:
+        print(f"  {row['phase']:24s} total={row['total_ms']:>10}ms p50={row['p50']:>9} "
+              f"p90={row['p90']:>9} max={row['max']:>9}  ({row['slowest_url']})", file=file)
+
+
+def print_timings(timings: dict, file=None) -> None:
+    """Print one result's spans as an indented tree."""
+    spans = (timings or {}).get("spans", [])
+    depth = {}
+    for record in spans:
+        depth[record["id"]] = depth.get(record["parent"], -1) + 1
+        print(f"  {'  ' * depth[record['id']]}{record['name']}: {record['duration_ms']}ms", file=file)
+
+
+def chrome_trace(results: list) -> dict:
+    """Chrome trace-event document with one track (tid) per result."""
+    events = []
+    origin = min(
+        (r["timings"]["started_at"] for r in results if r.get("timings")), default=0
+    )
+    pid = os.getpid()
+    for tid, result in enumerate((r for r in results if r.get("timings")), start=1):
+        timings = result["timings"]
+        offset_us = (timings["started_at"] - origin) * 1_000_000
+        events.append({
+            "name": "thread_name", "ph": "M", "pid": pid, "tid": tid,
+            "args": {"name": result.get("url") or f"page {tid}"},
+        })
+        for record in timings["spans"]:
+            if record["duration_ms"] is None:
+                continue
+            events.append({
+                "name": record["name"],
+                "cat": record["name"].split(".")[0],
+                "ph": "X",
+                "ts": round(offset_us + record["start_ms"] * 1000),
+                "dur": round(record["duration_ms"] * 1000),
+                "pid": pid,
+                "tid": tid,
+                "args": record.get("attributes", {}),
+            })
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def _otel_value(value) -> dict:
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
+
+
+def otel_trace(results: list, service_name: str = "claude-ads") -> dict:
+    """OpenTelemetry-style (OTLP JSON) document with one trace per result."""
+    spans = []
+    for result in results:
+        timings = result.get("timings")
+        if not timings:
+            continue
+        trace_id = os.urandom(16).hex()
+        span_ids = {record["id"]: os.urandom(8).hex() for record in timings["spans"]}
+        start_ns = int(timings["started_at"] * 1e9)
+        for record in timings["spans"]:
+            if record["duration_ms"] is None:
+                continue
+            begin = start_ns + int(record["start_ms"] * 1e6)
+            attributes = {"url": result.get("url"), **record.get("attributes", {})}
+            spans.append({
+                "traceId": trace_id,
+                "spanId": span_ids[record["id"]],
+                "parentSpanId": span_ids.get(record["parent"], ""),
+                "name": record["name"],
+                "kind": 1,
+                "startTimeUnixNano": str(begin),
+                "endTimeUnixNano": str(begin + int(record["duration_ms"] * 1e6)),
+                "attributes": [
+                    {"key": key, "value": _otel_value(value)}
+                    for key, value in attributes.items() if value is not None
+                ],
+            })
+    return {
+        "resourceSpans": [{
+            "resource": {"attributes": [{"key": "service.name", "value": {"stringValue": service_name}}]},
+            "scopeSpans": [{"scope": {"name": "claude-ads.timing"}, "spans": spans}],
+        }]
+    }
+
+
+def write_trace(path: str, results: list, trace_format: str = "chrome") -> None:
+    """Write the timings of `results` as a Chrome trace or OTel-style JSON file."""
+    if trace_format not in TRACE_FORMATS:
+        raise ValueError(f"Unknown trace format: {trace_format}. Choose from: {list(TRACE_FORMATS)}")
+    document = chrome_trace(results) if trace_format == "chrome" else otel_trace(results)
+    with open(path, "w") as f:
+        json.dump(document, f)
@@ -0,0 +1,32 @@
+#!/usr/bin/env python3
+"""
+URL list helpers shared by the batch modes of the landing page scripts.
+
+Usage:
+    from url_list import read_urls, host_of
+    urls = read_urls("final_urls.txt")   # or "-" for stdin
+"""
+
+import sys
+from urllib.parse import urlparse
+
+
+def read_urls(path: str) -> list:
+    """Read one URL per line from a file ('-' for stdin), skipping blanks and # comments."""
+    handle = sys.stdin if path == "-" else open(path, encoding="utf-8")
+    try:
+        urls = []
+        for line in handle:
+            line = line.strip()
+            if line and not line.startswith("#"):
+                urls.append(line)
+        return urls
+    finally:
+        if handle is not sys.stdin:
+            handle.close()
+
+
+def host_of(url: str) -> str:
+    """Lower-cased host[:port] of a URL, assuming https:// when the scheme is missing."""
+    parsed = urlparse(url if "://" in url else f"https://{url}")
+    return parsed.netloc.lower()
@@ -0,0 +1,185 @@
+"""http_cache.HttpCache through fetch_page() against a local http.server."""
+
+import threading
+import time
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import pytest
+
+import http_cache
+from fetch_page import fetch_page
+from http_cache import HttpCache
+
+
+class _Handler(BaseHTTPRequestHandler):
+    # path -> callable(request headers) -> (status, headers, body)
+    routes = {}
+    requests = []
+
+    def do_GET(self):
+        self.requests.append((self.path, dict(self.headers)))
+        status, headers, body = self.routes[self.path](self.headers)
+        # send_response() would add a Date of its own next to a route's
+        self.send_response_only(status)
+        if "Date" not in headers:
+            self.send_header("Date", self.date_time_string())
+        for name, value in headers.items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):
+        pass
+
+
+@pytest.fixture
+def server():
+    _Handler.routes = {}
+    _Handler.requests = []
+    httpd = ThreadingHTTPServer(("127.0.0.1", 0), _Handler)
+    httpd.daemon_threads = True
+    threading.Thread(target=httpd.serve_forever, daemon=True).start()
+    yield httpd
+    httpd.shutdown()
+    httpd.server_close()
+
+
+@pytest.fixture
+def cache(tmp_path):
+    cache = HttpCache(str(tmp_path / "http"))
+    yield cache
+    cache.close()
+
+
+def _url(server, path: str) -> str:
+    return f"http://127.0.0.1:{server.server_address[1]}{path}"
+
+
+def _page(headers: dict, body: bytes = b"<html><h1>ok</h1></html>"):
+    return lambda request: (200, {"Content-Type": "text/html; charset=utf-8", **headers}, body)
+
+
+def _requests(path: str) -> int:
+    return sum(1 for requested, _ in _Handler.requests if requested == path)
+
+
+def test_max_age_hit(server, cache):
+    _Handler.routes["/fresh"] = _page({"Cache-Control": "max-age=60"})
+    url = _url(server, "/fresh")
+    assert fetch_page(url, cache=cache)["cache"] == "miss"
+    second = fetch_page(url, cache=cache)
+    assert second["cache"] == "hit"
+    assert second["content"] == "<html><h1>ok</h1></html>"
+    assert _requests("/fresh") == 1
+
+
+def test_age_and_date_count_against_max_age(server, cache):
+    _Handler.routes["/aged"] = _page({"Cache-Control": "max-age=60", "Age": "120"})
+    _Handler.routes["/old-date"] = _page({
+        "Cache-Control": "max-age=60",
+        "Date": formatdate(time.time() - 120, usegmt=True),
+    })
+    for path in ("/aged", "/old-date"):
+        fetch_page(_url(server, path), cache=cache)
+        assert fetch_page(_url(server, path), cache=cache)["cache"] != "hit"
+        assert _requests(path) == 2
+
+
+def test_expires(server, cache):
+    now = time.time()
+    _Handler.routes["/expires"] = _page({
+        "Date": formatdate(now, usegmt=True),
+        "Expires": formatdate(now + 60, usegmt=True),
+    })
+    _Handler.routes["/expired"] = _page({"Expires": "0"})
+    _Handler.routes["/max-age-wins"] = _page({
+        "Cache-Control": "max-age=0",
+        "Expires": formatdate(now + 60, usegmt=True),
+    })
+    for path, expected in (("/expires", "hit"), ("/expired", "miss"), ("/max-age-wins", "miss")):
+        fetch_page(_url(server, path), cache=cache)
+        assert fetch_page(_url(server, path), cache=cache)["cache"] == expected, path
+
+
+def test_304_revalidation_refreshes_freshness(server, cache):
+    def etag_page(request):
+        if request.get("If-None-Match") == '"v1"':
+            return 304, {"ETag": '"v1"', "Cache-Control": "max-age=60"}, b""
+        return 200, {"Content-Type": "text/html", "ETag": '"v1"', "Cache-Control": "no-cache"}, b"<html>v1</html>"
+
+    _Handler.routes["/etag"] = etag_page
+    url = _url(server, "/etag")
+    assert fetch_page(url, cache=cache)["cache"] == "miss"
+    revalidated = fetch_page(url, cache=cache)
+    assert revalidated["cache"] == "revalidated"
+    assert revalidated["content"] == "<html>v1</html>"
+    assert _Handler.requests[-1][1].get("If-None-Match") == '"v1"'
+    # The 304's max-age replaces the stored no-cache
+    assert fetch_page(url, cache=cache)["cache"] == "hit"
+    assert _requests("/etag") == 2
+    assert cache.stats()["revalidated"] == 1
+
+
+def test_vary(server, cache):
+    def varied(request):
+        body = f"<html>{request.get('X-Variant')}</html>".encode()
+        return 200, {"Content-Type": "text/html", "Cache-Control": "max-age=60", "Vary": "X-Variant"}, body
+
+    _Handler.routes["/vary"] = varied
+    _Handler.routes["/vary-star"] = _page({"Cache-Control": "max-age=60", "Vary": "*"})
+    url = _url(server, "/vary")
+    assert fetch_page(url, cache=cache, headers={"X-Variant": "a"})["cache"] == "miss"
+    assert fetch_page(url, cache=cache, headers={"X-Variant": "a"})["cache"] == "hit"
+    other = fetch_page(url, cache=cache, headers={"X-Variant": "b"})
+    assert other["cache"] == "miss"
+    assert other["content"] == "<html>b</html>"
+
+    fetch_page(_url(server, "/vary-star"), cache=cache)
+    assert fetch_page(_url(server, "/vary-star"), cache=cache)["cache"] == "miss"
+
+
+def test_lru_eviction(server, tmp_path):
+    cache = HttpCache(str(tmp_path / "lru"), max_bytes=2500)
+    try:
+        for name in ("a", "b", "c"):
+            _Handler.routes[f"/{name}"] = _page({"Cache-Control": "max-age=60"}, name.encode() * 1000)
+        fetch_page(_url(server, "/a"), cache=cache)
+        time.sleep(0.01)
+        fetch_page(_url(server, "/b"), cache=cache)
+        time.sleep(0.01)
+        assert fetch_page(_url(server, "/a"), cache=cache)["cache"] == "hit"  # a is now the most recent
+        time.sleep(0.01)
+        fetch_page(_url(server, "/c"), cache=cache)
+
+        assert cache.lookup(_url(server, "/b")) is None
+        assert cache.lookup(_url(server, "/a")) is not None
+        assert cache.lookup(_url(server, "/c")) is not None
+        assert cache.size_bytes() == 2000
+        assert sorted(p.name for p in (tmp_path / "lru" / "bodies").iterdir()) == sorted(
+            http_cache.hashlib.sha256(name.encode() * 1000).hexdigest() for name in ("a", "c")
+        )
+    finally:
+        cache.close()
+
+
+def test_missing_body_keeps_an_entry_replaced_meanwhile(server, cache, monkeypatch):
+    url = _url(server, "/page")
+    _Handler.routes["/page"] = _page({"Cache-Control": "max-age=60"}, b"<html>old</html>")
+    fetch_page(url, cache=cache)
+    _Handler.routes["/page"] = _page({"Cache-Control": "max-age=60"}, b"<html>new</html>")
+    real_open = open
+
+    def open_after_replace(path, *args, **kwargs):
+        # Another thread stores a new body between lookup()'s row read and its
+        # body read, which releases the old body file
+        monkeypatch.setattr(http_cache, "open", real_open, raising=False)
+        cache.store(url, fetch_page(url))
+        return real_open(path, *args, **kwargs)
+
+    monkeypatch.setattr(http_cache, "open", open_after_replace, raising=False)
+    assert cache.lookup(url) is None
+    entry = cache.lookup(url)
+    assert entry is not None
+    assert entry["content"] == "<html>new</html>"
@@ -0,0 +1,86 @@
+"""scoring.py against the dashboard's scoring.ts (calculateCategoryScore, calculatePlatformScore, getGrade)."""
+
+import json
+import math
+import os
+
+import scoring
+
+SAMPLE_REPORT = os.path.join(
+    os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "dashboard", "src", "data", "sample-report.json"
+)
+
+# Computed by scoring.ts over the checks of sample-report.json, with each
+# platform's categories in first-appearance order and the total weighted by
+# budget share.
+EXPECTED_CATEGORIES = {
+    ("google", "Conversion Tracking"): (63.888888888888886, "C"),
+    ("google", "Wasted Spend"): (25.0, "F"),
+    ("google", "Account Structure"): (62.5, "C"),
+    ("google", "Keywords & Quality Score"): (25.0, "F"),
+    ("google", "Ads & Assets"): (100.0, "A"),
+    ("google", "Settings & Targeting"): (50.0, "D"),
+    ("meta", "Pixel/CAPI Health"): (33.33333333333333, "F"),
+    ("meta", "Creative"): (0.0, "F"),
+    ("meta", "Account Structure"): (50.0, "D"),
+    ("meta", "Audience & Targeting"): (25.0, "F"),
+    ("linkedin", "Technical Setup"): (100.0, "A"),
+    ("linkedin", "Audience Quality"): (75.0, "B"),
+    ("linkedin", "Creative & Formats"): (25.0, "F"),
+    ("linkedin", "Lead Gen Forms"): (75.0, "B"),
+    ("tiktok", "Technical Setup"): (81.25, "B"),
+    ("tiktok", "Creative Quality"): (0.0, "F"),
+    ("tiktok", "Bidding & Learning"): (0.0, "F"),
+    ("tiktok", "Structure & Settings"): (0.0, "F"),
+    ("microsoft", "Technical Setup"): (81.25, "B"),
+    ("microsoft", "Syndication & Bidding"): (0.0, "F"),
+    ("microsoft", "Structure & Audience"): (0.0, "F"),
+    ("microsoft", "Settings & Performance"): (0.0, "F"),
+}
+EXPECTED_PLATFORMS = {
+    "google": (54.09722222222222, "D"),
+    "meta": (25.0, "F"),
+    "linkedin": (70.58823529411765, "C"),
+    "tiktok": (22.569444444444443, "F"),
+    "microsoft": (25.390625, "F"),
+}
+EXPECTED_TOTAL = (45.65453941993464, "D")
+
+
+def test_sample_report_matches_scoring_ts():
+    with open(SAMPLE_REPORT, encoding="utf-8") as f:
+        scores = scoring.score_rows(scoring.rows_from_report(json.load(f)))
+
+    categories = {(c["platform"], c["name"]): (c["score"], c["grade"]) for c in scores["categories"]}
+    platforms = {p["platform"]: (p["score"], p["grade"]) for p in scores["platforms"]}
+    (account,) = scores["accounts"]
+    # Exact: the same operations in the same order as scoring.ts
+    assert categories == EXPECTED_CATEGORIES
+    assert platforms == EXPECTED_PLATFORMS
+    assert (account["score"], account["grade"]) == EXPECTED_TOTAL
+
+
+def test_first_weight_and_budget_share_win():
+    rows = [
+        {"platform": "google", "category": "A", "severity": "High", "status": "PASS", "budget_share": 0.25},
+        {"platform": "google", "category": "A", "severity": "Low", "status": "FAIL", "weight": 0.75},
+        {"platform": "google", "category": "B", "severity": "Critical", "status": "WARNING", "weight": 0.25},
+        {"platform": "google", "category": "A", "severity": "Medium", "status": "N/A", "weight": 0.1},
+        {"platform": "google", "category": "B", "severity": "High", "status": "PASS", "weight": 0.9,
+         "budget_share": 0.5},
+        {"platform": "meta", "category": "C", "severity": "High", "status": "FAIL", "weight": 1.0},
+    ] * 50
+    scores = scoring.score_rows(rows)
+
+    weights = {c["name"]: c["weight"] for c in scores["categories"]}
+    shares = {p["platform"]: p["budgetShare"] for p in scores["platforms"]}
+    assert weights == {"A": 0.75, "B": 0.25, "C": 1.0}
+    # google's first share; meta has none, so it counts as 1
+    assert shares == {"google": 0.25, "meta": 1.0}
+
+
+def test_get_grade_thresholds():
+    assert [scoring.get_grade(s) for s in (100, 90, 89.99, 75, 60, 40, 39.99, 0)] == [
+        "A", "A", "B", "B", "C", "D", "F", "F",
+    ]
+    assert list(scoring.grade_array([90, 74.5, math.nextafter(60, 0)])) == ["A", "C", "D"]